@@ -0,0 +1,170 @@
+"""
+Orchestration-overhead benchmark of run_form_submission without a browser.
+
+Drives generated CSVs through the real pipeline (streaming, validation, workers,
+FormPage, logging, results and summary) against ``SimulatedPlaywright``, so the
+numbers are the Python-side cost per row rather than browser time. Each case
+runs in a fresh process and reports CPU time per row, peak RSS and event-loop
+lag, written to a JSON baseline that can be diffed between versions, e.g.::
+
+    python -m benchmarks.bench_overhead --sizes 100000,1000000 --output benchmarks/overhead.json
+    python -m benchmarks.bench_overhead --sizes 100000 --compare benchmarks/overhead.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.bench_throughput import _bool_list, _git_revision, _int_list, generate_csv
+from benchmarks.simulated_page import SimulatedPlaywright
+from utils.metrics import LatencyHistogram
+
+
+async def _watch_loop_lag(histogram: LatencyHistogram, interval: float) -> None:
+    """Record how late each ``interval`` sleep wakes up; blocking code shows up as lag."""
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        histogram.observe(max(0.0, loop.time() - started - interval))
+
+
+async def _run_case(csv_path: str, settings: Dict[str, Any], options: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one case in this process and measure it."""
+    import main
+    from utils.retry import RetryPolicy
+
+    simulated = SimulatedPlaywright(options["latency"], options["failure_rate"], options["seed"])
+    # This process only ever runs one simulated case.
+    main.async_playwright = simulated
+    lag = LatencyHistogram()
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    watcher = asyncio.create_task(_watch_loop_lag(lag, options["lag_interval"]))
+    cpu_started, wall_started = time.process_time(), time.perf_counter()
+    try:
+        snapshot = await main.run_form_submission(
+            csv_path,
+            "http://simulated.invalid/form.html",
+            retry_policy=RetryPolicy(base_delay=0.0),
+            metrics_interval=None,
+            log_level=options["log_level"],
+            **settings,
+        )
+    finally:
+        watcher.cancel()
+    cpu_seconds = time.process_time() - cpu_started
+    wall_seconds = time.perf_counter() - wall_started
+    rows = snapshot["rows_succeeded"] + snapshot["rows_failed"]
+    lag_summary = lag.summary()
+    return {
+        "rows_finished": rows,
+        "rows_failed": snapshot["rows_failed"],
+        "cpu_seconds": cpu_seconds,
+        "wall_seconds": wall_seconds,
+        "cpu_us_per_row": cpu_seconds / rows * 1e6 if rows else 0.0,
+        "rows_per_second": rows / wall_seconds if wall_seconds > 0 else 0.0,
+        # ru_maxrss is in KiB on Linux.
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "baseline_rss_mb": baseline_rss / 1024,
+        "loop_lag_ms": {key: lag_summary[key] * 1000 for key in ("p50", "p99", "max")},
+        "page_calls": simulated.browser.calls,
+    }
+
+
+def _case_in_process(csv_path: str, settings: Dict[str, Any], options: Dict[str, Any]) -> Dict[str, Any]:
+    """Process pool entry point: silence the run's log and summary output, then run the case."""
+    # Logs are still formatted by the logging thread, which counts towards CPU time.
+    sys.stdout = sys.stderr = open(os.devnull, "w")
+    return asyncio.run(_run_case(csv_path, settings, options))
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run every configured case, each in a fresh process, and return the baseline document."""
+    options = {
+        "latency": args.latency, "failure_rate": args.failure_rate, "seed": args.seed,
+        "log_level": args.log_level, "lag_interval": args.lag_interval,
+    }
+    cases: List[Dict[str, Any]] = []
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows, concurrency, fast_fill, soft_reset in itertools.product(
+            args.sizes, args.concurrency, args.fast_fill, args.soft_reset
+        ):
+            csv_path = os.path.join(workdir, f"users_{rows}.csv")
+            if not os.path.exists(csv_path):
+                generate_csv(csv_path, rows, seed=args.seed)
+            settings = {"concurrency": concurrency, "fast_fill": fast_fill, "soft_reset": soft_reset}
+            print(f"Benchmarking {rows} simulated rows with {settings}...", file=sys.stderr)
+            with ProcessPoolExecutor(1, mp_context=context) as pool:
+                measured = pool.submit(_case_in_process, csv_path, settings, options).result()
+            print(
+                f"  {measured['cpu_us_per_row']:.0f} us CPU/row, peak RSS {measured['peak_rss_mb']:.0f} MB, "
+                f"loop lag p99 {measured['loop_lag_ms']['p99']:.1f} ms",
+                file=sys.stderr,
+            )
+            cases.append({"rows": rows, "settings": settings, **measured})
+    return {
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "simulation": options,
+        "cases": cases,
+    }
+
+
+def _case_key(case: Dict[str, Any]) -> str:
+    """Identify a case by row count and settings."""
+    return json.dumps([case["rows"], case["settings"]], sort_keys=True)
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> None:
+    """Print the CPU-per-row and peak RSS change of every case present in both documents."""
+    previous = {_case_key(case): case for case in baseline["cases"]}
+    print(f"{'rows':>8} {'settings':<55} {'us/row':>8} {'after':>8} {'change':>8} {'RSS MB':>7} {'after':>7}")
+    for case in current["cases"]:
+        old = previous.get(_case_key(case))
+        if old is None:
+            continue
+        before, after = old["cpu_us_per_row"], case["cpu_us_per_row"]
+        change = (after / before - 1) * 100 if before else float("inf")
+        print(
+            f"{case['rows']:>8} {json.dumps(case['settings']):<55} {before:>8.0f} {after:>8.0f} "
+            f"{change:>+7.1f}% {old['peak_rss_mb']:>7.0f} {case['peak_rss_mb']:>7.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Python-side cost per row with a simulated browser.")
+    parser.add_argument("--sizes", type=_int_list, default=[100000, 1000000], help="Comma-separated CSV row counts.")
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 8], help="Comma-separated worker counts.")
+    parser.add_argument("--fast-fill", type=_bool_list, default=[False], help="Comma-separated fast-fill settings.")
+    parser.add_argument("--soft-reset", type=_bool_list, default=[False], help="Comma-separated soft-reset settings.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated latency of every page call, in seconds.")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of simulated clicks that time out.")
+    parser.add_argument("--log-level", type=str, default="INFO", help="Log level of the benchmarked runs.")
+    parser.add_argument("--lag-interval", type=float, default=0.01, help="Event-loop lag probe interval, in seconds.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for generated rows and injected failures.")
+    parser.add_argument("--output", type=str, default="benchmarks/overhead.json", help="Where to write the baseline JSON.")
+    parser.add_argument("--compare", type=str, default=None, help="Baseline JSON to compare the new results against.")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as handle:
+            baseline = json.load(handle)
+    result = run_benchmark(args)
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump(result, handle, indent=2, sort_keys=True)
+    print(f"Wrote {len(result['cases'])} cases to {args.output}", file=sys.stderr)
+    if baseline is not None:
+        compare(baseline, result)
@@ -0,0 +1,152 @@
+"""
+Throughput benchmark of run_form_submission against the local replica form.
+
+Runs every combination of row count and setting over generated CSVs and writes
+rows/sec and per-phase latencies to a JSON baseline that can be diffed between
+versions, e.g.::
+
+    python -m benchmarks.bench_throughput --sizes 100,1000 --concurrency 1,4 \
+        --output benchmarks/baseline.json
+    python -m benchmarks.bench_throughput --compare benchmarks/baseline.json
+"""
+import argparse
+import asyncio
+import csv
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.form_server import FormServer
+from main import CSV_FIELDS, run_form_submission
+
+_FIRST_NAMES = ("Alice", "Bob", "Carol", "Dave", "Erin", "Frank", "Grace", "Heidi")
+_LAST_NAMES = ("Smith", "Jones", "Brown", "Taylor", "Wilson", "Evans", "Thomas", "Moore")
+_ROLES = ("Engineer", "Designer", "Tester", "Manager", "Analyst")
+
+
+def generate_csv(path: str, rows: int, seed: int = 0) -> None:
+    """Write ``rows`` synthetic users with the expected CSV columns."""
+    rng = random.Random(seed)
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(CSV_FIELDS)
+        for index in range(rows):
+            first, last = rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES)
+            writer.writerow([first, last, f"{first}.{last}.{index}@example.com".lower(), rng.choice(_ROLES)])
+
+
+def _git_revision() -> str:
+    """Return the current git revision, or 'unknown' outside a checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run every configured case and return the baseline document."""
+    cases: List[Dict[str, Any]] = []
+    submit_mode = "fetch" if True in args.replay else "alert"
+    with FormServer(
+        latency=args.latency, missing_rate=args.missing_rate, seed=args.seed, submit_mode=submit_mode
+    ) as server, \
+            tempfile.TemporaryDirectory() as workdir:
+        for rows, concurrency, fast_fill, soft_reset, replay in itertools.product(
+            args.sizes, args.concurrency, args.fast_fill, args.soft_reset, args.replay
+        ):
+            csv_path = os.path.join(workdir, f"users_{rows}.csv")
+            if not os.path.exists(csv_path):
+                generate_csv(csv_path, rows, seed=args.seed)
+            settings = {"concurrency": concurrency, "fast_fill": fast_fill, "soft_reset": soft_reset}
+            if replay:
+                settings["replay"] = True
+            print(f"Benchmarking {rows} rows with {settings}...", file=sys.stderr)
+            snapshot = await run_form_submission(
+                csv_path,
+                server.url,
+                concurrency=concurrency,
+                fast_fill=fast_fill,
+                soft_reset=soft_reset,
+                replay=replay,
+                metrics_interval=None,
+                headless=True,
+            )
+            cases.append({
+                "rows": rows,
+                "settings": settings,
+                "rows_per_second": snapshot["rows_per_second"],
+                "elapsed_seconds": snapshot["elapsed_seconds"],
+                "rows_failed": snapshot["rows_failed"],
+                "phases": snapshot["phases"],
+            })
+    return {
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "server": {
+            "latency": args.latency, "missing_rate": args.missing_rate, "seed": args.seed,
+            "submit_mode": submit_mode,
+        },
+        "cases": cases,
+    }
+
+
+def _case_key(case: Dict[str, Any]) -> str:
+    """Identify a case by row count and settings."""
+    return json.dumps([case["rows"], case["settings"]], sort_keys=True)
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> None:
+    """Print the rows/sec change of every case present in both documents."""
+    previous = {_case_key(case): case for case in baseline["cases"]}
+    print(f"{'rows':>7} {'settings':<55} {'before':>9} {'after':>9} {'change':>8}")
+    for case in current["cases"]:
+        old = previous.get(_case_key(case))
+        if old is None:
+            continue
+        before, after = old["rows_per_second"], case["rows_per_second"]
+        change = (after / before - 1) * 100 if before else float("inf")
+        print(f"{case['rows']:>7} {json.dumps(case['settings']):<55} {before:>9.2f} {after:>9.2f} {change:>+7.1f}%")
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item]
+
+
+def _bool_list(value: str) -> List[bool]:
+    return [item.strip().lower() in ("1", "true", "yes", "on") for item in value.split(",") if item]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark form submission throughput against a local form.")
+    parser.add_argument("--sizes", type=_int_list, default=[100, 1000, 10000], help="Comma-separated CSV row counts.")
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 4], help="Comma-separated worker counts.")
+    parser.add_argument("--fast-fill", type=_bool_list, default=[False, True], help="Comma-separated fast-fill settings.")
+    parser.add_argument("--soft-reset", type=_bool_list, default=[False], help="Comma-separated soft-reset settings.")
+    parser.add_argument("--replay", type=_bool_list, default=[False], help="Comma-separated HTTP replay settings.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Artificial server latency per page load, in seconds.")
+    parser.add_argument("--missing-rate", type=float, default=0.1, help="Probability that each field is left off a page load.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for generated rows and missing fields.")
+    parser.add_argument("--output", type=str, default="benchmarks/baseline.json", help="Where to write the baseline JSON.")
+    parser.add_argument("--compare", type=str, default=None, help="Baseline JSON to compare the new results against.")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as handle:
+            baseline = json.load(handle)
+    result = asyncio.run(run_benchmark(args))
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump(result, handle, indent=2, sort_keys=True)
+    print(f"Wrote {len(result['cases'])} cases to {args.output}", file=sys.stderr)
+    if baseline is not None:
+        compare(baseline, result)
@@ -0,0 +1,159 @@
+import html
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Sequence
+
+# Label and placeholder of every field of the challenge form, in page order.
+FORM_FIELDS: Sequence[str] = ("First Name", "Last Name", "Email", "Desired Role")
+ALERT_MESSAGE = "Success! Your data has been submitted."
+
+_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>Automation Challenge (local replica)</title></head>
+<body>
+<form id="challenge-form" onsubmit="return false;">
+{fields}
+<button type="button" id="submit-{nonce}" onclick="{onclick}">Submit Data</button>
+</form>
+</body>
+</html>
+"""
+
+# In "fetch" mode the button posts the form to /submit before showing the alert,
+# so the submit can be learned and replayed over HTTP.
+_FETCH_SUBMIT_JS = (
+    "fetch('/submit', {{method: 'POST', body: new URLSearchParams(new FormData(this.form))}})"
+    ".then(function (r) {{ if (r.ok) alert({alert!r}); }});"
+)
+
+_FIELD_TEMPLATE = """<div>
+<label for="{field_id}">{label}</label>
+<input id="{field_id}" name="{name}" type="{input_type}" placeholder="{label}">
+</div>"""
+
+
+def render_form(
+    missing_rate: float = 0.0, rng: Optional[random.Random] = None, submit_mode: str = "alert"
+) -> str:
+    """
+    Render the replica form.
+
+    Each field is left out independently with probability ``missing_rate``.
+    The submit button id changes on every render, like the hosted challenge.
+    ``submit_mode`` is ``alert`` (alert only) or ``fetch`` (POST to /submit, then alert).
+    """
+    rng = rng or random.Random()
+    fields = []
+    for label in FORM_FIELDS:
+        if rng.random() < missing_rate:
+            continue
+        name = label.lower().replace(" ", "_")
+        fields.append(_FIELD_TEMPLATE.format(
+            field_id=name,
+            name=name,
+            label=html.escape(label),
+            input_type="email" if label == "Email" else "text",
+        ))
+    if submit_mode == "fetch":
+        onclick = _FETCH_SUBMIT_JS.format(alert=ALERT_MESSAGE)
+    else:
+        onclick = f"alert({ALERT_MESSAGE!r});"
+    return _PAGE_TEMPLATE.format(
+        fields="\n".join(fields), nonce=rng.randrange(1 << 30), onclick=html.escape(onclick)
+    )
+
+
+class FormServer:
+    """
+    Local HTTP server serving the replica form at ``/form.html``.
+
+    ``latency`` seconds are added to every response and fields go missing at
+    ``missing_rate``, so runs can be benchmarked without the hosted page. With
+    ``submit_mode="fetch"`` the form also posts to ``/submit``, counted in
+    ``submissions``.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        missing_rate: float = 0.0,
+        seed: Optional[int] = None,
+        submit_mode: str = "alert",
+    ) -> None:
+        """Initialize the server; ``port=0`` picks a free port."""
+        self.latency: float = latency
+        self.missing_rate: float = missing_rate
+        self.submit_mode: str = submit_mode
+        self.page_loads: int = 0
+        self.submissions: int = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Return the URL of the replica form."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/form.html"
+
+    def _handler_class(self):
+        """Build a request handler bound to this server instance."""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] != "/form.html":
+                    self.send_error(404)
+                    return
+                if server.latency:
+                    time.sleep(server.latency)
+                with server._lock:
+                    server.page_loads += 1
+                    body = render_form(server.missing_rate, server._rng, server.submit_mode).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self) -> None:
+                if self.path != "/submit":
+                    self.send_error(404)
+                    return
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if server.latency:
+                    time.sleep(server.latency)
+                with server._lock:
+                    server.submissions += 1
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, format, *args) -> None:
+                pass
+
+        return Handler
+
+    def start(self) -> "FormServer":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Shut the server down."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FormServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -0,0 +1,219 @@
+"""
+In-process stand-in for Playwright's Chromium, for measuring the Python-side
+cost of run_form_submission without a browser.
+
+``SimulatedPlaywright`` replaces ``async_playwright()``: its browsers, contexts
+and pages answer every call ``FormPage`` and the submission workers make, after
+``latency`` seconds, and the submit click shows the success dialog. With
+``failure_rate``, that fraction of clicks times out instead. Like Chromium,
+a closed browser fails every later call.
+"""
+import asyncio
+import random
+from typing import Any, Callable, Dict, List, Optional
+
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+from benchmarks.form_server import ALERT_MESSAGE, FORM_FIELDS
+from pages import form_page
+
+_FINGERPRINT = "simulated-form"
+_SELECTORS = {field: f"#{field.lower().replace(' ', '-')}" for field in FORM_FIELDS}
+
+
+class SimulatedDialog:
+    """The success alert shown after a submit click."""
+
+    def __init__(self, page: "SimulatedPage") -> None:
+        self.page = page
+        self.message: str = ALERT_MESSAGE
+
+    async def accept(self) -> None:
+        await self.page.pause()
+
+
+class SimulatedLocator:
+    """A form field or the submit button."""
+
+    def __init__(self, page: "SimulatedPage", submit: bool = False) -> None:
+        self.page = page
+        self.submit: bool = submit
+
+    async def wait_for(self, state: str = "visible", timeout: Optional[float] = None) -> None:
+        await self.page.pause()
+
+    async def scroll_into_view_if_needed(self, timeout: Optional[float] = None) -> None:
+        await self.page.pause()
+
+    async def fill(self, value: str) -> None:
+        await self.page.pause()
+
+    async def click(self, timeout: Optional[float] = None) -> None:
+        await self.page.pause()
+        if self.page.rng.random() < self.page.failure_rate:
+            raise PlaywrightTimeoutError("Timeout exceeded while clicking (simulated)")
+        if self.submit:
+            self.page.submissions += 1
+            dialog = SimulatedDialog(self.page)
+            for handler in self.page.handlers.get("dialog", []):
+                asyncio.get_running_loop().call_soon(handler, dialog)
+
+
+class SimulatedPage:
+    """Page that always shows the complete challenge form."""
+
+    def __init__(
+        self,
+        latency: float,
+        failure_rate: float,
+        rng: random.Random,
+        browser: Optional["SimulatedBrowser"] = None,
+    ) -> None:
+        self.browser = browser
+        self.latency: float = latency
+        self.failure_rate: float = failure_rate
+        self.rng: random.Random = rng
+        self.handlers: Dict[str, List[Callable]] = {}
+        self.calls: int = 0
+        self.submissions: int = 0
+
+    async def pause(self) -> None:
+        """Stand in for one round-trip to the browser."""
+        if self.browser is not None:
+            self.browser.check_open()
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+
+    def on(self, event: str, handler: Callable) -> None:
+        self.handlers.setdefault(event, []).append(handler)
+
+    async def goto(self, url: str, timeout: Optional[float] = None) -> None:
+        await self.pause()
+
+    async def wait_for_selector(self, selector: str, state: str = "visible", timeout: Optional[float] = None) -> None:
+        await self.pause()
+
+    async def evaluate(self, script: str, arg: Any = None) -> Any:
+        await self.pause()
+        if script is form_page._DETECT_FIELDS_JS:
+            return dict(_SELECTORS)
+        if script is form_page._DETECT_CACHED_FIELDS_JS:
+            fields = None if arg[1] == _FINGERPRINT else dict(_SELECTORS)
+            return {"fingerprint": _FINGERPRINT, "fields": fields}
+        if script is form_page._FILL_ALL_JS:
+            return []
+        if script is form_page._SOFT_RESET_JS:
+            return True
+        raise PlaywrightError("Evaluation failed: script is not supported by the simulated page")
+
+    def get_by_label(self, label: str) -> SimulatedLocator:
+        return SimulatedLocator(self)
+
+    def locator(self, selector: str) -> SimulatedLocator:
+        return SimulatedLocator(self)
+
+    def get_by_role(self, role: str, name: Optional[str] = None) -> SimulatedLocator:
+        return SimulatedLocator(self, submit=role == "button")
+
+
+class SimulatedTracing:
+    """Accepts tracing calls and records nothing."""
+
+    async def start(self, **kwargs: Any) -> None:
+        pass
+
+    async def stop(self, **kwargs: Any) -> None:
+        pass
+
+    async def start_chunk(self, **kwargs: Any) -> None:
+        pass
+
+    async def stop_chunk(self, **kwargs: Any) -> None:
+        pass
+
+
+class SimulatedContext:
+    """Browser context holding simulated pages."""
+
+    def __init__(self, browser: "SimulatedBrowser") -> None:
+        self.browser = browser
+        self.tracing = SimulatedTracing()
+        self.pages: List[SimulatedPage] = []
+
+    def on(self, event: str, handler: Callable) -> None:
+        pass
+
+    async def new_page(self) -> SimulatedPage:
+        self.browser.check_open()
+        page = SimulatedPage(self.browser.latency, self.browser.failure_rate, self.browser.rng, self.browser)
+        self.pages.append(page)
+        return page
+
+    async def storage_state(self) -> Dict[str, Any]:
+        return {"cookies": [], "origins": []}
+
+    async def close(self) -> None:
+        self.browser.calls += sum(page.calls for page in self.pages)
+        self.browser.submissions += sum(page.submissions for page in self.pages)
+        self.browser.contexts.remove(self)
+
+
+class SimulatedBrowser:
+    """Browser whose contexts and pages live in this process."""
+
+    def __init__(self, latency: float, failure_rate: float, seed: int) -> None:
+        self.latency: float = latency
+        self.failure_rate: float = failure_rate
+        self.rng = random.Random(seed)
+        self.contexts: List[SimulatedContext] = []
+        self.calls: int = 0
+        self.submissions: int = 0
+        self.closed: bool = False
+
+    def check_open(self) -> None:
+        """Raise Playwright's error for calls on a closed browser."""
+        if self.closed:
+            raise PlaywrightError("Target page, context or browser has been closed")
+
+    async def new_context(self, **kwargs: Any) -> SimulatedContext:
+        self.check_open()
+        context = SimulatedContext(self)
+        self.contexts.append(context)
+        return context
+
+    async def new_browser_cdp_session(self):
+        # As for a browser without CDP; renderer memory sampling then turns itself off.
+        raise PlaywrightError("CDP session is only available in Chromium")
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class SimulatedChromium:
+    """``playwright.chromium`` returning one shared ``SimulatedBrowser``."""
+
+    def __init__(self, browser: SimulatedBrowser) -> None:
+        self.browser = browser
+
+    async def launch(self, **kwargs: Any) -> SimulatedBrowser:
+        return self.browser
+
+    async def connect_over_cdp(self, endpoint: str, **kwargs: Any) -> SimulatedBrowser:
+        return self.browser
+
+
+class SimulatedPlaywright:
+    """Drop-in for the object ``async_playwright()`` returns."""
+
+    def __init__(self, latency: float = 0.0, failure_rate: float = 0.0, seed: int = 0) -> None:
+        self.browser = SimulatedBrowser(latency, failure_rate, seed)
+        self.chromium = SimulatedChromium(self.browser)
+
+    def __call__(self) -> "SimulatedPlaywright":
+        return self
+
+    async def __aenter__(self) -> "SimulatedPlaywright":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        pass
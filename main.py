@@ -1,149 +1,1302 @@
 import argparse
-from typing import List, Dict
+import contextlib
+import copy
+import csv
+import heapq
+import inspect
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit
+from typing import Any, Callable, List, Dict, Optional, Set, Tuple
 
-import pandas as pd
-from utils.utils import setup_logging
+from utils.utils import launch_browser, serve_browser, setup_logging
+from utils.csv_stream import CsvRowReader
+from utils.jobs import FairScheduler, JobSlots, load_manifest
+from utils.adaptive import AdaptiveConcurrency
+from utils.rate_limiter import TokenBucket
+from utils.journal import SubmissionJournal
+from utils.retry import CircuitBreaker, RetryPolicy, RowFailure
+from utils.network import DEFAULT_BLOCKED_TYPES, ResourcePolicy
+from utils.memory import RendererMemoryMonitor
+from utils.metrics import RunMetrics
+from utils.http_replay import ReplaySession
+from utils.results import ReorderBuffer, ResultsWriter, RunSummary, expand_record
+from utils.validation import RejectsWriter, RowValidator
+from utils.work_queue import WorkQueue, default_owner
 from pages.form_page import FormPage
+from pages.schema_cache import FormSchemaCache
 
 import asyncio
 from playwright.async_api import async_playwright
 
-async def run_form_submission(csv_path: str, form_url: str) -> None:
-    """Run automated form submissions from CSV using Playwright."""
+CSV_FIELDS: List[str] = ["First_Name", "Last_Name", "Email", "Desired_Role"]
+CSV_TO_FORM: Dict[str, str] = {
+    "First_Name": "First Name",
+    "Last_Name": "Last Name",
+    "Email": "Email",
+    "Desired_Role": "Desired Role"
+}
+# Rows are validated before any browser work in chunks of this many rows.
+VALIDATION_CHUNK_SIZE = 500
+
+
+async def _process_row(
+    form_page: FormPage,
+    idx: int,
+    row: Dict[str, str],
+    total: Optional[int],
+    fast_fill: bool = False,
+    soft_reset: bool = False,
+    metrics: Optional[RunMetrics] = None,
+) -> Dict[str, Dict[str, str]]:
+    """
+    Open the form, fill the fields present for one CSV row and submit it.
+
+    With ``fast_fill`` all fields are set in a single ``FormPage.fill_all`` call
+    instead of one fill method per field. With ``soft_reset`` the page left by
+    the previous successful submit is cleared in place when possible instead
+    of being navigated to again. Phase latencies are recorded into ``metrics``.
+    """
     import logging
-    setup_logging()
-    logging.info("Starting automated form submission process.")
-    results: List[Dict[str, Dict[str, str]]] = []
+    first_name: str = str(row["First_Name"])
+    last_name: str = str(row["Last_Name"])
+    desired_role: str = str(row["Desired_Role"])
 
+    record: Dict[str, Dict[str, str]] = {}
+    to_fill: Dict[str, str] = {}
+    # Structured fields for JSON logs; messages use %-style args so they are
+    # only formatted by the logging thread, and not at all when filtered out.
+    log_extra = {"row": idx + 1, "phase": "fill"}
+
+    try:
+        with _phase(metrics, "open"):
+            if not (soft_reset and await form_page.soft_reset()):
+                await form_page.open()
+    except Exception as exc:
+        raise RowFailure("open", exc) from exc
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=False)
-            context = await browser.new_context()
-            page = await context.new_page()
-            logging.info("Playwright browser/page initialized successfully.")
-
-            def handle_dialog(dialog):
-                logging.debug("[DEBUG] Global dialog handler triggered. Accepting dialog with message: %s", dialog.message)
-                asyncio.create_task(dialog.accept())
-            page.on("dialog", handle_dialog)
-
-            form_page = FormPage(page, url=form_url)
-
-            data: pd.DataFrame = pd.read_csv(csv_path)
-            logging.info(
-                f"Loaded user data with {len(data)} rows "
-                f"and columns: {list(data.columns)}"
+        with _phase(metrics, "detect"):
+            present_fields = await form_page.get_present_fields()
+    except Exception as exc:
+        raise RowFailure("detect", exc) from exc
+    fill_started = time.perf_counter()
+
+    for csv_field in CSV_FIELDS:
+        form_key = CSV_TO_FORM[csv_field]
+        value = str(row[csv_field]) if csv_field in row else None
+        if form_key in present_fields:
+            # Only fill if present on form
+            if value and value.strip() and fast_fill:
+                to_fill[form_key] = value
+                record[form_key] = {"status": "successful", "value": value}
+            elif value and value.strip():
+                try:
+                    if form_key == "First Name":
+                        logging.debug("[DEBUG] Filling First Name: %s", value, extra=log_extra)
+                        await form_page.fill_first_name(value)
+                    elif form_key == "Last Name":
+                        logging.debug("[DEBUG] Filling Last Name: %s", value, extra=log_extra)
+                        await form_page.fill_last_name(value)
+                    elif form_key == "Email":
+                        logging.debug("[DEBUG] Filling Email: %s", value, extra=log_extra)
+                        await form_page.fill_email(value)
+                    elif form_key == "Desired Role":
+                        logging.debug("[DEBUG] Filling Desired Role: %s", value, extra=log_extra)
+                        await form_page.fill_desired_role(value)
+                    record[form_key] = {"status": "successful", "value": value}
+                except Exception as exc:
+                    record[form_key] = {"status": f"error: {exc}", "value": value}
+            else:
+                record[form_key] = {"status": "not submitted", "value": ""}
+        else:
+
+            record[form_key] = {
+                "status": "not required",
+                "value": "",
+                "explanation": "Field not present on form at runtime"
+            }
+
+    if to_fill:
+        logging.debug("[DEBUG] Fast-filling fields: %s", list(to_fill), extra=log_extra)
+        try:
+            fill_errors = await form_page.fill_all(to_fill)
+        except Exception as exc:
+            # One in-page script for every field; if it dies the page went away under it.
+            raise RowFailure("fill", exc) from exc
+        for form_key, error in fill_errors.items():
+            if error is not None:
+                record[form_key]["status"] = f"error: {error}"
+
+    _add_extra_fields(record, row)
+    if metrics is not None:
+        metrics.observe("fill", time.perf_counter() - fill_started)
+
+    log_extra = {"row": idx + 1, "phase": "submit"}
+    try:
+        logging.info(
+            "Submitting form for %s %s (%s) — Row %d/%s",
+            first_name, last_name, desired_role, idx + 1, total or "?", extra=log_extra,
+        )
+
+        logging.debug("[DEBUG] Submitting form and waiting for alert...", extra=log_extra)
+        with _phase(metrics, "submit"):
+            alert_message, alert_latency = await form_page.submit_and_handle_alert()
+
+        logging.info(
+            "Form submitted successfully for %s %s (%s) in %.3fs",
+            first_name, last_name, desired_role, alert_latency, extra=log_extra,
+        )
+        logging.info(
+            "[ALERT] %s %s (%s): %s", first_name, last_name, desired_role, alert_message, extra=log_extra
+        )
+
+    except Exception as exc:
+        logging.error("[DEBUG] Exception during form submission: %s", exc, extra=log_extra)
+        logging.error(
+            "Error submitting form for %s %s: %s", first_name, last_name, exc,
+            exc_info=True, extra=log_extra,
+        )
+        raise RowFailure("submit", exc) from exc
+
+    logging.info(
+        "Proceeding to next user after handling alert for %s %s.", first_name, last_name, extra=log_extra
+    )
+    return record
+
+
+def _shard_of(idx: int, row: Dict[str, str], key_columns: List[str], count: int) -> int:
+    """
+    Assign a row to one of ``count`` shards by the hash of its key columns, so
+    duplicates land in the same shard; rows without a key are spread by index.
+    """
+    key = "\x1f".join(row.get(column, "").strip().lower() for column in key_columns)
+    if not key.strip("\x1f"):
+        return idx % count
+    return zlib.crc32(key.encode("utf-8")) % count
+
+
+def _viable_rows(
+    reader: CsvRowReader,
+    validator: Optional[RowValidator],
+    rejects: Optional[RejectsWriter],
+):
+    """Yield the rows of ``reader`` that pass ``validator``, writing the others to ``rejects``."""
+    chunk: List[Tuple[int, Dict[str, str]]] = []
+    for item in reader:
+        chunk.append(item)
+        if len(chunk) >= VALIDATION_CHUNK_SIZE:
+            yield from _check_chunk(chunk, validator, rejects)
+            chunk = []
+    yield from _check_chunk(chunk, validator, rejects)
+
+
+def _check_chunk(chunk, validator: Optional[RowValidator], rejects: Optional[RejectsWriter]):
+    """Yield the viable rows of one chunk."""
+    reasons = validator.check(chunk) if validator is not None else [None] * len(chunk)
+    for (idx, row), reason in zip(chunk, reasons):
+        if reason is None:
+            yield idx, row
+        elif rejects is not None:
+            rejects.write(idx, row, reason)
+
+
+def _phase(metrics: Optional[RunMetrics], name: str):
+    """Time a phase into ``metrics`` if instrumentation is enabled."""
+    return metrics.time(name) if metrics is not None else contextlib.nullcontext()
+
+
+def _add_extra_fields(record: Dict[str, Dict[str, str]], row: Dict[str, str]) -> None:
+    """Record CSV columns the form does not use."""
+    for extra_field in row:
+        if extra_field not in CSV_FIELDS:
+            record[extra_field] = {"status": "not required", "value": str(row[extra_field]), "explanation": "Extra field in CSV, not required by form"}
+
+
+def _failed_record(row: Dict[str, str], failure: RowFailure) -> Dict[str, Dict[str, str]]:
+    """Build the record of a row that failed for good."""
+    record: Dict[str, Dict[str, str]] = {}
+    for csv_field in CSV_FIELDS:
+        value = str(row[csv_field]) if csv_field in row else ""
+        record[CSV_TO_FORM[csv_field]] = {
+            "status": f"error: {failure.kind}",
+            "value": value,
+            "explanation": str(failure.cause),
+        }
+    _add_extra_fields(record, row)
+    return record
+
+
+class _RunState:
+    """State shared by all submission workers of one run."""
+
+    def __init__(
+        self,
+        form_url: str,
+        queue: "asyncio.Queue",
+        on_result: Callable[[int, Any, Dict[str, Dict[str, str]], bool], None],
+        total: Optional[int],
+        schema_cache: FormSchemaCache,
+        retry_policy: RetryPolicy,
+        fast_fill: bool = False,
+        rate_limiter: Optional[TokenBucket] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        adaptive: Optional[AdaptiveConcurrency] = None,
+        slots: Optional[JobSlots] = None,
+        resource_policy: Optional[ResourcePolicy] = None,
+        soft_reset: bool = False,
+        recycle_after: Optional[int] = None,
+        memory_ceiling_mb: Optional[float] = None,
+        memory_monitor: Optional[RendererMemoryMonitor] = None,
+        metrics: Optional[RunMetrics] = None,
+        profile_every: Optional[int] = None,
+        profile_dir: str = "profiles",
+        replay: Optional[ReplaySession] = None,
+        max_pending: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize the shared state; queue items are ``(idx, row, attempt)``.
+
+        ``total`` stays None until the whole CSV has been read. With
+        ``max_pending``, at most that many rows are queued or in flight at once.
+        """
+        self.form_url: str = form_url
+        self.queue: asyncio.Queue = queue
+        self.on_result = on_result
+        self.total: Optional[int] = total
+        self.schema_cache: FormSchemaCache = schema_cache
+        self.retry_policy: RetryPolicy = retry_policy
+        self.fast_fill: bool = fast_fill
+        self.rate_limiter: Optional[TokenBucket] = rate_limiter
+        self.breaker: Optional[CircuitBreaker] = breaker
+        self.adaptive: Optional[AdaptiveConcurrency] = adaptive
+        self.slots: Optional[JobSlots] = slots
+        self.resource_policy: Optional[ResourcePolicy] = resource_policy
+        self.soft_reset: bool = soft_reset
+        self.recycle_after: Optional[int] = recycle_after
+        self.memory_ceiling_mb: Optional[float] = memory_ceiling_mb
+        self.memory_monitor: Optional[RendererMemoryMonitor] = memory_monitor
+        self.metrics: RunMetrics = metrics or RunMetrics()
+        self.profile_every: Optional[int] = profile_every
+        self.profile_dir: str = profile_dir
+        self.replay: Optional[ReplaySession] = replay
+        self.pending: Optional[asyncio.Semaphore] = (
+            asyncio.Semaphore(max_pending) if max_pending else None
+        )
+        self.recycles: int = 0
+        self.navigations: int = 0
+        self.soft_resets: int = 0
+        self.retries: int = 0
+        self.failure_counts: Dict[str, int] = {}
+        self._background: Set[asyncio.Task] = set()
+
+    def complete(self, idx: int, row: Any, record: Dict[str, Dict[str, str]], submitted: bool = True) -> None:
+        """
+        Hand a finished row to ``on_result`` and free its pending slot.
+
+        ``submitted`` is False only for rows whose submit never succeeded; a
+        submitted row may still carry per-field fill errors in its record.
+        """
+        self.on_result(idx, row, record, submitted)
+        if self.pending is not None:
+            self.pending.release()
+
+    def spawn(self, coro) -> None:
+        """Run ``coro`` in a background task owned by the run."""
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def requeue(self, item: Tuple[int, Any, int], delay: float) -> None:
+        """
+        Put ``item`` back on the queue after ``delay`` seconds without blocking.
+
+        The queue's unfinished-task count covers the row until it is back on the
+        queue, so draining the queue also waits for pending retries.
+        """
+        self.spawn(self._requeue_later(item, delay))
+
+    async def _requeue_later(self, item: Tuple[int, Any, int], delay: float) -> None:
+        """Sleep, re-enqueue ``item`` and release the slot of its previous attempt."""
+        await asyncio.sleep(delay)
+        self.queue.put_nowait(item)
+        self.queue.task_done()
+
+    def cancel_background(self) -> None:
+        """Drop retries still waiting for their backoff and in-flight replays."""
+        for task in list(self._background):
+            task.cancel()
+
+
+async def _open_session(browser, run: _RunState) -> Tuple[Any, FormPage]:
+    """Create a browser context and page wrapped in a ``FormPage``."""
+    context = await browser.new_context()
+    if run.resource_policy is not None:
+        await run.resource_policy.install(context)
+    if run.profile_every:
+        await context.tracing.start(screenshots=True, snapshots=True)
+    if run.replay is not None and run.replay.learning:
+        run.replay.watch(context)
+    page = await context.new_page()
+    return context, FormPage(page, url=run.form_url, schema_cache=run.schema_cache)
+
+
+async def _close_session(context, form_page: FormPage, run: _RunState) -> None:
+    """Fold the page's counters into the run and close its context."""
+    run.navigations += form_page.navigations
+    run.soft_resets += form_page.soft_resets
+    if run.profile_every:
+        await context.tracing.stop()
+    await context.close()
+
+
+async def _run_row(context, form_page: FormPage, idx: int, row: Any, run: _RunState) -> Dict[str, Dict[str, str]]:
+    """
+    Process one row attempt, timing it and tracing it if the row is sampled.
+
+    With shared pool ``slots`` the attempt holds one of them throughout.
+    """
+    if run.slots is not None:
+        await run.slots.acquire()
+    traced = bool(run.profile_every) and idx % run.profile_every == 0
+    try:
+        if traced:
+            await context.tracing.start_chunk(title=f"row-{idx + 1}")
+        with run.metrics.time("row"):
+            return await _process_row(
+                form_page, idx, row, run.total, run.fast_fill, run.soft_reset, run.metrics
             )
+    finally:
+        if traced:
+            trace_path = os.path.join(run.profile_dir, f"row-{idx + 1}.zip")
+            await context.tracing.stop_chunk(path=trace_path)
+        if run.slots is not None:
+            run.slots.release()
 
-            for idx, row in data.iterrows():
-                first_name: str = str(row["First_Name"])
-                last_name: str = str(row["Last_Name"])
-                email: str = str(row["Email"])
-                desired_role: str = str(row["Desired_Role"])
-
-                csv_fields = ["First_Name", "Last_Name", "Email", "Desired_Role"]
-                csv_to_form = {
-                    "First_Name": "First Name",
-                    "Last_Name": "Last Name",
-                    "Email": "Email",
-                    "Desired_Role": "Desired Role"
-                }
-
-                form_fields = {
-                    "First Name": first_name,
-                    "Last Name": last_name,
-                    "Email": email,
-                    "Desired Role": desired_role
-                }
-
-                record: Dict[str, Dict[str, str]] = {}
 
-                await form_page.open()
-                present_fields = await form_page.get_present_fields()
-
-                for csv_field in csv_fields:
-                    form_key = csv_to_form[csv_field]
-                    value = str(row[csv_field]) if csv_field in row else None
-                    if form_key in present_fields:
-                        # Only fill if present on form
-                        if value and value.strip():
-                            try:
-                                if form_key == "First Name":
-                                    logging.debug("[DEBUG] Filling First Name: %s", value)
-                                    await form_page.fill_first_name(value)
-                                elif form_key == "Last Name":
-                                    logging.debug("[DEBUG] Filling Last Name: %s", value)
-                                    await form_page.fill_last_name(value)
-                                elif form_key == "Email":
-                                    logging.debug("[DEBUG] Filling Email: %s", value)
-                                    await form_page.fill_email(value)
-                                elif form_key == "Desired Role":
-                                    logging.debug("[DEBUG] Filling Desired Role: %s", value)
-                                    await form_page.fill_desired_role(value)
-                                record[form_key] = {"status": "successful", "value": value}
-                            except Exception as exc:
-                                record[form_key] = {"status": f"error: {exc}", "value": value}
-                        else:
-                            record[form_key] = {"status": "not submitted", "value": ""}
-                    else:
+def _replay_record(row: Any, present_fields: Set[str]) -> Dict[str, Dict[str, str]]:
+    """Build the record of a replayed row, treating the template's fields as present."""
+    record: Dict[str, Dict[str, str]] = {}
+    for csv_field in CSV_FIELDS:
+        form_key = CSV_TO_FORM[csv_field]
+        value = str(row[csv_field]) if csv_field in row else None
+        if form_key not in present_fields:
+            record[form_key] = {
+                "status": "not required",
+                "value": "",
+                "explanation": "Field not present on form at runtime"
+            }
+        elif value and value.strip():
+            record[form_key] = {"status": "successful", "value": value}
+        else:
+            record[form_key] = {"status": "not submitted", "value": ""}
+    _add_extra_fields(record, row)
+    return record
+
+
+def _submitted_values(record: Dict[str, Dict[str, str]]) -> Dict[str, str]:
+    """Return the form values a record reports as filled."""
+    return {
+        form_key: entry["value"]
+        for form_key, entry in record.items()
+        if form_key in CSV_TO_FORM.values() and entry["status"] == "successful"
+    }
+
+
+async def _replay_row(run: _RunState, idx: int, row: Any, attempt: int) -> None:
+    """
+    Submit one row over HTTP with the learned template.
+
+    Owns the row's queue slot. A failed replay puts the row back on the queue
+    for the browser path instead of failing it.
+    """
+    import logging
+    try:
+        record = _replay_record(row, set(run.replay.template.field_params))
+        with run.metrics.time("replay"):
+            await run.replay.submit(_submitted_values(record))
+    except Exception as exc:
+        logging.warning(
+            "Replay of row %d failed (%s); falling back to the browser path.", idx + 1, exc,
+            extra={"row": idx + 1, "phase": "replay"},
+        )
+        run.replay.fallbacks += 1
+        run.replay.browser_only.add(idx)
+        run.queue.put_nowait((idx, row, attempt))
+    else:
+        logging.debug(
+            "[DEBUG] Replayed row %d/%s over HTTP.", idx + 1, run.total or "?",
+            extra={"row": idx + 1, "phase": "replay"},
+        )
+        if run.breaker is not None:
+            run.breaker.record(True)
+        run.metrics.record_row(True)
+        run.complete(idx, row, record)
+    finally:
+        run.replay.slots.release()
+        run.queue.task_done()
+
 
-                        record[form_key] = {
-                            "status": "not required",
-                            "value": "",
-                            "explanation": "Field not present on form at runtime"
-                        }
+async def _needs_recycle(run: _RunState, submissions: int) -> Optional[str]:
+    """Return why the worker's context should be recycled now, or None."""
+    if run.recycle_after is not None and submissions >= run.recycle_after:
+        return f"{submissions} submissions"
+    if run.memory_monitor is None:
+        return None
+    rss = await run.memory_monitor.sample()
+    if rss is not None and run.memory_ceiling_mb is not None and rss > run.memory_ceiling_mb * 1024 * 1024:
+        return f"renderer RSS {rss / (1024 * 1024):.0f} MB"
+    return None
 
-                for extra_field in row.index:
-                    if extra_field not in csv_fields:
-                        record[extra_field] = {"status": "not required", "value": str(row[extra_field]), "explanation": "Extra field in CSV, not required by form"}
 
+async def _submission_worker(worker_id: int, browser, run: _RunState) -> None:
+    """
+    Pull rows from the shared queue and submit them on an isolated browser context.
+
+    Dialogs are accepted by the worker's own ``FormPage``; pacing, if any, comes
+    from the shared rate limiter. Rows that fail with a retryable failure class
+    are requeued with backoff; other failures are recorded. With an adaptive
+    limit, a browser row waits for one of its slots and reports its outcome
+    and latency back. Every finished row
+    is handed to ``run.complete``. Between rows the context is recycled once
+    it reaches the submission or memory limit, so no in-flight row is dropped.
+    Once HTTP replay is ready, rows are handed to background replays instead.
+    """
+    import logging
+    context, form_page = await _open_session(browser, run)
+    logging.info(f"Worker {worker_id}: browser context/page initialized successfully.")
+    submissions = 0
+
+    try:
+        while True:
+            idx, row, attempt = await run.queue.get()
+            handed_off = False
+            try:
+                if run.breaker is not None:
+                    await run.breaker.wait_closed()
+                if run.rate_limiter is not None:
+                    await run.rate_limiter.acquire()
+                if run.replay is not None and run.replay.use_replay(idx):
+                    await run.replay.slots.acquire()
+                    run.spawn(_replay_row(run, idx, row, attempt))
+                    handed_off = True
+                    continue
+                submissions += 1
+                if run.adaptive is not None:
+                    await run.adaptive.acquire()
+                started = time.monotonic()
                 try:
-                    logging.info(
-                        f"Submitting form for {first_name} {last_name} "
-                        f"({desired_role}) — Row {idx + 1}/{len(data)}"
-                    )
+                    record = await _run_row(context, form_page, idx, row, run)
+                except RowFailure as failure:
+                    if run.adaptive is not None:
+                        run.adaptive.release(False, time.monotonic() - started)
+                    if run.breaker is not None:
+                        run.breaker.record(False)
+                    if run.retry_policy.should_retry(failure.kind, attempt):
+                        delay = run.retry_policy.backoff(attempt)
+                        logging.warning(
+                            "Row %d failed (%s) on attempt %d; retrying in %.1fs.",
+                            idx + 1, failure.kind, attempt, delay,
+                            extra={"row": idx + 1, "phase": failure.phase, "worker": worker_id},
+                        )
+                        run.retries += 1
+                        run.requeue((idx, row, attempt + 1), delay)
+                        handed_off = True
+                    else:
+                        logging.error(
+                            "Row %d failed (%s) after %d attempt(s): %s",
+                            idx + 1, failure.kind, attempt, failure.cause,
+                            extra={"row": idx + 1, "phase": failure.phase, "worker": worker_id},
+                        )
+                        run.failure_counts[failure.kind] = run.failure_counts.get(failure.kind, 0) + 1
+                        run.metrics.record_row(False)
+                        run.complete(idx, row, _failed_record(row, failure), submitted=False)
+                else:
+                    if run.adaptive is not None:
+                        run.adaptive.release(True, time.monotonic() - started)
+                    if run.breaker is not None:
+                        run.breaker.record(True)
+                    run.metrics.record_row(True)
+                    run.complete(idx, row, record)
+                    if run.replay is not None and run.replay.learning:
+                        await run.replay.learn(context, _submitted_values(record))
+            finally:
+                if not handed_off:
+                    run.queue.task_done()
 
-                    logging.debug("[DEBUG] Submitting form and waiting for alert...")
-                    alert_message = await form_page.submit_and_handle_alert()
+            reason = await _needs_recycle(run, submissions)
+            # With nothing queued the context may be about to close anyway.
+            if reason is not None and not run.queue.empty():
+                logging.info(f"Worker {worker_id}: recycling browser context after {reason}.")
+                old_context, old_form_page, context = context, form_page, None
+                await _close_session(old_context, old_form_page, run)
+                context, form_page = await _open_session(browser, run)
+                submissions = 0
+                run.recycles += 1
+                if run.memory_monitor is not None:
+                    run.memory_monitor.invalidate()
+    finally:
+        if context is not None:
+            await _close_session(context, form_page, run)
 
-                    logging.info(
-                        f"Form submitted successfully for {first_name} "
-                        f"{last_name} ({desired_role})"
-                    )
-                    logging.info(f"[ALERT] {first_name} {last_name} ({desired_role}): {alert_message}")
 
-                except Exception as exc:
-                    logging.error(f"[DEBUG] Exception during form submission: {exc}")
-                    logging.error(
-                        f"Error submitting form for {first_name} {last_name}: {exc}",
-                        exc_info=True,
-                    )
+async def _drain_queue(
+    queue: "asyncio.Queue",
+    workers: List["asyncio.Task"],
+    producer: Optional["asyncio.Task"] = None,
+) -> None:
+    """
+    Wait until ``producer`` has queued every row and every row is processed,
+    failing fast if the producer or a worker dies.
 
-                results.append(record)
-                logging.info(f"Proceeding to next user after handling alert for {first_name} {last_name}.")
-                await asyncio.sleep(5)
+    ``workers`` may grow while the producer runs.
+    """
+    join_task: Optional[asyncio.Task] = None
+    try:
+        while join_task is None or not join_task.done():
+            if producer is not None and producer.done():
+                producer.result()
+                producer = None
+            if producer is None and join_task is None:
+                # Only join once no more rows can arrive; the queue may run dry before that.
+                join_task = asyncio.create_task(queue.join())
+            waiting = {task for task in (producer, join_task) if task is not None}
+            done, _ = await asyncio.wait(
+                waiting | set(workers), return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task in workers:
+                    # Workers only return by raising; surface the first failure.
+                    task.result()
+    finally:
+        for task in (producer, join_task, *workers):
+            if task is not None:
+                task.cancel()
+        await asyncio.gather(
+            *(task for task in (producer, *workers) if task is not None), return_exceptions=True
+        )
 
-            await browser.close()
-            logging.info("Playwright browser closed successfully.")
+
+async def run_form_submission(
+    csv_path: str,
+    form_url: str,
+    concurrency: int = 1,
+    fast_fill: bool = False,
+    rate: Optional[float] = None,
+    burst: int = 1,
+    journal_path: Optional[str] = None,
+    resume: bool = False,
+    resume_skip_failed: bool = False,
+    journal_fsync_interval: float = 1.0,
+    retry_policy: Optional[RetryPolicy] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    resource_policy: Optional[ResourcePolicy] = None,
+    soft_reset: bool = False,
+    recycle_after: Optional[int] = None,
+    memory_ceiling_mb: Optional[float] = None,
+    memory_sample_interval: float = 5.0,
+    metrics_json: Optional[str] = None,
+    metrics_prom: Optional[str] = None,
+    metrics_interval: Optional[float] = 30.0,
+    profile_every: Optional[int] = None,
+    profile_dir: str = "profiles",
+    headless: bool = False,
+    browser_endpoint: Optional[str] = None,
+    launch_args: Optional[List[str]] = None,
+    replay: bool = False,
+    replay_concurrency: int = 32,
+    replay_verify_every: Optional[int] = 50,
+    max_pending_rows: int = 1000,
+    results_path: Optional[str] = None,
+    summary_rows: int = 100,
+    validate: bool = True,
+    required_fields: Optional[List[str]] = None,
+    dedup_key: Optional[List[str]] = None,
+    rejects_path: Optional[str] = None,
+    log_level: str = "INFO",
+    log_json: bool = False,
+    log_sample: Optional[Dict[str, float]] = None,
+    shard: Optional[Tuple[int, int]] = None,
+    report: bool = True,
+    queue_db: Optional[str] = None,
+    queue_load: bool = False,
+    lease_seconds: float = 300.0,
+    claim_batch: int = 50,
+    min_concurrency: Optional[int] = None,
+    latency_target: Optional[float] = None,
+    concurrency_log: Optional[str] = None,
+    column_map: Optional[Dict[str, str]] = None,
+    shared_browser: Optional[Tuple[Any, Any]] = None,
+    slots: Optional[JobSlots] = None,
+    job_name: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Run automated form submissions from CSV using Playwright.
+
+    The CSV is streamed rather than loaded: submissions start while it is
+    still being read, and reading pauses while ``max_pending_rows`` rows are
+    queued or in flight. Rows are distributed over ``concurrency`` isolated
+    browser contexts.
+
+    With ``min_concurrency``, ``concurrency`` becomes an upper bound and the
+    number of rows in flight is adapted between the two (AIMD): it grows by
+    one per healthy window of rows and halves when failures or latency spikes
+    appear (p90 above ``latency_target`` seconds, or without one a median
+    twice the median of healthy windows). Every change is appended to
+    ``concurrency_log``.
+
+    Finished rows are appended to ``results_path`` (``.csv``, ``.jsonl`` or
+    ``.parquet``) as compact records, in CSV row order, and folded into
+    running per-field counts.
+    Only the first ``summary_rows`` rows are kept for the summary table, in
+    CSV row order, so memory does not grow with the number of rows.
+
+    With ``validate``, rows are checked before they reach a browser: the CSV
+    must have every ``CSV_FIELDS`` column (after ``column_map``), and rows with
+    a blank ``required_fields`` value (default: none), an invalid email or a
+    repeated ``dedup_key`` (default: ``Email``) are skipped and written to
+    ``rejects_path``. Rows with a blank key are never duplicates.
+
+    Logs are written by a background thread at ``log_level``, as JSON lines with
+    row/phase/worker fields if ``log_json``; ``log_sample`` maps level names to
+    the fraction of their records to keep, e.g. ``{"DEBUG": 0.01}``.
+
+    With ``queue_db`` rows come from a SQLite work queue shared with other
+    worker processes or hosts instead of from the CSV: batches of
+    ``claim_batch`` rows are leased for ``lease_seconds`` (renewed while the
+    run is alive) and outcomes are written back, until no row is pending or
+    leased. ``queue_load`` first loads the validated CSV into the queue;
+    without it ``csv_path`` is not read.
+
+    ``column_map`` renames CSV header columns to the expected ones, e.g.
+    ``{"given_name": "First_Name"}``. With ``shared_browser=(playwright, browser)``
+    the run uses that browser instead of launching one, leaves it open and
+    leaves logging to the caller; ``slots`` then shares browser work with
+    other runs and ``job_name`` titles the summary (see ``run_jobs``).
+
+    ``shard=(index, count)`` only processes the rows ``_shard_of`` assigns to
+    ``index`` (see ``run_sharded_submission``). Without ``report`` no summary is
+    printed. Returns the final metrics snapshot, with the summary's run
+    statistics under ``run_stats``. ``fast_fill`` sets all fields
+    of a row in one in-page script. ``rate`` (rows/sec) and ``burst`` pace row
+    starts across all workers with a token bucket; no pacing when ``rate`` is None.
+
+    With ``journal_path`` every finished row is appended to a submission journal;
+    ``resume`` skips rows the journal already records with unchanged content;
+    rows whose submit failed are submitted again unless ``resume_skip_failed``.
+
+    Failed rows are classified and retried according to ``retry_policy``
+    (default ``RetryPolicy()``); ``breaker`` pauses intake while the recent
+    error rate is too high. ``resource_policy`` is installed on every browser
+    context to block or locally cache resources the form does not need.
+    ``soft_reset`` reuses the loaded form after a successful submit instead of
+    navigating to it for every row.
+
+    Each worker's browser context is recycled after ``recycle_after``
+    submissions or once the renderers' total RSS exceeds ``memory_ceiling_mb``
+    (sampled at most every ``memory_sample_interval`` seconds).
+
+    Per-phase latencies are written to ``metrics_json`` and/or ``metrics_prom``
+    (Prometheus text format) every ``metrics_interval`` seconds and at the end.
+    With ``profile_every``, every Nth row is captured as a Playwright trace in
+    ``profile_dir``. ``headless`` launches Chromium without a window and
+    ``launch_args`` adds Chromium flags; with ``browser_endpoint`` the run
+    connects to a warm browser (``--serve-browser``) instead of launching one.
+
+    With ``replay``, the browser path learns the form's submit request from the
+    first rows and later rows are replayed over HTTP with at most
+    ``replay_concurrency`` requests in flight; every ``replay_verify_every``-th
+    row and every failed replay still goes through the browser.
+    """
+    import logging
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+    if resume and journal_path is None:
+        raise ValueError("resume requires a journal_path")
+    if resume_skip_failed and not resume:
+        raise ValueError("resume_skip_failed requires resume")
+    if queue_db is not None and resume:
+        raise ValueError("resume is not needed with queue_db; the work queue records finished rows")
+    if min_concurrency is not None and not 1 <= min_concurrency <= concurrency:
+        raise ValueError(f"min_concurrency must be between 1 and concurrency, got {min_concurrency}")
+    if max_pending_rows < 1:
+        raise ValueError(f"max_pending_rows must be at least 1, got {max_pending_rows}")
+    rate_limiter = TokenBucket(rate, burst) if rate is not None else None
+    adaptive = (
+        AdaptiveConcurrency(
+            min_concurrency, concurrency, latency_target=latency_target, log_path=concurrency_log
+        )
+        if min_concurrency is not None else None
+    )
+    if shared_browser is None:
+        setup_logging(
+            level=logging.getLevelName(log_level.upper()),
+            json_format=log_json,
+            sample_rates={
+                logging.getLevelName(name.upper()): rate for name, rate in (log_sample or {}).items()
+            },
+        )
+    logging.info(f"Starting automated form submission process{f' for job {job_name}' if job_name else ''}.")
+    results: Dict[int, Dict[str, Dict[str, str]]] = {}
+    form_fields = list(CSV_TO_FORM.values())
+    totals = RunSummary(form_fields)
+    writer = ResultsWriter(results_path, form_fields) if results_path is not None else None
+    # Rows finish out of order; the writer gets them in the order they were fed.
+    order = ReorderBuffer()
+    key_columns = (["Email"] if dedup_key is None else list(dedup_key)) if validate else []
+    schema_cache = FormSchemaCache()
+    journal = (
+        SubmissionJournal(journal_path, fsync_interval=journal_fsync_interval)
+        if journal_path is not None else None
+    )
+    metrics = RunMetrics()
+    browser = None
+    flusher = None
+    exporter = None
+    run: Optional[_RunState] = None
+    reader: Optional[CsvRowReader] = None
+    replay_session: Optional[ReplaySession] = None
+    rejects: Optional[RejectsWriter] = None
+    validator: Optional[RowValidator] = None
+    work_queue: Optional[WorkQueue] = None
+    owner = default_owner()
+    outcomes: List[Tuple[int, Dict[str, Dict[str, str]]]] = []
+    syncer = None
+    if profile_every:
+        os.makedirs(profile_dir, exist_ok=True)
+
+    def collect(idx: int, record: Dict[str, Dict[str, str]]) -> None:
+        totals.add(record)
+        if writer is not None:
+            for ready_idx, ready_record in order.add(idx, record):
+                writer.write(ready_idx, ready_record)
+        if idx < summary_rows:
+            results[idx] = record
+
+    def record_result(idx: int, row: Any, record: Dict[str, Dict[str, str]], submitted: bool) -> None:
+        collect(idx, record)
+        if journal is not None:
+            journal.append(idx, SubmissionJournal.row_hash(row), record, submitted)
+        if work_queue is not None:
+            outcomes.append((idx, record, submitted))
+
+    async def sync_work_queue(interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            batch = outcomes[:]
+            del outcomes[:len(batch)]
+            await asyncio.to_thread(work_queue.complete, batch)
+            await asyncio.to_thread(work_queue.renew, owner)
+
+    try:
+        if queue_db is None or queue_load:
+            reader = CsvRowReader(csv_path, rename=column_map).open()
+            logging.info(f"Streaming user data with columns: {reader.columns}")
+            if validate:
+                validator = RowValidator(
+                    reader.columns,
+                    required=required_fields or [],
+                    key_columns=["Email"] if dedup_key is None else dedup_key,
+                    expected=CSV_FIELDS,
+                )
+                if rejects_path is not None:
+                    rejects = RejectsWriter(rejects_path, reader.columns)
+        if queue_db is not None:
+            work_queue = WorkQueue(queue_db, lease_seconds=lease_seconds)
+            if queue_load:
+                loaded = work_queue.load(_viable_rows(reader, validator, rejects))
+                logging.info(f"Loaded {loaded} new rows into work queue {queue_db}.")
+            logging.info(f"Working on queue {queue_db} as {owner}.")
+
+        async with contextlib.AsyncExitStack() as stack:
+            if shared_browser is None:
+                p = await stack.enter_async_context(async_playwright())
+                browser = await launch_browser(
+                    p, headless=headless, args=launch_args, endpoint=browser_endpoint
+                )
+                logging.info("Playwright browser initialized successfully.")
+            else:
+                p, browser = shared_browser
+
+            committed = journal.load(include_failed=resume_skip_failed) if resume else {}
+            queue: asyncio.Queue = asyncio.Queue()
+            if journal is not None:
+                flusher = asyncio.create_task(journal.flush_periodically())
+            if metrics_interval and (metrics_json or metrics_prom):
+                exporter = asyncio.create_task(
+                    metrics.export_periodically(metrics_json, metrics_prom, metrics_interval)
+                )
+
+            if replay:
+                replay_session = ReplaySession(
+                    p, concurrency=replay_concurrency, verify_every=replay_verify_every
+                )
+            run = _RunState(
+                form_url, queue, record_result, None, schema_cache,
+                retry_policy or RetryPolicy(),
+                fast_fill=fast_fill, rate_limiter=rate_limiter, breaker=breaker,
+                adaptive=adaptive, slots=slots,
+                resource_policy=resource_policy, soft_reset=soft_reset,
+                recycle_after=recycle_after, memory_ceiling_mb=memory_ceiling_mb,
+                memory_monitor=RendererMemoryMonitor(browser, memory_sample_interval),
+                metrics=metrics, profile_every=profile_every, profile_dir=profile_dir,
+                replay=replay_session, max_pending=max_pending_rows,
+            )
+            workers: List[asyncio.Task] = []
+
+            restored = 0
+
+            async def enqueue(idx: int, row: Dict[str, str]) -> None:
+                if writer is not None:
+                    order.expect(idx)
+                await run.pending.acquire()
+                queue.put_nowait((idx, row, 1))
+                # Start workers as rows arrive, so small files do not open idle contexts.
+                if len(workers) < concurrency:
+                    workers.append(asyncio.create_task(
+                        _submission_worker(len(workers), browser, run)
+                    ))
+
+            async def feed_chunk(chunk: List[Tuple[int, Dict[str, str]]]) -> None:
+                nonlocal restored
+                for idx, row in _check_chunk(chunk, validator, rejects):
+                    entry = committed.get(idx)
+                    if entry is not None and entry[0] == SubmissionJournal.row_hash(row):
+                        if writer is not None:
+                            order.expect(idx)
+                        collect(idx, entry[1])
+                        restored += 1
+                        continue
+                    if entry is not None:
+                        logging.warning(f"Row {idx + 1} changed since it was journaled; submitting again.")
+                    await enqueue(idx, row)
+                await asyncio.sleep(0)
+
+            async def feed_queue() -> None:
+                chunk: List[Tuple[int, Dict[str, str]]] = []
+                for item in reader:
+                    if shard is not None and _shard_of(*item, key_columns, shard[1]) != shard[0]:
+                        continue
+                    chunk.append(item)
+                    if len(chunk) >= VALIDATION_CHUNK_SIZE:
+                        await feed_chunk(chunk)
+                        chunk = []
+                await feed_chunk(chunk)
+                run.total = reader.rows_read
+                logging.info(f"Read {reader.rows_read} rows from {csv_path}.")
+                if committed:
+                    logging.info(f"Resuming: {restored} rows already committed in {journal_path}.")
+
+            async def feed_from_work_queue() -> None:
+                claimed = 0
+                while True:
+                    batch = await asyncio.to_thread(work_queue.claim, owner, claim_batch)
+                    for idx, row in batch:
+                        await enqueue(idx, row)
+                    claimed += len(batch)
+                    if batch:
+                        continue
+                    # Nothing claimable: finished, or other leases (ours included) are still out.
+                    expiry = await asyncio.to_thread(work_queue.next_expiry)
+                    if expiry is None:
+                        break
+                    await asyncio.sleep(min(max(expiry - time.time(), 0.5), sync_interval))
+                logging.info(f"Work queue {queue_db} is drained; this worker claimed {claimed} rows.")
+
+            if work_queue is not None:
+                sync_interval = max(0.5, min(5.0, lease_seconds / 3))
+                syncer = asyncio.create_task(sync_work_queue(sync_interval))
+                producer = asyncio.create_task(feed_from_work_queue())
+            else:
+                producer = asyncio.create_task(feed_queue())
+            try:
+                await _drain_queue(queue, workers, producer)
+            finally:
+                run.cancel_background()
+                if replay_session is not None:
+                    await replay_session.close()
 
     except Exception as exc:
         import logging
         logging.critical("Critical failure during form submissions.", exc_info=True)
         raise
     finally:
-        await browser.close()
-        _print_summary(results)
+        if flusher is not None:
+            flusher.cancel()
+        if exporter is not None:
+            exporter.cancel()
+        metrics.export(metrics_json, metrics_prom)
+        if journal is not None:
+            journal.close()
+        if adaptive is not None:
+            adaptive.close()
+        if syncer is not None:
+            syncer.cancel()
+        if work_queue is not None:
+            work_queue.complete(outcomes)
+            released = work_queue.release(owner)
+            if released:
+                logging.warning(f"Released {released} unfinished rows back to work queue {queue_db}.")
+            queue_counts = work_queue.counts()
+            work_queue.close()
+        if reader is not None:
+            reader.close()
+        if writer is not None:
+            writer.close()
+        if rejects is not None:
+            rejects.close()
+        if browser is not None and shared_browser is None:
+            await browser.close()
+            logging.info("Playwright browser closed successfully.")
+        snapshot = metrics.snapshot()
+        run_stats: Dict[str, Any] = {
+            "Throughput": f"{snapshot['rows_per_second']:.2f} rows/s",
+            "Row latency p50/p95/p99": "{p50:.2f}s / {p95:.2f}s / {p99:.2f}s".format(
+                **snapshot["phases"]["row"]
+            ),
+        }
+        if run is not None:
+            if soft_reset:
+                run_stats["Page loads/soft resets"] = f"{run.navigations}/{run.soft_resets}"
+            run_stats["Context recycles"] = run.recycles
+            memory_stats = run.memory_monitor.stats()
+            if memory_stats["samples"]:
+                run_stats["Renderer memory peak/mean"] = (
+                    f"{memory_stats['peak_mb']:.0f} MB / {memory_stats['mean_mb']:.0f} MB"
+                )
+            if replay_session is not None:
+                run_stats["HTTP replay"] = (
+                    "disabled (no replayable submit request)" if replay_session.disabled
+                    else f"{replay_session.replayed} rows replayed, "
+                         f"{replay_session.fallbacks} fell back to the browser"
+                )
+            run_stats["Retries"] = run.retries
+            run_stats["Failed rows by class"] = run.failure_counts or "none"
+        if breaker is not None:
+            run_stats["Circuit breaker trips"] = breaker.trips
+        if slots is not None:
+            run_stats["Shared pool"] = (
+                f"{slots.granted} browser rows, {slots.wait_seconds:.1f}s waiting for a slot"
+            )
+        if adaptive is not None:
+            adaptive_stats = adaptive.stats()
+            run_stats["Adaptive concurrency final/peak"] = (
+                f"{adaptive_stats['limit']}/{adaptive_stats['peak']} "
+                f"({adaptive_stats['increases']} increases, {adaptive_stats['decreases']} decreases)"
+            )
+        if resource_policy is not None:
+            network_stats = resource_policy.stats()
+            run_stats["Requests blocked"] = network_stats["blocked_requests"]
+            run_stats["Asset cache hits/misses"] = (
+                f"{network_stats['cache_hits']}/{network_stats['cache_misses']}"
+            )
+            run_stats["Bytes served from asset cache"] = network_stats["bytes_from_cache"]
+        if work_queue is not None:
+            run_stats["Work queue"] = (
+                f"{queue_counts['done']} done, {queue_counts['failed']} failed, "
+                f"{queue_counts['leased']} leased, {queue_counts['pending']} pending"
+            )
+        if validator is not None:
+            run_stats["Rejected rows"] = validator.rejected or "none"
+        if writer is not None:
+            run_stats["Results written"] = f"{writer.rows_written} rows to {results_path}"
+        if report:
+            _print_summary(
+                [results[idx] for idx in sorted(results)],
+                cache_stats=schema_cache.stats(),
+                run_stats=run_stats,
+                totals=totals,
+                title=f"SUMMARY: {job_name}" if job_name else "FINAL SUBMISSION SUMMARY",
+            )
+        snapshot["run_stats"] = run_stats
+    return snapshot
+
+
+def _shard_path(path: str, index: int) -> str:
+    """Return the per-shard variant of an output path, e.g. ``run.shard-2.jsonl``."""
+    root, extension = os.path.splitext(path)
+    return f"{root}.shard-{index}{extension}"
+
 
+def _run_shard(options: Dict[str, Any]) -> Dict[str, Any]:
+    """Process entry point of one shard of ``run_sharded_submission``."""
+    return asyncio.run(run_form_submission(**options))
 
-def _print_summary(results: List[Dict[str, Dict[str, str]]]) -> None:
-    """Print a summary of all form submissions with field status."""
+
+def _read_jsonl(path: str):
+    """Yield the records of a JSONL file."""
+    with open(path, "r", encoding="utf-8") as handle:
+        for line in handle:
+            yield json.loads(line)
+
+
+def _read_csv_records(path: str):
+    """Yield the rows of a CSV file as dicts."""
+    with open(path, "r", newline="", encoding="utf-8") as handle:
+        yield from csv.DictReader(handle)
+
+
+def _merge_run_stats(shard_stats: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sum the numeric and per-class statistics of every shard; other entries are per-shard only."""
+    merged: Dict[str, Any] = {}
+    for stats in shard_stats:
+        for name, value in stats.items():
+            if isinstance(value, bool) or not isinstance(value, (int, dict)):
+                continue
+            if isinstance(value, int):
+                merged[name] = merged.get(name, 0) + value
+            else:
+                counts = merged.setdefault(name, {})
+                for key, count in value.items():
+                    counts[key] = counts.get(key, 0) + count
+    return merged
+
+
+def run_sharded_submission(processes: int, **options: Any) -> Dict[str, Any]:
+    """
+    Run ``run_form_submission`` in ``processes`` worker processes, each with
+    its own event loop and browser, and merge their results.
+
+    Rows are sharded by the hash of the dedup key (by row index without one),
+    so duplicate detection still sees every copy of a person. Each shard
+    journals to and exports metrics to its own ``*.shard-<i>`` file, and
+    ``rate`` is split evenly between the shards. The
+    parent merges the shards' results (and rejects) in CSV row order into
+    ``results_path``/``rejects_path`` and prints one summary. Returns totals
+    and the per-shard snapshots.
+    """
     import logging
-    if not results:
+    if processes < 1:
+        raise ValueError(f"processes must be at least 1, got {processes}")
+    setup_logging(level=logging.getLevelName(options.get("log_level", "INFO").upper()))
+    form_fields = list(CSV_TO_FORM.values())
+    results_path = options.pop("results_path", None)
+    rejects_path = options.pop("rejects_path", None)
+    summary_rows = options.pop("summary_rows", 100)
+    workdir = tempfile.mkdtemp(prefix="form-bot-shards-")
+    shard_options = []
+    for index in range(processes):
+        shard = dict(options, shard=(index, processes), report=False, summary_rows=0)
+        if options.get("rate") is not None:
+            # The rate limit applies to the whole run, not to each shard.
+            shard["rate"] = options["rate"] / processes
+        shard["results_path"] = os.path.join(workdir, f"results-{index}.jsonl")
+        if rejects_path is not None:
+            shard["rejects_path"] = os.path.join(workdir, f"rejects-{index}.csv")
+        for name in ("journal_path", "metrics_json", "metrics_prom", "concurrency_log"):
+            if options.get(name):
+                shard[name] = _shard_path(options[name], index)
+        if options.get("profile_every"):
+            shard["profile_dir"] = os.path.join(options.get("profile_dir", "profiles"), f"shard-{index}")
+        shard_options.append(shard)
+
+    started = time.monotonic()
+    logging.info(f"Running {processes} shard processes.")
+    try:
+        # Spawn rather than fork: the parent may already run logging and Playwright threads.
+        with ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = [pool.submit(_run_shard, shard) for shard in shard_options]
+            errors = [future.exception() for future in futures]
+        for index, error in enumerate(errors):
+            if error is not None:
+                logging.critical(f"Shard {index} failed: {error}")
+        if any(errors):
+            raise next(error for error in errors if error is not None)
+        snapshots = [future.result() for future in futures]
+
+        totals = RunSummary(form_fields)
+        table: List[Dict[str, Dict[str, str]]] = []
+        writer = ResultsWriter(results_path, form_fields) if results_path is not None else None
+        try:
+            shard_results = [_read_jsonl(shard["results_path"]) for shard in shard_options]
+            for compact in heapq.merge(*shard_results, key=lambda record: int(record["row"])):
+                record = expand_record(compact, form_fields)
+                totals.add(record)
+                if len(table) < summary_rows:
+                    table.append(record)
+                if writer is not None:
+                    writer.write_compact(compact)
+        finally:
+            if writer is not None:
+                writer.close()
+        if rejects_path is not None:
+            # A shard that never validated (e.g. validate=False) has no rejects file.
+            shard_rejects = [
+                _read_csv_records(shard["rejects_path"]) for shard in shard_options
+                if os.path.exists(shard["rejects_path"])
+            ]
+            with open(rejects_path, "w", newline="", encoding="utf-8") as handle:
+                rejects_writer = None
+                for rejected in heapq.merge(*shard_rejects, key=lambda record: int(record["row"])):
+                    if rejects_writer is None:
+                        rejects_writer = csv.DictWriter(handle, fieldnames=list(rejected))
+                        rejects_writer.writeheader()
+                    rejects_writer.writerow(rejected)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    elapsed = time.monotonic() - started
+    rows_succeeded = sum(snapshot["rows_succeeded"] for snapshot in snapshots)
+    rows_failed = sum(snapshot["rows_failed"] for snapshot in snapshots)
+    run_stats: Dict[str, Any] = {
+        "Processes": processes,
+        "Throughput": f"{(rows_succeeded + rows_failed) / elapsed if elapsed > 0 else 0.0:.2f} rows/s",
+    }
+    run_stats.update(_merge_run_stats([snapshot["run_stats"] for snapshot in snapshots]))
+    for index, snapshot in enumerate(snapshots):
+        run_stats[f"Shard {index} throughput"] = snapshot["run_stats"]["Throughput"]
+    _print_summary(table, run_stats=run_stats, totals=totals)
+    return {
+        "elapsed_seconds": elapsed,
+        "rows_succeeded": rows_succeeded,
+        "rows_failed": rows_failed,
+        "rows_per_second": (rows_succeeded + rows_failed) / elapsed if elapsed > 0 else 0.0,
+        "shards": snapshots,
+    }
+
+
+# Output options that would collide between jobs unless each job gets its own file.
+_JOB_OUTPUT_OPTIONS = (
+    "results_path", "rejects_path", "journal_path", "metrics_json", "metrics_prom",
+    "concurrency_log", "queue_db",
+)
+
+# Options run_jobs sets itself; a manifest job may not override them.
+_JOB_RESERVED_OPTIONS = frozenset({
+    "csv_path", "form_url", "column_map", "shared_browser", "slots", "job_name", "shard", "report",
+    "headless", "launch_args", "browser_endpoint", "log_level", "log_json", "log_sample",
+})
+
+
+def _job_path(path: str, job: str) -> str:
+    """Return the per-job variant of an output path, e.g. ``results.acme.csv``."""
+    root, extension = os.path.splitext(path)
+    return f"{root}.{job}{extension}"
+
+
+async def run_jobs(
+    manifest_path: str,
+    pool_size: Optional[int] = None,
+    host_limit: Optional[int] = None,
+    headless: bool = False,
+    launch_args: Optional[List[str]] = None,
+    browser_endpoint: Optional[str] = None,
+    log_level: str = "INFO",
+    log_json: bool = False,
+    log_sample: Optional[Dict[str, float]] = None,
+    **options: Any,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run every job of a manifest (see ``load_manifest``) concurrently in one
+    event loop over one shared browser.
+
+    Browser rows of all jobs share ``pool_size`` slots (default: the manifest's
+    ``pool_size``, else ``concurrency``), granted round-robin between jobs and
+    capped per form host by the manifest's ``host_limits`` (default
+    ``host_limit``). Each job runs ``run_form_submission`` with ``options``
+    overridden by its manifest entry and at most as many workers as its host
+    may use, gets its own circuit breaker, and prints its own summary. Output
+    paths given in ``options`` get the job name appended. A failing job does
+    not stop the others. Returns each job's snapshot, or ``{"error": ...}``,
+    by job name.
+    """
+    import logging
+    setup_logging(
+        level=logging.getLevelName(log_level.upper()),
+        json_format=log_json,
+        sample_rates={
+            logging.getLevelName(name.upper()): rate for name, rate in (log_sample or {}).items()
+        },
+    )
+    manifest = load_manifest(manifest_path)
+    pool_size = pool_size or manifest["pool_size"] or options.get("concurrency", 1)
+    scheduler = FairScheduler(pool_size, manifest["host_limits"], host_limit)
+    accepted = set(inspect.signature(run_form_submission).parameters) - _JOB_RESERVED_OPTIONS
+    form_to_csv = {form_key: csv_field for csv_field, form_key in CSV_TO_FORM.items()}
+
+    # Check every job before the browser starts.
+    jobs = []
+    for job in manifest["jobs"]:
+        unknown = sorted(set(job["options"]) - accepted)
+        if unknown:
+            raise ValueError(f"Job {job['name']}: unsupported options {unknown}")
+        unknown_fields = sorted(set(job["fields"]) - set(form_to_csv))
+        if unknown_fields:
+            raise ValueError(f"Job {job['name']}: unknown form fields {unknown_fields}")
+        job_options = dict(options)
+        for name in _JOB_OUTPUT_OPTIONS:
+            if job_options.get(name) and name not in job["options"]:
+                job_options[name] = _job_path(job_options[name], job["name"])
+        if job_options.get("profile_every") and "profile_dir" not in job["options"]:
+            job_options["profile_dir"] = os.path.join(options.get("profile_dir", "profiles"), job["name"])
+        job_options.update(job["options"])
+        if job_options.get("breaker") is not None:
+            job_options["breaker"] = copy.deepcopy(job_options["breaker"])
+        host = urlsplit(job["url"]).hostname or ""
+        cap = scheduler.host_limit(host)
+        job_options["concurrency"] = min(job["options"].get("concurrency", cap), cap)
+        column_map = {csv_column: form_to_csv[form_key] for form_key, csv_column in job["fields"].items()}
+        jobs.append((job["name"], job["csv_path"], job["url"], host, column_map, job_options))
+
+    logging.info(f"Running {len(jobs)} jobs over one browser with {pool_size} shared slots.")
+    async with async_playwright() as p:
+        browser = await launch_browser(p, headless=headless, args=launch_args, endpoint=browser_endpoint)
+        try:
+            outcomes = await asyncio.gather(
+                *(
+                    run_form_submission(
+                        csv_path, url,
+                        column_map=column_map,
+                        shared_browser=(p, browser),
+                        slots=scheduler.slots(name, host),
+                        job_name=name,
+                        **job_options,
+                    )
+                    for name, csv_path, url, host, column_map, job_options in jobs
+                ),
+                return_exceptions=True,
+            )
+        finally:
+            await browser.close()
+
+    snapshots: Dict[str, Dict[str, Any]] = {}
+    for (name, *_), outcome in zip(jobs, outcomes):
+        if isinstance(outcome, BaseException):
+            logging.critical(f"Job {name} failed: {outcome}")
+            snapshots[name] = {"error": str(outcome)}
+        else:
+            snapshots[name] = outcome
+    failed = sum(1 for snapshot in snapshots.values() if "error" in snapshot)
+    logging.info(f"Finished {len(jobs)} jobs, {failed} failed.")
+    return snapshots
+
+
+def _print_summary(
+    results: List[Dict[str, Dict[str, str]]],
+    cache_stats: Optional[Dict[str, int]] = None,
+    run_stats: Optional[Dict[str, Any]] = None,
+    totals: Optional[RunSummary] = None,
+    title: str = "FINAL SUBMISSION SUMMARY",
+) -> None:
+    """
+    Print a summary of all form submissions with field status under ``title``.
+
+    ``results`` may hold only the first rows of the run; ``totals`` then
+    covers every row. ``run_stats`` entries are printed as ``name: value``
+    lines after the table.
+    """
+    import logging
+    if not results and (totals is None or not totals.rows):
         logging.warning("No submission records found to summarize.")
         return
 
     logging.info("\n" + "=" * 80)
-    logging.info(f"{'FINAL SUBMISSION SUMMARY':^80}")
+    logging.info(f"{title:^80}")
     logging.info("=" * 80)
 
     all_fields = set()
@@ -178,6 +1331,21 @@ def _print_summary(results: List[Dict[str, Dict[str, str]]]) -> None:
                 cell = "n/a"
             row.append(f"{cell:^18}")
         logging.info(" | ".join(row))
+    if totals is not None:
+        if totals.rows > len(results):
+            logging.info(f"(table shows the first {len(results)} of {totals.rows} rows)")
+        logging.info("-" * len(header))
+        for line in totals.lines():
+            logging.info(line)
+    if cache_stats is not None:
+        logging.info("-" * len(header))
+        logging.info(
+            f"Form schema cache: {cache_stats['hits']} hits, "
+            f"{cache_stats['misses']} misses, "
+            f"{cache_stats['invalidations']} invalidations"
+        )
+    for name, value in (run_stats or {}).items():
+        logging.info(f"{name}: {value}")
     logging.info("=" * 80 + "\n")
 
 
@@ -195,5 +1363,416 @@ if __name__ == "__main__":
         default="https://doerz-automation-task.lovable.app/automation_challenge.html",
         help="URL of the form page."
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of isolated browser contexts submitting rows in parallel."
+    )
+    parser.add_argument(
+        "--min-concurrency",
+        type=int,
+        default=None,
+        help="Adapt the rows in flight between this and --concurrency (AIMD) from latency and errors."
+    )
+    parser.add_argument(
+        "--latency-target",
+        type=float,
+        default=None,
+        help="With --min-concurrency, p90 row latency in seconds above which concurrency is cut."
+    )
+    parser.add_argument(
+        "--concurrency-log",
+        type=str,
+        default=None,
+        help="Append every adaptive concurrency change to this JSONL file."
+    )
+    parser.add_argument(
+        "--fast-fill",
+        action="store_true",
+        help="Set all fields of a row in one in-page script, falling back to per-field fills."
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        help="Maximum rows started per second across all workers (default: unlimited)."
+    )
+    parser.add_argument(
+        "--burst",
+        type=int,
+        default=1,
+        help="Number of rows that may start back-to-back before --rate pacing applies."
+    )
+    parser.add_argument(
+        "--journal",
+        type=str,
+        default=None,
+        help="Append each finished row to this JSONL submission journal."
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip rows already committed in --journal; rows whose submit failed are submitted again."
+    )
+    parser.add_argument(
+        "--resume-skip-failed",
+        action="store_true",
+        help="With --resume, also skip rows whose submit failed."
+    )
+    parser.add_argument(
+        "--journal-fsync-interval",
+        type=float,
+        default=1.0,
+        help="Seconds between batched journal writes/fsyncs."
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=3,
+        help="Attempts per row for retryable failures (timeout, navigation, dialog)."
+    )
+    parser.add_argument(
+        "--retry-base-delay",
+        type=float,
+        default=1.0,
+        help="Base delay in seconds of the exponential retry backoff."
+    )
+    parser.add_argument(
+        "--breaker-threshold",
+        type=float,
+        default=0.5,
+        help="Error rate over the breaker window that pauses intake."
+    )
+    parser.add_argument(
+        "--breaker-window",
+        type=float,
+        default=60.0,
+        help="Sliding window in seconds for the circuit breaker error rate."
+    )
+    parser.add_argument(
+        "--breaker-cooldown",
+        type=float,
+        default=30.0,
+        help="Seconds intake stays paused once the circuit breaker opens."
+    )
+    parser.add_argument(
+        "--block-resources",
+        type=str,
+        default=None,
+        help=(
+            "Comma-separated resource types to block, e.g. image,font,media "
+            f"(use 'default' for {','.join(DEFAULT_BLOCKED_TYPES)})."
+        )
+    )
+    parser.add_argument(
+        "--block-url",
+        action="append",
+        default=[],
+        help="Glob of request URLs to block, e.g. '*google-analytics.com*'. Repeatable."
+    )
+    parser.add_argument(
+        "--asset-cache-dir",
+        type=str,
+        default=None,
+        help="Serve static assets from this directory after their first load."
+    )
+    parser.add_argument(
+        "--soft-reset",
+        action="store_true",
+        help="Clear the form in place after a successful submit instead of reloading it."
+    )
+    parser.add_argument(
+        "--recycle-after",
+        type=int,
+        default=None,
+        help="Recycle each worker's browser context after this many submissions."
+    )
+    parser.add_argument(
+        "--memory-ceiling-mb",
+        type=float,
+        default=None,
+        help="Recycle a worker's context when total renderer RSS exceeds this many MB."
+    )
+    parser.add_argument(
+        "--memory-sample-interval",
+        type=float,
+        default=5.0,
+        help="Minimum seconds between renderer memory samples."
+    )
+    parser.add_argument(
+        "--metrics-json",
+        type=str,
+        default=None,
+        help="Write per-phase latency percentiles and throughput to this JSON file."
+    )
+    parser.add_argument(
+        "--metrics-prom",
+        type=str,
+        default=None,
+        help="Write the same metrics in Prometheus text format to this file."
+    )
+    parser.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=30.0,
+        help="Seconds between periodic metrics exports (0 disables; always written at the end)."
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Capture Playwright traces for a sample of rows."
+    )
+    parser.add_argument(
+        "--profile-every",
+        type=int,
+        default=100,
+        help="With --profile, trace every Nth row."
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=str,
+        default="profiles",
+        help="Directory for --profile trace archives."
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Run Chromium without a visible window."
+    )
+    parser.add_argument(
+        "--replay",
+        action="store_true",
+        help="Learn the submit request in the browser, then replay later rows over HTTP."
+    )
+    parser.add_argument(
+        "--replay-concurrency",
+        type=int,
+        default=32,
+        help="Maximum replayed submit requests in flight."
+    )
+    parser.add_argument(
+        "--replay-verify-every",
+        type=int,
+        default=50,
+        help="With --replay, still send every Nth row through the browser (0 disables)."
+    )
+    parser.add_argument(
+        "--max-pending-rows",
+        type=int,
+        default=1000,
+        help="Pause reading the CSV while this many rows are queued or in flight."
+    )
+    parser.add_argument(
+        "--results",
+        type=str,
+        default=None,
+        help="Append per-row results to this .csv, .jsonl or .parquet file as rows finish."
+    )
+    parser.add_argument(
+        "--summary-rows",
+        type=int,
+        default=100,
+        help="Show at most this many rows in the final summary table."
+    )
+    parser.add_argument(
+        "--no-validate",
+        action="store_true",
+        help="Skip the pre-flight checks and send every row to the browser."
+    )
+    parser.add_argument(
+        "--required-fields",
+        type=str,
+        default="",
+        help="Comma-separated CSV columns that must be non-blank (default: none)."
+    )
+    parser.add_argument(
+        "--dedup-key",
+        type=str,
+        default="Email",
+        help="Comma-separated CSV columns identifying a person; repeats are rejected (empty disables)."
+    )
+    parser.add_argument(
+        "--rejects",
+        type=str,
+        default=None,
+        help="Write rows rejected by the pre-flight checks to this CSV file."
+    )
+    parser.add_argument(
+        "--log-level",
+        type=str,
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Minimum level of log records to write."
+    )
+    parser.add_argument(
+        "--log-json",
+        action="store_true",
+        help="Write logs as JSON lines with row, phase and worker fields."
+    )
+    parser.add_argument(
+        "--log-sample",
+        type=str,
+        action="append",
+        default=[],
+        metavar="LEVEL=RATE",
+        help="Keep only this fraction of records of LEVEL, e.g. DEBUG=0.01 (repeatable)."
+    )
+    parser.add_argument(
+        "--browser-arg",
+        type=str,
+        action="append",
+        default=[],
+        help="Extra Chromium command-line flag (repeatable)."
+    )
+    parser.add_argument(
+        "--browser-endpoint",
+        type=str,
+        default=None,
+        help="Connect to a warm browser started with --serve-browser, e.g. http://127.0.0.1:9222."
+    )
+    parser.add_argument(
+        "--serve-browser",
+        action="store_true",
+        help="Keep a warm Chromium running for later runs instead of submitting anything."
+    )
+    parser.add_argument(
+        "--browser-port",
+        type=int,
+        default=9222,
+        help="Local CDP port used by --serve-browser."
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Shard the rows over this many processes, each with its own browser and --concurrency workers."
+    )
+    parser.add_argument(
+        "--queue-db",
+        type=str,
+        default=None,
+        help="Take rows from this SQLite work queue, shared with other workers and hosts."
+    )
+    parser.add_argument(
+        "--queue-load",
+        action="store_true",
+        help="With --queue-db, first load the validated CSV into the queue (safe to repeat)."
+    )
+    parser.add_argument(
+        "--lease-seconds",
+        type=float,
+        default=300.0,
+        help="How long claimed rows stay leased before other workers may reclaim them."
+    )
+    parser.add_argument(
+        "--claim-batch",
+        type=int,
+        default=50,
+        help="Rows claimed from the work queue at a time."
+    )
+    parser.add_argument(
+        "--jobs",
+        type=str,
+        default=None,
+        help="Run every job of this JSON/YAML manifest over one shared browser instead of --csv_path/--url."
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=None,
+        help="With --jobs, rows in flight across all jobs (default: the manifest's pool_size, else --concurrency)."
+    )
+    parser.add_argument(
+        "--host-limit",
+        type=int,
+        default=None,
+        help="With --jobs, rows in flight per form host unless the manifest's host_limits says otherwise."
+    )
     args = parser.parse_args()
-    asyncio.run(run_form_submission(csv_path=args.csv_path, form_url=args.url))
+    log_sample: Dict[str, float] = {}
+    for spec in args.log_sample:
+        level_name, _, rate = spec.partition("=")
+        try:
+            log_sample[level_name] = float(rate)
+        except ValueError:
+            parser.error(f"--log-sample expects LEVEL=RATE, got {spec!r}")
+    if args.resume and args.journal is None:
+        parser.error("--resume requires --journal")
+    if args.resume_skip_failed and not args.resume:
+        parser.error("--resume-skip-failed requires --resume")
+    if args.serve_browser:
+        setup_logging()
+        try:
+            asyncio.run(serve_browser(port=args.browser_port, headless=args.headless, args=args.browser_arg))
+        except KeyboardInterrupt:
+            pass
+        raise SystemExit(0)
+    blocked_types: List[str] = []
+    if args.block_resources == "default":
+        blocked_types = list(DEFAULT_BLOCKED_TYPES)
+    elif args.block_resources:
+        blocked_types = [t.strip() for t in args.block_resources.split(",") if t.strip()]
+    resource_policy = None
+    if blocked_types or args.block_url or args.asset_cache_dir:
+        resource_policy = ResourcePolicy(blocked_types, args.block_url, args.asset_cache_dir)
+    options: Dict[str, Any] = dict(
+        csv_path=args.csv_path,
+        form_url=args.url,
+        concurrency=args.concurrency,
+        fast_fill=args.fast_fill,
+        rate=args.rate,
+        burst=args.burst,
+        journal_path=args.journal,
+        resume=args.resume,
+        resume_skip_failed=args.resume_skip_failed,
+        journal_fsync_interval=args.journal_fsync_interval,
+        retry_policy=RetryPolicy(
+            max_attempts=args.max_attempts, base_delay=args.retry_base_delay
+        ),
+        breaker=CircuitBreaker(
+            threshold=args.breaker_threshold,
+            window=args.breaker_window,
+            cooldown=args.breaker_cooldown,
+        ),
+        resource_policy=resource_policy,
+        soft_reset=args.soft_reset,
+        recycle_after=args.recycle_after,
+        memory_ceiling_mb=args.memory_ceiling_mb,
+        memory_sample_interval=args.memory_sample_interval,
+        metrics_json=args.metrics_json,
+        metrics_prom=args.metrics_prom,
+        metrics_interval=args.metrics_interval,
+        profile_every=args.profile_every if args.profile else None,
+        profile_dir=args.profile_dir,
+        headless=args.headless,
+        browser_endpoint=args.browser_endpoint,
+        launch_args=args.browser_arg,
+        replay=args.replay,
+        replay_concurrency=args.replay_concurrency,
+        replay_verify_every=args.replay_verify_every or None,
+        max_pending_rows=args.max_pending_rows,
+        results_path=args.results,
+        summary_rows=args.summary_rows,
+        validate=not args.no_validate,
+        required_fields=[f for f in args.required_fields.split(",") if f],
+        dedup_key=[f for f in args.dedup_key.split(",") if f],
+        rejects_path=args.rejects,
+        log_level=args.log_level,
+        log_json=args.log_json,
+        log_sample=log_sample,
+        queue_db=args.queue_db,
+        queue_load=args.queue_load,
+        lease_seconds=args.lease_seconds,
+        claim_batch=args.claim_batch,
+        min_concurrency=args.min_concurrency,
+        latency_target=args.latency_target,
+        concurrency_log=args.concurrency_log,
+    )
+    if args.jobs:
+        del options["csv_path"], options["form_url"]
+        asyncio.run(run_jobs(args.jobs, pool_size=args.pool_size, host_limit=args.host_limit, **options))
+    elif args.processes > 1:
+        run_sharded_submission(args.processes, **options)
+    else:
+        asyncio.run(run_form_submission(**options))
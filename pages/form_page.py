@@ -1,49 +1,242 @@
+import asyncio
 import logging
+from typing import Dict, Optional, Tuple
+
 from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
 
-logging.basicConfig(level=logging.INFO)
+from pages.schema_cache import FormSchemaCache
+
+
+# Resolves every label/placeholder of the field map in a single round-trip.
+# Label matching mirrors ``get_by_label``: case-insensitive, whitespace-normalized
+# substring match on <label> text and aria-label, falling back to an exact
+# placeholder match. Only visible controls count as present. Each present field
+# maps to a stable CSS selector for its control, or null if none can be built.
+_DETECT_FIELDS_JS = """
+(fieldMap) => {
+    const norm = (text) => (text || "").replace(/\\s+/g, " ").trim().toLowerCase();
+    const visible = (el) => {
+        if (!el) return false;
+        const style = window.getComputedStyle(el);
+        if (style.visibility === "hidden" || style.display === "none") return false;
+        return el.getClientRects().length > 0;
+    };
+    const selectorFor = (el) => {
+        const tag = el.tagName.toLowerCase();
+        if (el.id) return "#" + CSS.escape(el.id);
+        if (el.name) return `${tag}[name="${CSS.escape(el.name)}"]`;
+        const placeholder = el.getAttribute("placeholder");
+        if (placeholder) return `${tag}[placeholder="${CSS.escape(placeholder)}"]`;
+        return null;
+    };
+    const labels = Array.from(document.querySelectorAll("label")).map(
+        (label) => [norm(label.textContent), label.control]
+    );
+    const ariaControls = Array.from(document.querySelectorAll("[aria-label]")).map(
+        (el) => [norm(el.getAttribute("aria-label")), el]
+    );
+    const placeholders = Array.from(document.querySelectorAll("input[placeholder]"));
+    const present = {};
+    for (const [label, canonical] of Object.entries(fieldMap)) {
+        const wanted = norm(label);
+        const match = labels.concat(ariaControls).find(
+            ([text, control]) => text.includes(wanted) && visible(control)
+        );
+        const control = match ? match[1] : placeholders.find(
+            (el) => el.getAttribute("placeholder") === label && visible(el)
+        );
+        if (control) present[canonical] = selectorFor(control);
+    }
+    return present;
+}
+"""
+
+# Serializes the input/label skeleton of the page; hashed into the schema
+# cache fingerprint, so it must only include structural attributes. Ids count
+# only on controls, whose cached selectors use them: forms, labels and buttons
+# often get a fresh generated id on every render.
+_STRUCTURE_SKELETON_JS = """
+() => Array.from(document.querySelectorAll("form, label, input, select, textarea, button")).map(
+    (el) => [
+        el.tagName,
+        el.getAttribute("type") || "",
+        ["INPUT", "SELECT", "TEXTAREA"].includes(el.tagName) ? el.id || "" : "",
+        el.getAttribute("name") || "",
+        el.getAttribute("placeholder") || "",
+        el.tagName === "LABEL" || el.tagName === "BUTTON" ? (el.textContent || "").trim() : "",
+    ].join(":")
+).join("|")
+"""
+
+# Fingerprints the page skeleton (a 64-bit cyrb53 hash, as crypto.subtle is
+# missing on plain-http pages) and runs field detection only if the fingerprint
+# differs from ``known``, the one the cached schema was detected against. Both
+# happen in one round-trip, so a cache hit costs no more than detection.
+_DETECT_CACHED_FIELDS_JS = (
+    """
+([fieldMap, known]) => {
+    const detect = """ + _DETECT_FIELDS_JS.strip() + """;
+    const skeleton = (""" + _STRUCTURE_SKELETON_JS.strip() + """)();
+    let h1 = 0xdeadbeef, h2 = 0x41c6ce57;
+    for (let i = 0; i < skeleton.length; i++) {
+        const code = skeleton.charCodeAt(i);
+        h1 = Math.imul(h1 ^ code, 2654435761);
+        h2 = Math.imul(h2 ^ code, 1597334677);
+    }
+    h1 = Math.imul(h1 ^ (h1 >>> 16), 2246822507) ^ Math.imul(h2 ^ (h2 >>> 13), 3266489909);
+    h2 = Math.imul(h2 ^ (h2 >>> 16), 2246822507) ^ Math.imul(h1 ^ (h1 >>> 13), 3266489909);
+    const fingerprint = (h2 >>> 0).toString(16).padStart(8, "0") + (h1 >>> 0).toString(16).padStart(8, "0");
+    return {fingerprint, fields: fingerprint === known ? null : detect(fieldMap)};
+}
+"""
+)
+
+# Sets every value through the native value setter (so framework-managed inputs
+# notice the change) and dispatches input/change events. Returns the canonical
+# names it could not set, which are then filled through Playwright instead.
+_FILL_ALL_JS = """
+(entries) => {
+    const unset = [];
+    for (const [canonical, selector, value] of entries) {
+        const el = selector ? document.querySelector(selector) : null;
+        if (!el || el.disabled || el.readOnly || !("value" in el)) {
+            unset.push(canonical);
+            continue;
+        }
+        const descriptor = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), "value");
+        if (descriptor && descriptor.set) {
+            descriptor.set.call(el, value);
+        } else {
+            el.value = value;
+        }
+        el.dispatchEvent(new Event("input", { bubbles: true }));
+        el.dispatchEvent(new Event("change", { bubbles: true }));
+        if (el.value !== value) unset.push(canonical);
+    }
+    return unset;
+}
+"""
+
+# Resets every form in place, clears the known inputs and verifies the page is
+# back in a clean state: the submit button is present and every input is empty.
+_SOFT_RESET_JS = """
+([selectors, submitName]) => {
+    document.querySelectorAll("form").forEach((form) => form.reset());
+    const controls = selectors.map((selector) => document.querySelector(selector));
+    if (controls.some((el) => !el)) return false;
+    for (const el of controls) {
+        if (el.value === "") continue;
+        const descriptor = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), "value");
+        if (descriptor && descriptor.set) {
+            descriptor.set.call(el, "");
+        } else {
+            el.value = "";
+        }
+        el.dispatchEvent(new Event("input", { bubbles: true }));
+    }
+    const hasSubmit = Array.from(document.querySelectorAll("button, input[type=submit]")).some(
+        (el) => (el.textContent || el.value || "").trim() === submitName
+    );
+    return hasSubmit && controls.every((el) => el.value === "");
+}
+"""
+
 
 class FormPage:
     """Web form page object for automation using Playwright."""
 
-    def __init__(self, page: Page, url: str, timeout: int = 15000) -> None:
+    # Map form field labels/placeholders to canonical field names
+    FIELD_MAP = {
+        "First Name": "First Name",
+        "Last Name": "Last Name",
+        "Email": "Email",
+        "Desired Role": "Desired Role"
+    }
+
+    SUBMIT_BUTTON_NAME = "Submit Data"
+
+    def __init__(
+        self,
+        page: Page,
+        url: str,
+        timeout: int = 15000,
+        schema_cache: Optional[FormSchemaCache] = None,
+    ) -> None:
         """Initialize FormPage."""
         self.page: Page = page
         self.URL: str = url
         self.timeout: int = timeout
+        self.schema_cache: Optional[FormSchemaCache] = schema_cache
+        # Canonical field name -> CSS selector resolved by the last detection.
+        self.field_selectors: Dict[str, Optional[str]] = {}
+        # Resolved by the dialog handler with (message, arrival time) after a submit.
+        self._dialog_waiter: Optional[asyncio.Future] = None
+        # True after a successful submit, until the next soft reset attempt.
+        self._reusable: bool = False
+        self.navigations: int = 0
+        self.soft_resets: int = 0
+        self.page.on("dialog", self._handle_dialog)
+
     async def get_present_fields(self) -> set:
         """
         Detect which fields are present on the form at runtime.
         Returns a set of field names as used in the automation logic.
+
+        Waits once for the form to render, then resolves every label and
+        placeholder of ``FIELD_MAP`` in a single in-page pass. With a schema
+        cache, the same pass fingerprints the page structure and skips
+        detection while it is unchanged.
         """
-        present_fields = set()
-        # Map form field labels/placeholders to canonical field names
-        field_map = {
-            "First Name": "First Name",
-            "Last Name": "Last Name",
-            "Email": "Email",
-            "Desired Role": "Desired Role"
-        }
-        for label, canonical in field_map.items():
-            locator = self.page.get_by_label(label)
-            try:
-                await locator.wait_for(state="visible", timeout=2000)
-                present_fields.add(canonical)
-                continue
-            except Exception:
-                pass
-            locator = self.page.locator(f'input[placeholder="{label}"]')
-            try:
-                await locator.wait_for(state="visible", timeout=2000)
-                present_fields.add(canonical)
-            except Exception:
-                pass
-        return present_fields
+        try:
+            await self.page.wait_for_selector("input", state="visible", timeout=2000)
+        except PlaywrightTimeoutError:
+            logging.debug("[DEBUG] No visible input rendered before field detection.")
+
+        if self.schema_cache is None:
+            self.field_selectors = await self.page.evaluate(_DETECT_FIELDS_JS, self.FIELD_MAP)
+            return set(self.field_selectors)
+
+        known = self.schema_cache.known_fingerprint(self.URL)
+        detected = await self.page.evaluate(_DETECT_CACHED_FIELDS_JS, [self.FIELD_MAP, known])
+        cached = self.schema_cache.get(self.URL, detected["fingerprint"])
+        if cached is not None:
+            self.field_selectors = dict(cached)
+            return set(cached)
+
+        logging.debug("[DEBUG] Schema cache miss for %s, detecting fields.", self.URL)
+        if detected["fields"] is None:
+            # Another worker replaced the entry while the page was being fingerprinted.
+            detected = await self.page.evaluate(_DETECT_CACHED_FIELDS_JS, [self.FIELD_MAP, None])
+        self.field_selectors = detected["fields"]
+        self.schema_cache.put(self.URL, detected["fingerprint"], self.field_selectors)
+        return set(self.field_selectors)
 
     async def open(self) -> None:
         """Open the form page."""
+        self.navigations += 1
         await self.page.goto(self.URL, timeout=self.timeout)
 
+    async def soft_reset(self) -> bool:
+        """
+        Clear the form in place after a successful submit instead of navigating.
+
+        Returns True if the page was verified clean and can be reused, False if
+        the caller must ``open`` the page again (no successful submit since the
+        last reset, no resolved selectors, or verification failed).
+        """
+        if not self._reusable:
+            return False
+        self._reusable = False
+        selectors = [selector for selector in self.field_selectors.values() if selector]
+        if not selectors:
+            return False
+        clean = await self.page.evaluate(_SOFT_RESET_JS, [selectors, self.SUBMIT_BUTTON_NAME])
+        if clean:
+            self.soft_resets += 1
+        else:
+            logging.debug("[DEBUG] Soft reset verification failed, falling back to navigation.")
+        return bool(clean)
+
     async def _fill_field_by_label_or_placeholder(self, label: str, value: str) -> None:
         """
         Fill an input field by its label (preferred) or placeholder (fallback).
@@ -57,6 +250,32 @@ class FormPage:
         await locator.scroll_into_view_if_needed(timeout=self.timeout)
         await locator.fill(value)
 
+    async def fill_all(self, mapping: Dict[str, str]) -> Dict[str, Optional[str]]:
+        """
+        Fill several fields at once, keyed by canonical field name.
+
+        Uses the selectors resolved by ``get_present_fields`` to set every value
+        in one in-page script; fields the script could not set fall back to
+        ``_fill_field_by_label_or_placeholder``. Returns the error message per
+        field, or None for fields that were filled.
+        """
+        entries = [
+            [canonical, self.field_selectors.get(canonical), value]
+            for canonical, value in mapping.items()
+        ]
+        unset = await self.page.evaluate(_FILL_ALL_JS, entries)
+        outcome: Dict[str, Optional[str]] = {canonical: None for canonical in mapping}
+        labels = {canonical: label for label, canonical in self.FIELD_MAP.items()}
+        for canonical in unset:
+            logging.debug("[DEBUG] Fast fill could not set %s, falling back to Playwright fill.", canonical)
+            try:
+                await self._fill_field_by_label_or_placeholder(
+                    labels.get(canonical, canonical), mapping[canonical]
+                )
+            except Exception as exc:
+                outcome[canonical] = str(exc)
+        return outcome
+
     async def fill_first_name(self, first_name: str) -> None:
         """Fill first name field using label or placeholder."""
         await self._fill_field_by_label_or_placeholder("First Name", first_name)
@@ -73,23 +292,46 @@ class FormPage:
         """Fill desired role field."""
         await self._fill_field_by_label_or_placeholder("Desired Role", desired_role)
 
-    async def submit_and_handle_alert(self) -> str:
+    def _handle_dialog(self, dialog) -> None:
+        """Accept any dialog and resolve the pending submit waiter with its message."""
+        logging.debug("[DEBUG] Dialog handler triggered. Accepting dialog with message: %s", dialog.message)
+        arrived = asyncio.get_running_loop().time()
+        asyncio.create_task(self._accept_dialog(dialog, arrived))
+
+    async def _accept_dialog(self, dialog, arrived: float) -> None:
+        """Accept ``dialog`` and hand its message and arrival time to the waiter."""
+        waiter = self._dialog_waiter
+        try:
+            await dialog.accept()
+        except Exception as exc:
+            if waiter is not None and not waiter.done():
+                waiter.set_exception(exc)
+            return
+        if waiter is not None and not waiter.done():
+            waiter.set_result((dialog.message, arrived))
+
+    async def submit_and_handle_alert(self) -> Tuple[str, float]:
         """
         Click the Submit button, then wait for and handle the browser's success alert/dialog.
-        Returns the alert message.
+        Returns the alert message and the click-to-dialog latency in seconds.
 
-        After clicking, also sends a space bar keypress.
+        Raises ``asyncio.TimeoutError`` if no dialog appears within ``timeout``.
         """
-        button = self.page.get_by_role("button", name="Submit Data")
+        loop = asyncio.get_running_loop()
+        self._reusable = False
+        button = self.page.get_by_role("button", name=self.SUBMIT_BUTTON_NAME)
         logging.debug("[DEBUG] Resolved submit button locator: %s", button)
         await button.wait_for(state="visible", timeout=self.timeout)
         logging.debug("[DEBUG] Submit button is visible and ready.")
         await button.scroll_into_view_if_needed(timeout=self.timeout)
         logging.debug("[DEBUG] Submit button scrolled into view.")
-        # Only click and wait for the alert to be handled by the global handler in main.py
-        logging.debug("[DEBUG] Attaching dialog handler and clicking submit button...")
-        await button.click(timeout=self.timeout)
-        logging.debug("[DEBUG] Clicked submit button, sending space bar keypress...")
-        await self.page.keyboard.press("Space")
-        # No need to handle dialog here, global handler will accept it
-        return "Alert handled by global dialog handler."
+        self._dialog_waiter = loop.create_future()
+        try:
+            clicked = loop.time()
+            await button.click(timeout=self.timeout)
+            logging.debug("[DEBUG] Clicked submit button, waiting for dialog...")
+            message, arrived = await asyncio.wait_for(self._dialog_waiter, timeout=self.timeout / 1000)
+        finally:
+            self._dialog_waiter = None
+        self._reusable = True
+        return message, max(arrived - clicked, 0.0)
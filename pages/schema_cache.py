@@ -0,0 +1,43 @@
+from typing import Dict, Optional, Tuple
+
+
+class FormSchemaCache:
+    """
+    Cache of detected form schemas keyed by URL.
+
+    Each entry remembers the DOM structure fingerprint it was detected against;
+    a lookup with a different fingerprint invalidates the entry so detection
+    runs again.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._entries: Dict[str, Tuple[str, Dict[str, Optional[str]]]] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+        self.invalidations: int = 0
+
+    def known_fingerprint(self, url: str) -> Optional[str]:
+        """Return the fingerprint the cached schema of ``url`` was detected against, if any."""
+        entry = self._entries.get(url)
+        return entry[0] if entry is not None else None
+
+    def get(self, url: str, fingerprint: str) -> Optional[Dict[str, Optional[str]]]:
+        """Return cached field selectors for ``url`` if the fingerprint still matches."""
+        entry = self._entries.get(url)
+        if entry is not None and entry[0] == fingerprint:
+            self.hits += 1
+            return entry[1]
+        if entry is not None:
+            del self._entries[url]
+            self.invalidations += 1
+        self.misses += 1
+        return None
+
+    def put(self, url: str, fingerprint: str, selectors: Dict[str, Optional[str]]) -> None:
+        """Store the field selectors detected for ``url`` under ``fingerprint``."""
+        self._entries[url] = (fingerprint, dict(selectors))
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/invalidation counters."""
+        return {"hits": self.hits, "misses": self.misses, "invalidations": self.invalidations}
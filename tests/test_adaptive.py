@@ -0,0 +1,81 @@
+import sys
+import os
+import json
+import asyncio
+import random
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.adaptive import AdaptiveConcurrency
+
+async def _finish_window(controller, success=True, latency=1.0):
+    for _ in range(controller.window):
+        await controller.acquire()
+        controller.release(success, latency)
+
+def test_adaptive_rejects_invalid_bounds():
+    with pytest.raises(ValueError):
+        AdaptiveConcurrency(0, 4)
+    with pytest.raises(ValueError):
+        AdaptiveConcurrency(5, 4)
+    with pytest.raises(ValueError):
+        AdaptiveConcurrency(1, 4, decrease=1.0)
+
+@pytest.mark.asyncio
+async def test_adaptive_increases_additively_up_to_max():
+    controller = AdaptiveConcurrency(1, 3, window=5)
+    for expected in (2, 3, 3):
+        await _finish_window(controller)
+        assert controller.limit == expected
+    assert controller.stats() == {"limit": 3, "peak": 3, "increases": 2, "decreases": 0}
+
+@pytest.mark.asyncio
+async def test_adaptive_decreases_multiplicatively_on_errors_and_spikes(tmp_path):
+    log_path = tmp_path / "concurrency.jsonl"
+    controller = AdaptiveConcurrency(2, 16, initial=16, window=4, log_path=str(log_path))
+    await _finish_window(controller, success=False)
+    assert controller.limit == 8
+    # The first healthy window sets the latency baseline (and grows the limit).
+    await _finish_window(controller, latency=1.0)
+    assert controller.limit == 9
+    await _finish_window(controller, latency=5.0)
+    assert controller.limit == 4
+    await _finish_window(controller, success=False)
+    await _finish_window(controller, success=False)
+    assert controller.limit == 2
+    controller.close()
+
+    entries = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert [(e["previous"], e["limit"], e["reason"]) for e in entries] == [
+        (16, 8, "errors"), (8, 9, "healthy"), (9, 4, "latency spike"), (4, 2, "errors"),
+    ]
+
+@pytest.mark.asyncio
+async def test_adaptive_latency_target_caps_p90():
+    controller = AdaptiveConcurrency(1, 8, initial=4, window=2, latency_target=2.0)
+    await _finish_window(controller, latency=3.0)
+    assert controller.limit == 2
+
+@pytest.mark.asyncio
+async def test_adaptive_acquire_waits_for_a_free_slot():
+    controller = AdaptiveConcurrency(1, 4, window=100)
+    await controller.acquire()
+    waiter = asyncio.create_task(controller.acquire())
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+    controller.release(True, 0.1)
+    await asyncio.wait_for(waiter, 1)
+    assert controller.in_flight == 1
+
+@pytest.mark.asyncio
+async def test_adaptive_tolerates_stationary_jitter():
+    # Lognormal latencies with sigma 0.5: the p90 of a window is routinely
+    # more than twice the median, but nothing about the site changes.
+    rng = random.Random(7)
+    controller = AdaptiveConcurrency(1, 16, initial=4, window=10)
+    for _ in range(200):
+        await controller.acquire()
+        controller.release(True, rng.lognormvariate(0.0, 0.5))
+    assert controller.decreases == 0
+    assert controller.limit == 16
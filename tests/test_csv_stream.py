@@ -0,0 +1,39 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.csv_stream import CsvRowReader
+
+def test_reader_streams_string_rows_with_pandas_indices(tmp_path):
+    path = tmp_path / "users.csv"
+    path.write_text("﻿First_Name,Email,Zip\nJohn,,007\n\nJane,jane@example.com\nJim,jim@x,1,extra\n")
+
+    with CsvRowReader(str(path)) as reader:
+        assert reader.columns == ["First_Name", "Email", "Zip"]
+        rows = list(reader)
+        assert reader.rows_read == 3
+
+    assert rows == [
+        (0, {"First_Name": "John", "Email": "", "Zip": "007"}),
+        (1, {"First_Name": "Jane", "Email": "jane@example.com", "Zip": ""}),
+        (2, {"First_Name": "Jim", "Email": "jim@x", "Zip": "1"}),
+    ]
+
+def test_reader_is_lazy(tmp_path):
+    path = tmp_path / "users.csv"
+    path.write_text("A\n" + "".join(f"{i}\n" for i in range(100)))
+
+    reader = CsvRowReader(str(path)).open()
+    rows = iter(reader)
+    assert next(rows) == (0, {"A": "0"})
+    assert reader.rows_read == 1
+    reader.close()
+
+def test_reader_renames_columns(tmp_path):
+    path = tmp_path / "users.csv"
+    path.write_text("given_name,Email\nJohn,john@example.com\n")
+
+    with CsvRowReader(str(path), rename={"given_name": "First_Name"}) as reader:
+        assert reader.columns == ["First_Name", "Email"]
+        assert list(reader) == [(0, {"First_Name": "John", "Email": "john@example.com"})]
@@ -1,8 +1,10 @@
 import sys
 import os
+import asyncio
 import pytest
-from unittest.mock import AsyncMock, patch, call
+from unittest.mock import AsyncMock, MagicMock, patch, call
 from pages.form_page import FormPage
+from pages.schema_cache import FormSchemaCache
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -123,3 +125,185 @@ async def test_form_fill_and_submit_robust(monkeypatch):
     assert mock_page.get_by_label.call_args_list == [call("First Name"), call("Last Name")]
     mock_page.get_by_role.assert_called_with("button", name="Submit Data")
     mock_button.click.assert_awaited_once_with(timeout=form.timeout)
+
+@pytest.mark.asyncio
+async def test_get_present_fields_single_evaluate():
+    mock_page = AsyncMock()
+    mock_page.evaluate.return_value = {"First Name": "#first", "Email": None}
+    form = FormPage(mock_page, url="http://test-url.com")
+
+    present = await form.get_present_fields()
+
+    assert present == {"First Name", "Email"}
+    mock_page.wait_for_selector.assert_awaited_once_with("input", state="visible", timeout=2000)
+    mock_page.evaluate.assert_awaited_once()
+    assert mock_page.evaluate.await_args.args[1] == FormPage.FIELD_MAP
+    mock_page.get_by_label.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_get_present_fields_tolerates_unrendered_form():
+    mock_page = AsyncMock()
+    mock_page.wait_for_selector.side_effect = PlaywrightTimeoutError("Timeout")
+    mock_page.evaluate.return_value = {}
+    form = FormPage(mock_page, url="http://test-url.com")
+
+    assert await form.get_present_fields() == set()
+    mock_page.evaluate.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_get_present_fields_reuses_schema_cache_until_structure_changes():
+    mock_page = AsyncMock()
+    cache = FormSchemaCache()
+    form = FormPage(mock_page, url="http://test-url.com", schema_cache=cache)
+    detected = {"First Name": "#first", "Last Name": "#last"}
+    mock_page.evaluate.side_effect = [
+        {"fingerprint": "a", "fields": detected},
+        {"fingerprint": "a", "fields": None},
+        {"fingerprint": "b", "fields": detected},
+    ]
+
+    assert await form.get_present_fields() == {"First Name", "Last Name"}
+    assert mock_page.evaluate.await_args.args[1] == [FormPage.FIELD_MAP, None]
+    assert await form.get_present_fields() == {"First Name", "Last Name"}
+    # The cached fingerprint goes into the page, which then skips detection.
+    assert mock_page.evaluate.await_args.args[1] == [FormPage.FIELD_MAP, "a"]
+    assert form.field_selectors == detected
+    assert cache.stats() == {"hits": 1, "misses": 1, "invalidations": 0}
+
+    await form.get_present_fields()
+    assert cache.stats() == {"hits": 1, "misses": 2, "invalidations": 1}
+    assert mock_page.evaluate.await_count == 3
+
+@pytest.mark.asyncio
+async def test_get_present_fields_detects_again_if_cache_entry_changed_meanwhile():
+    mock_page = AsyncMock()
+    cache = FormSchemaCache()
+    cache.put("http://test-url.com", "a", {"First Name": "#first"})
+    form = FormPage(mock_page, url="http://test-url.com", schema_cache=cache)
+
+    async def evaluate(script, arg):
+        # Another worker stores a new structure while this page is fingerprinted.
+        cache.put("http://test-url.com", "b", {"Email": "#email"})
+        return {"fingerprint": "a", "fields": None if arg[1] == "a" else {"First Name": "#first"}}
+
+    mock_page.evaluate.side_effect = evaluate
+    assert await form.get_present_fields() == {"First Name"}
+    assert mock_page.evaluate.await_count == 2
+    assert cache.known_fingerprint("http://test-url.com") == "a"
+
+@pytest.mark.asyncio
+async def test_fill_all_sets_fields_in_one_evaluate():
+    mock_page = AsyncMock()
+    mock_page.evaluate.return_value = []
+    form = FormPage(mock_page, url="http://test-url.com")
+    form.field_selectors = {"First Name": "#first", "Email": "#email"}
+
+    outcome = await form.fill_all({"First Name": "Alice", "Email": "alice@example.com"})
+
+    assert outcome == {"First Name": None, "Email": None}
+    mock_page.evaluate.assert_awaited_once()
+    assert mock_page.evaluate.await_args.args[1] == [
+        ["First Name", "#first", "Alice"],
+        ["Email", "#email", "alice@example.com"],
+    ]
+    mock_page.get_by_label.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_fill_all_falls_back_for_unset_fields():
+    mock_page = AsyncMock()
+    mock_page.evaluate.return_value = ["Last Name", "Email"]
+    label_locator = AsyncMock()
+    label_locator.fill.side_effect = [None, Exception("detached")]
+    mock_page.get_by_label = MagicMock(return_value=label_locator)
+    form = FormPage(mock_page, url="http://test-url.com")
+
+    outcome = await form.fill_all({"First Name": "Alice", "Last Name": "Smith", "Email": "a@b.com"})
+
+    assert outcome == {"First Name": None, "Last Name": None, "Email": "detached"}
+    assert mock_page.get_by_label.call_args_list == [call("Last Name"), call("Email")]
+
+@pytest.mark.asyncio
+async def test_submit_and_handle_alert_returns_dialog_message_and_latency():
+    mock_page = AsyncMock()
+    mock_page.on = MagicMock()
+    mock_button = AsyncMock()
+    mock_page.get_by_role = MagicMock(return_value=mock_button)
+    form = FormPage(mock_page, url="http://test-url.com")
+    handler = mock_page.on.call_args.args[1]
+    dialog = MagicMock(message="Success! Data submitted.")
+    dialog.accept = AsyncMock()
+    mock_button.click.side_effect = lambda **kwargs: handler(dialog)
+
+    message, latency = await form.submit_and_handle_alert()
+
+    mock_page.on.assert_called_once_with("dialog", form._handle_dialog)
+    assert message == "Success! Data submitted."
+    assert latency >= 0
+    dialog.accept.assert_awaited_once()
+    mock_page.keyboard.press.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_submit_and_handle_alert_times_out_without_dialog():
+    mock_page = AsyncMock()
+    mock_page.on = MagicMock()
+    mock_page.get_by_role = MagicMock(return_value=AsyncMock())
+    form = FormPage(mock_page, url="http://test-url.com", timeout=10)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await form.submit_and_handle_alert()
+    assert form._dialog_waiter is None
+
+@pytest.mark.asyncio
+async def test_soft_reset_requires_successful_submit():
+    mock_page = AsyncMock()
+    mock_page.on = MagicMock()
+    form = FormPage(mock_page, url="http://test-url.com")
+    form.field_selectors = {"First Name": "#first", "Email": None}
+
+    assert await form.soft_reset() is False
+    mock_page.evaluate.assert_not_awaited()
+
+    form._reusable = True
+    mock_page.evaluate.return_value = True
+    assert await form.soft_reset() is True
+    assert mock_page.evaluate.await_args.args[1] == [["#first"], "Submit Data"]
+    assert form.soft_resets == 1
+    # Each successful submit allows exactly one soft reset.
+    assert await form.soft_reset() is False
+
+@pytest.mark.asyncio
+async def test_soft_reset_reports_failed_verification():
+    mock_page = AsyncMock()
+    mock_page.on = MagicMock()
+    mock_page.evaluate.return_value = False
+    form = FormPage(mock_page, url="http://test-url.com")
+    form.field_selectors = {"First Name": "#first"}
+    form._reusable = True
+
+    assert await form.soft_reset() is False
+    assert form.soft_resets == 0
+
+@pytest.mark.asyncio
+async def test_schema_cache_hits_when_submit_button_id_changes_between_renders():
+    import random
+    from playwright.async_api import Error as PlaywrightError, async_playwright
+    from benchmarks.form_server import render_form
+
+    first, second = render_form(rng=random.Random(1)), render_form(rng=random.Random(2))
+    assert first != second
+    async with async_playwright() as p:
+        try:
+            browser = await p.chromium.launch()
+        except PlaywrightError as exc:
+            pytest.skip(f"Chromium is not available: {exc}")
+        try:
+            page = await browser.new_page()
+            cache = FormSchemaCache()
+            form = FormPage(page, url="http://test-url.com", schema_cache=cache)
+            await page.set_content(first)
+            detected = await form.get_present_fields()
+            await page.set_content(second)
+            assert await form.get_present_fields() == detected
+        finally:
+            await browser.close()
+    assert cache.stats() == {"hits": 1, "misses": 1, "invalidations": 0}
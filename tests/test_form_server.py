@@ -0,0 +1,40 @@
+import sys
+import os
+import random
+import urllib.request
+import urllib.error
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.form_server import ALERT_MESSAGE, FORM_FIELDS, FormServer, render_form
+
+def test_render_form_has_labels_placeholders_and_submit_button():
+    page = render_form(rng=random.Random(1))
+    for label in FORM_FIELDS:
+        assert f">{label}</label>" in page
+        assert f'placeholder="{label}"' in page
+    assert ">Submit Data</button>" in page
+    assert ALERT_MESSAGE in page
+
+def test_render_form_drops_fields_at_missing_rate():
+    assert "<label" not in render_form(missing_rate=1.0)
+
+def test_form_server_serves_replica_and_counts_loads():
+    with FormServer(seed=3) as server:
+        with urllib.request.urlopen(server.url) as response:
+            body = response.read().decode("utf-8")
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(server.url.replace("form.html", "other"))
+    assert "Submit Data" in body
+    assert server.page_loads == 1
+
+def test_form_server_fetch_mode_posts_and_counts_submissions():
+    with FormServer(seed=3, submit_mode="fetch") as server:
+        with urllib.request.urlopen(server.url) as response:
+            body = response.read().decode("utf-8")
+        submit_url = server.url.replace("form.html", "submit")
+        with urllib.request.urlopen(submit_url, data=b"first_name=John") as response:
+            assert response.status == 204
+    assert "fetch(&#x27;/submit&#x27;" in body
+    assert server.submissions == 1
@@ -0,0 +1,96 @@
+import sys
+import os
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+pytest_plugins = "pytest_asyncio"
+
+from utils.http_replay import ReplayError, ReplaySession, ReplayTemplate
+
+VALUES = {"First Name": "John", "Email": "john@example.com"}
+
+
+def test_template_from_form_request_maps_fields_and_keeps_static_params():
+    template = ReplayTemplate.from_request(
+        "POST", "http://x/submit",
+        {"content-type": "application/x-www-form-urlencoded; charset=UTF-8", "cookie": "a=b", "x-token": "t"},
+        "fn=John&mail=john%40example.com&csrf=abc",
+        VALUES,
+    )
+    assert template.field_params == {"First Name": "fn", "Email": "mail"}
+    assert template.static_params == {"csrf": "abc"}
+    assert "cookie" not in template.headers and template.headers["x-token"] == "t"
+    url, _, body = template.build({"First Name": "Jane", "Email": "jane@example.com"})
+    assert url == "http://x/submit"
+    assert body == "csrf=abc&fn=Jane&mail=jane%40example.com"
+
+
+def test_template_from_json_and_get_requests():
+    template = ReplayTemplate.from_request(
+        "POST", "http://x/api", {"content-type": "application/json"},
+        json.dumps({"first": "John", "email": "john@example.com", "v": 2}), VALUES,
+    )
+    _, _, body = template.build({"First Name": "Jane"})
+    assert json.loads(body) == {"first": "Jane", "email": "", "v": 2}
+
+    template = ReplayTemplate.from_request("GET", "http://x/s?first=John&page=1", {}, None, VALUES)
+    assert template.build({"First Name": "Jane"})[0] == "http://x/s?page=1&first=Jane"
+
+
+def test_template_rejects_unsupported_or_unrelated_requests():
+    assert ReplayTemplate.from_request("POST", "http://x", {"content-type": "multipart/form-data"}, "", VALUES) is None
+    assert ReplayTemplate.from_request(
+        "POST", "http://x", {"content-type": "application/x-www-form-urlencoded"}, "q=other", VALUES
+    ) is None
+
+
+def _request(post_data, resource_type="fetch"):
+    return MagicMock(
+        resource_type=resource_type, method="POST", url="http://x/submit",
+        headers={"content-type": "application/x-www-form-urlencoded"}, post_data=post_data,
+    )
+
+
+@pytest.mark.asyncio
+async def test_session_learns_replays_and_samples_browser_rows():
+    playwright = MagicMock()
+    client = AsyncMock()
+    client.fetch.return_value.ok = True
+    client.fetch.return_value.status = 201
+    playwright.request.new_context = AsyncMock(return_value=client)
+    context = AsyncMock()
+    context.on = MagicMock()
+
+    session = ReplaySession(playwright, verify_every=10)
+    session.watch(context)
+    handler = context.on.call_args.args[1]
+    handler(_request("fn=John&mail=john%40example.com", resource_type="image"))
+    assert not await session.learn(context, VALUES)
+    handler(_request("fn=John&mail=john%40example.com"))
+    assert await session.learn(context, VALUES)
+
+    assert session.ready and not session.learning
+    assert session.use_replay(1) and not session.use_replay(10)
+    session.browser_only.add(2)
+    assert not session.use_replay(2)
+    assert await session.submit({"First Name": "Jane", "Email": "j@x"}) == 201
+    assert session.replayed == 1
+
+    client.fetch.return_value.ok = False
+    with pytest.raises(ReplayError):
+        await session.submit(VALUES)
+    await session.close()
+    client.dispose.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_session_disables_itself_without_a_matching_request():
+    context = AsyncMock()
+    session = ReplaySession(MagicMock(), learn_rows=2)
+    assert not await session.learn(context, VALUES)
+    assert session.learning
+    assert not await session.learn(context, VALUES)
+    assert session.disabled and not session.learning and not session.use_replay(1)
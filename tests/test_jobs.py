@@ -0,0 +1,100 @@
+import sys
+import os
+import json
+import asyncio
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.jobs import FairScheduler, load_manifest
+
+def test_load_manifest_normalizes_jobs(tmp_path):
+    path = tmp_path / "jobs.json"
+    path.write_text(json.dumps({
+        "pool_size": 4,
+        "host_limits": {"a.example": 2},
+        "jobs": [
+            {"csv_path": "data/acme.csv", "url": "http://a.example/form", "fields": {"First Name": "given"}},
+            {"name": "beta", "csv_path": "b.csv", "url": "http://b.example/form", "fast_fill": True},
+        ],
+    }))
+    manifest = load_manifest(str(path))
+    assert manifest["pool_size"] == 4
+    assert manifest["host_limits"] == {"a.example": 2}
+    assert manifest["jobs"] == [
+        {"name": "acme", "csv_path": "data/acme.csv", "url": "http://a.example/form",
+         "fields": {"First Name": "given"}, "options": {}},
+        {"name": "beta", "csv_path": "b.csv", "url": "http://b.example/form",
+         "fields": {}, "options": {"fast_fill": True}},
+    ]
+
+def test_load_manifest_rejects_bad_manifests(tmp_path):
+    path = tmp_path / "jobs.json"
+    path.write_text(json.dumps({"jobs": []}))
+    with pytest.raises(ValueError, match="non-empty"):
+        load_manifest(str(path))
+    path.write_text(json.dumps({"jobs": [{"csv_path": "a.csv"}]}))
+    with pytest.raises(ValueError, match="'url'"):
+        load_manifest(str(path))
+    path.write_text(json.dumps({"jobs": [{"csv_path": "a.csv", "url": "u"}, {"csv_path": "x/a.csv", "url": "u"}]}))
+    with pytest.raises(ValueError, match="Duplicate"):
+        load_manifest(str(path))
+
+def test_load_manifest_reads_yaml(tmp_path):
+    pytest.importorskip("yaml")
+    path = tmp_path / "jobs.yaml"
+    path.write_text("jobs:\n  - csv_path: a.csv\n    url: http://a.example/\n")
+    assert load_manifest(str(path))["jobs"][0]["name"] == "a"
+
+@pytest.mark.asyncio
+async def test_scheduler_interleaves_jobs_round_robin():
+    scheduler = FairScheduler(1)
+    big, small = scheduler.slots("big", "h"), scheduler.slots("small", "h")
+    order = []
+
+    async def row(slots, label):
+        await slots.acquire()
+        order.append(label)
+        await asyncio.sleep(0)
+        slots.release()
+
+    await big.acquire()
+    tasks = [asyncio.create_task(row(big, f"big{i}")) for i in range(3)]
+    await asyncio.sleep(0)
+    tasks += [asyncio.create_task(row(small, f"small{i}")) for i in range(2)]
+    await asyncio.sleep(0)
+    big.release()
+    await asyncio.gather(*tasks)
+    assert order == ["big0", "small0", "big1", "small1", "big2"]
+    assert (big.granted, small.granted) == (4, 2)
+
+@pytest.mark.asyncio
+async def test_scheduler_caps_rows_per_host():
+    scheduler = FairScheduler(4, host_limits={"slow": 1})
+    slow, fast = scheduler.slots("a", "slow"), scheduler.slots("b", "fast")
+    assert scheduler.host_limit("slow") == 1 and scheduler.host_limit("fast") == 4
+    await slow.acquire()
+    waiting = asyncio.create_task(slow.acquire())
+    await asyncio.sleep(0)
+    # The blocked host does not hold up other hosts.
+    await asyncio.wait_for(fast.acquire(), 1)
+    assert not waiting.done()
+    slow.release()
+    await asyncio.wait_for(waiting, 1)
+    assert scheduler.active == 2
+
+@pytest.mark.asyncio
+async def test_scheduler_skips_cancelled_waiters():
+    scheduler = FairScheduler(1)
+    a, b = scheduler.slots("a", "h"), scheduler.slots("b", "h")
+    await a.acquire()
+    cancelled = asyncio.create_task(b.acquire())
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    waiting = asyncio.create_task(a.acquire())
+    await asyncio.sleep(0)
+    a.release()
+    await asyncio.wait_for(waiting, 1)
+    assert scheduler.active == 1
+    with pytest.raises(ValueError):
+        scheduler.slots("a", "h")
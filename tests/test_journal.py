@@ -0,0 +1,49 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.journal import SubmissionJournal
+
+def test_journal_round_trip_and_last_entry_wins(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = SubmissionJournal(str(path), fsync_interval=60, batch_size=10)
+    journal.append(0, "h0", {"Email": {"status": "successful", "value": "a@b.com"}})
+    journal.append(1, "h1", {"Email": {"status": "error: boom", "value": "c@d.com"}})
+    assert not path.exists()  # still buffered
+    journal.append(1, "h1b", {"Email": {"status": "successful", "value": "c@d.com"}})
+    journal.close()
+
+    committed = SubmissionJournal(str(path)).load()
+    assert committed[0] == ("h0", {"Email": {"status": "successful", "value": "a@b.com"}})
+    assert committed[1][0] == "h1b"
+
+def test_journal_flushes_on_batch_size_and_ignores_torn_line(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = SubmissionJournal(str(path), fsync_interval=60, batch_size=2)
+    journal.append(0, "h0", {})
+    journal.append(1, "h1", {})
+    assert len(path.read_text().splitlines()) == 2
+    journal.close()
+    with open(path, "a") as handle:
+        handle.write('{"row": 2, "ha')
+
+    assert sorted(SubmissionJournal(str(path)).load()) == [0, 1]
+
+def test_row_hash_depends_on_content():
+    assert SubmissionJournal.row_hash({"a": "1"}) == SubmissionJournal.row_hash({"a": "1"})
+    assert SubmissionJournal.row_hash({"a": "1"}) != SubmissionJournal.row_hash({"a": "2"})
+
+def test_journal_load_leaves_out_unsubmitted_rows_unless_asked(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = SubmissionJournal(str(path))
+    journal.append(0, "h0", {"Email": {"status": "successful", "value": "a@b.com"}})
+    journal.append(1, "h1", {"Email": {"status": "error: timeout", "value": "c@d.com"}}, submitted=False)
+    # Submitted with a field that failed to fill: the form was still sent.
+    journal.append(2, "h2", {"Email": {"status": "error: detached", "value": "e@f.com"}}, submitted=True)
+    journal.close()
+    with open(path, "a") as handle:
+        handle.write('{"row": 3, "hash": "h3", "record": {}}\n')
+
+    assert sorted(SubmissionJournal(str(path)).load()) == [0, 2, 3]
+    assert sorted(SubmissionJournal(str(path)).load(include_failed=True)) == [0, 1, 2, 3]
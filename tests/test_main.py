@@ -2,6 +2,7 @@ import sys
 import os
 import pytest
 import asyncio
+import json
 from unittest.mock import patch, AsyncMock, MagicMock
 import logging
 import pandas as pd
@@ -89,3 +90,886 @@ def test_print_summary_prints_and_warns_when_empty(capsys):
         out = capsys.readouterr().out
         assert "FINAL SUBMISSION SUMMARY" in out
         assert "A" in out and "B" in out and "a@b.com" in out and "X" in out
+
+@pytest.mark.asyncio
+async def test_run_form_submission_concurrent_keeps_row_order(tmp_path):
+    log_start("test_run_form_submission_concurrent_keeps_row_order started")
+    csv_path = tmp_path / "users.csv"
+    csv_path.write_text(
+        "First_Name,Last_Name,Email,Desired_Role\n"
+        "John,Doe,john@example.com,Engineer\n"
+        "Jane,Smith,jane@example.com,Designer\n"
+        "Jim,Beam,jim@example.com,Tester\n"
+    )
+
+    with patch("main.FormPage") as MockFormPage, \
+         patch("main.async_playwright") as mock_playwright, \
+         patch("main.setup_logging"), \
+         patch("main._print_summary") as mock_summary:
+
+        mock_browser = AsyncMock()
+        mock_playwright.return_value.__aenter__.return_value.chromium.launch.return_value = mock_browser
+        mock_browser.new_context.return_value.new_page.return_value = MagicMock()
+
+        form_pages = []
+
+        def make_form_page(page, url, **kwargs):
+            form_page = AsyncMock()
+            form_page.get_present_fields.return_value = {"First Name", "Last Name", "Email", "Desired Role"}
+            form_page.submit_and_handle_alert.return_value = ("Success!", 0.1)
+            form_pages.append(form_page)
+            return form_page
+
+        MockFormPage.side_effect = make_form_page
+
+        await run_form_submission(str(csv_path), "http://test-url.com", concurrency=2)
+
+        assert MockFormPage.call_count == 2
+        assert mock_browser.new_context.await_count == 2
+        assert sum(fp.submit_and_handle_alert.await_count for fp in form_pages) == 3
+        summary = mock_summary.call_args.args[0]
+        assert [record["First Name"]["value"] for record in summary] == ["John", "Jane", "Jim"]
+
+
+@pytest.mark.asyncio
+async def test_run_form_submission_rejects_invalid_concurrency(tmp_path):
+    with pytest.raises(ValueError):
+        await run_form_submission(str(tmp_path / "users.csv"), "http://test-url.com", concurrency=0)
+
+def test_print_summary_reports_schema_cache_stats():
+    results = [{"First Name": {"status": "successful", "value": "A"}}]
+    with patch("logging.info") as mock_info:
+        _print_summary(results, cache_stats={"hits": 3, "misses": 1, "invalidations": 0})
+    lines = [c.args[0] for c in mock_info.call_args_list]
+    assert "Form schema cache: 3 hits, 1 misses, 0 invalidations" in lines
+
+@pytest.mark.asyncio
+async def test_run_form_submission_fast_fill_records_fallback_errors(tmp_path):
+    csv_path = tmp_path / "users.csv"
+    csv_path.write_text("First_Name,Last_Name,Email,Desired_Role\nJohn,Doe,john@example.com,Engineer\n")
+
+    with patch("main.FormPage") as MockFormPage, \
+         patch("main.async_playwright"), \
+         patch("main.setup_logging"), \
+         patch("main._print_summary") as mock_summary:
+
+        mock_form_page = AsyncMock()
+        mock_form_page.get_present_fields.return_value = {"First Name", "Last Name", "Email"}
+        mock_form_page.fill_all.return_value = {"First Name": None, "Last Name": None, "Email": "boom"}
+        mock_form_page.submit_and_handle_alert.return_value = ("Success!", 0.1)
+        MockFormPage.return_value = mock_form_page
+
+        await run_form_submission(str(csv_path), "http://test-url.com", fast_fill=True)
+
+        mock_form_page.fill_all.assert_awaited_once_with(
+            {"First Name": "John", "Last Name": "Doe", "Email": "john@example.com"}
+        )
+        mock_form_page.fill_first_name.assert_not_awaited()
+        record = mock_summary.call_args.args[0][0]
+        assert record["First Name"] == {"status": "successful", "value": "John"}
+        assert record["Email"]["status"] == "error: boom"
+        assert record["Desired Role"]["status"] == "not required"
+
+@pytest.mark.asyncio
+async def test_run_form_submission_fast_fill_script_failure_is_a_row_failure(tmp_path):
+    from playwright.async_api import Error as PlaywrightError
+    from utils.retry import RetryPolicy
+
+    csv_path = tmp_path / "users.csv"
+    csv_path.write_text("First_Name,Last_Name,Email,Desired_Role\nJohn,Doe,john@example.com,Engineer\n")
+
+    with patch("main.FormPage") as MockFormPage, \
+         patch("main.async_playwright"), \
+         patch("main.setup_logging"), \
+         patch("main._print_summary") as mock_summary:
+
+        mock_form_page = AsyncMock()
+        mock_form_page.get_present_fields.return_value = {"First Name", "Email"}
+        mock_form_page.fill_all.side_effect = [
+            PlaywrightError("Execution context was destroyed, most likely because of a navigation"),
+            {"First Name": None, "Email": None},
+        ]
+        mock_form_page.submit_and_handle_alert.return_value = ("Success!", 0.1)
+        MockFormPage.return_value = mock_form_page
+
+        await run_form_submission(
+            str(csv_path), "http://test-url.com", fast_fill=True,
+            retry_policy=RetryPolicy(base_delay=0.0),
+        )
+
+        assert mock_form_page.fill_all.await_count == 2
+        assert mock_summary.call_args.kwargs["run_stats"]["Retries"] == 1
+        assert mock_summary.call_args.args[0][0]["Email"]["status"] == "successful"
+
+@pytest.mark.asyncio
+async def test_run_form_submission_resume_skips_journaled_rows(tmp_path):
+    csv_path = tmp_path / "users.csv"
+    csv_path.write_text(
+        "First_Name,Last_Name,Email,Desired_Role\n"
+        "John,Doe,john@example.com,Engineer\n"
+        "Jane,Smith,jane@example.com,Designer\n"
+    )
+    journal_path = tmp_path / "journal.jsonl"
+
+    with patch("main.FormPage") as MockFormPage, \
+         patch("main.async_playwright"), \
+         patch("main.setup_logging"), \
+         patch("main._print_summary") as mock_summary:
+
+        mock_form_page = AsyncMock()
+        mock_form_page.get_present_fields.return_value = {"First Name"}
+        mock_form_page.submit_and_handle_alert.return_value = ("Success!", 0.1)
+        MockFormPage.return_value = mock_form_page
+
+        await run_form_submission(str(csv_path), "http://test-url.com", journal_path=str(journal_path))
+        assert mock_form_page.submit_and_handle_alert.await_count == 2
+        first_summary = mock_summary.call_args.args[0]
+
+        # Change the second row: only it is submitted again on resume.
+        csv_path.write_text(
+            "First_Name,Last_Name,Email,Desired_Role\n"
+            "John,Doe,john@example.com,Engineer\n"
+            "Janet,Smith,jane@example.com,Designer\n"
+        )
+        await run_form_submission(
+            str(csv_path), "http://test-url.com", journal_path=str(journal_path), resume=True
+        )
+        assert mock_form_page.submit_and_handle_alert.await_count == 3
+        resumed_summary = mock_summary.call_args.args[0]
+        assert resumed_summary[0] == first_summary[0]
+        assert resumed_summary[1]["First Name"]["value"] == "Janet"
+
+@pytest.mark.asyncio
+async def test_run_form_submission_resume_retries_failed_rows_unless_skipped(tmp_path):
+    csv_path = tmp_path / "users.csv"
+    csv_path.write_text(
+        "First_Name,Last_Name,Email,Desired_Role\n"
+        "John,Doe,john@example.com,Engineer\n"
+        "Jane,Smith,jane@example.com,Designer\n"
+    )
+    journal_path = tmp_path / "journal.jsonl"
+
+    with patch("main.FormPage") as MockFormPage, \
+         patch("main.async_playwright"), \
+         patch("main.setup_logging"), \
+         patch("main._print_summary") as mock_summary:
+
+        mock_form_page = AsyncMock()
+        mock_form_page.get_present_fields.return_value = {"First Name"}
+        mock_form_page.submit_and_handle_alert.side_effect = [("Success!", 0.1), Exception("boom")]
+        MockFormPage.return_value = mock_form_page
+
+        await run_form_submission(str(csv_path), "http://test-url.com", journal_path=str(journal_path))
+        assert mock_form_page.submit_and_handle_alert.await_count == 2
+
+        # Skipping failed rows leaves the journaled failure in place.
+        await run_form_submission(
+            str(csv_path), "http://test-url.com", journal_path=str(journal_path),
+            resume=True, resume_skip_failed=True,
+        )
+        assert mock_form_page.submit_and_handle_alert.await_count == 2
+        assert mock_summary.call_args.args[0][1]["First Name"]["status"].startswith("error")
+
+        # By default only the failed row is submitted again.
+        mock_form_page.submit_and_handle_alert.side_effect = None
+        mock_form_page.submit_and_handle_alert.return_value = ("Success!", 0.1)
+        await run_form_submission(
+            str(csv_path), "http://test-url.com", journal_path=str(journal_path), resume=True
+        )
+        assert mock_form_page.submit_and_handle_alert.await_count == 3
+        assert mock_summary.call_args.args[0][1]["First Name"]["status"] == "successful"
+
+@pytest.mark.asyncio
+async def test_run_form_submission_resume_skips_submitted_rows_with_field_errors(tmp_path):
+    csv_path = tmp_path / "users.csv"
+    csv_path.write_text(
+        "First_Name,Last_Name,Email,Desired_Role\n"
+        "John,Doe,john@example.com,Engineer\n"
+    )
+    journal_path = tmp_path / "journal.jsonl"
+
+    with patch("main.FormPage") as MockFormPage, \
+         patch("main.async_playwright"), \
+         patch("main.setup_logging"), \
+         patch("main._print_summary") as mock_summary:
+
+        mock_form_page = AsyncMock()
+        mock_form_page.get_present_fields.return_value = {"First Name", "Email"}
+        mock_form_page.fill_email.side_effect = Exception("detached")
+        mock_form_page.submit_and_handle_alert.return_value = ("Success!", 0.1)
+        MockFormPage.return_value = mock_form_page
+
+        snapshot = await run_form_submission(str(csv_path), "http://test-url.com", journal_path=str(journal_path))
+        assert snapshot["rows_succeeded"] == 1
+        assert mock_form_page.submit_and_handle_alert.await_count == 1
+
+        await run_form_submission(
+            str(csv_path), "http://test-url.com", journal_path=str(journal_path), resume=True
+        )
+        assert mock_form_page.submit_and_handle_alert.await_count == 1
+        assert mock_summary.call_args.args[0][0]["Email"]["status"] == "error: detached"
+
+@pytest.mark.asyncio
+async def test_run_form_submission_retries_retryable_failures(tmp_path):
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+    from utils.retry import RetryPolicy
+
+    csv_path = tmp_path / "users.csv"
+    csv_path.write_text(
+        "First_Name,Last_Name,Email,Desired_Role\n"
+        "John,Doe,john@example.com,Engineer\n"
+        "Jane,Smith,jane@example.com,Designer\n"
+    )
+
+    with patch("main.FormPage") as MockFormPage, \
+         patch("main.async_playwright"), \
+         patch("main.setup_logging"), \
+         patch("main._print_summary") as mock_summary:
+
+        mock_form_page = AsyncMock()
+        mock_form_page.get_present_fields.return_value = {"First Name"}
+        # Row 1 times out once, then succeeds; row 2 has a selector problem.
+        mock_form_page.submit_and_handle_alert.side_effect = [
+            PlaywrightTimeoutError("Timeout"),
+            Exception("strict mode violation"),
+            ("Success!", 0.1),
+        ]
+        MockFormPage.return_value = mock_form_page
+
+        await run_form_submission(
+            str(csv_path), "http://test-url.com",
+            retry_policy=RetryPolicy(max_attempts=3, base_delay=0.01),
+        )
+
+        assert mock_form_page.submit_and_handle_alert.await_count == 3
+        summary = mock_summary.call_args.args[0]
+        assert summary[0]["First Name"]["status"] == "successful"
+        assert summary[1]["First Name"]["status"] == "error: selector"
+        run_stats = mock_summary.call_args.kwargs["run_stats"]
+        assert run_stats["Retries"] == 1
+        assert run_stats["Failed rows by class"] == {"selector": 1}
+
+@pytest.mark.asyncio
+async def test_run_form_submission_open_failure_does_not_kill_run(tmp_path):
+    from utils.retry import RetryPolicy
+
+    csv_path = tmp_path / "users.csv"
+    csv_path.write_text("First_Name,Last_Name,Email,Desired_Role\nJohn,Doe,john@example.com,Engineer\n")
+
+    with patch("main.FormPage") as MockFormPage, \
+         patch("main.async_playwright"), \
+         patch("main.setup_logging"), \
+         patch("main._print_summary") as mock_summary:
+
+        mock_form_page = AsyncMock()
+        mock_form_page.open.side_effect = Exception("net::ERR_NAME_NOT_RESOLVED")
+        MockFormPage.return_value = mock_form_page
+
+        await run_form_submission(
+            str(csv_path), "http://test-url.com",
+            retry_policy=RetryPolicy(max_attempts=2, base_delay=0.01),
+        )
+
+        assert mock_form_page.open.await_count == 2
+        record = mock_summary.call_args.args[0][0]
+        assert record["Email"] == {
+            "status": "error: navigation",
+            "value": "john@example.com",
+            "explanation": "net::ERR_NAME_NOT_RESOLVED",
+        }
+
+@pytest.mark.asyncio
+async def test_run_form_submission_soft_reset_skips_navigation(tmp_path):
+    csv_path = tmp_path / "users.csv"
+    csv_path.write_text(
+        "First_Name,Last_Name,Email,Desired_Role\n"
+        "John,Doe,john@example.com,Engineer\n"
+        "Jane,Smith,jane@example.com,Designer\n"
+        "Jim,Beam,jim@example.com,Tester\n"
+    )
+
+    with patch("main.FormPage") as MockFormPage, \
+         patch("main.async_playwright"), \
+         patch("main.setup_logging"), \
+         patch("main._print_summary"):
+
+        mock_form_page = AsyncMock()
+        mock_form_page.get_present_fields.return_value = {"First Name"}
+        mock_form_page.submit_and_handle_alert.return_value = ("Success!", 0.1)
+        # First row has nothing to reset, second resets cleanly, third fails verification.
+        mock_form_page.soft_reset.side_effect = [False, True, False]
+        MockFormPage.return_value = mock_form_page
+
+        await run_form_submission(str(csv_path), "http://test-url.com", soft_reset=True)
+
+        assert mock_form_page.soft_reset.await_count == 3
+        assert mock_form_page.open.await_count == 2
+
+@pytest.mark.asyncio
+async def test_run_form_submission_recycles_context_between_rows(tmp_path):
+    csv_path = tmp_path / "users.csv"
+    csv_path.write_text(
+        "First_Name,Last_Name,Email,Desired_Role\n"
+        "John,Doe,john@example.com,Engineer\n"
+        "Jane,Smith,jane@example.com,Designer\n"
+        "Jim,Beam,jim@example.com,Tester\n"
+    )
+
+    with patch("main.FormPage") as MockFormPage, \
+         patch("main.async_playwright") as mock_playwright, \
+         patch("main.setup_logging"), \
+         patch("main._print_summary") as mock_summary:
+
+        mock_browser = AsyncMock()
+        mock_playwright.return_value.__aenter__.return_value.chromium.launch.return_value = mock_browser
+        mock_form_page = AsyncMock()
+        mock_form_page.get_present_fields.return_value = {"First Name"}
+        mock_form_page.submit_and_handle_alert.return_value = ("Success!", 0.1)
+        mock_form_page.navigations = 1
+        mock_form_page.soft_resets = 0
+        MockFormPage.return_value = mock_form_page
+
+        await run_form_submission(str(csv_path), "http://test-url.com", recycle_after=2)
+
+        # One initial context, one recycle after the second row; no recycle at the end.
+        assert mock_browser.new_context.await_count == 2
+        assert mock_browser.new_context.return_value.close.await_count == 2
+        assert len(mock_summary.call_args.args[0]) == 3
+        assert mock_summary.call_args.kwargs["run_stats"]["Context recycles"] == 1
+
+@pytest.mark.asyncio
+async def test_run_form_submission_exports_metrics_and_traces_sampled_rows(tmp_path):
+    import json
+
+    csv_path = tmp_path / "users.csv"
+    csv_path.write_text(
+        "First_Name,Last_Name,Email,Desired_Role\n"
+        "John,Doe,john@example.com,Engineer\n"
+        "Jane,Smith,jane@example.com,Designer\n"
+        "Jim,Beam,jim@example.com,Tester\n"
+    )
+    metrics_path = tmp_path / "metrics.json"
+
+    with patch("main.FormPage") as MockFormPage, \
+         patch("main.async_playwright") as mock_playwright, \
+         patch("main.setup_logging"), \
+         patch("main._print_summary"):
+
+        mock_browser = AsyncMock()
+        mock_playwright.return_value.__aenter__.return_value.chromium.launch.return_value = mock_browser
+        mock_context = mock_browser.new_context.return_value
+        mock_form_page = AsyncMock()
+        mock_form_page.get_present_fields.return_value = {"First Name"}
+        mock_form_page.submit_and_handle_alert.return_value = ("Success!", 0.1)
+        MockFormPage.return_value = mock_form_page
+
+        snapshot = await run_form_submission(
+            str(csv_path), "http://test-url.com",
+            metrics_json=str(metrics_path),
+            profile_every=2, profile_dir=str(tmp_path / "traces"),
+        )
+
+        assert snapshot["rows_succeeded"] == 3
+        assert snapshot["phases"]["submit"]["count"] == 3
+        assert json.loads(metrics_path.read_text())["rows_succeeded"] == 3
+        mock_context.tracing.start.assert_awaited_once()
+        # Rows 1 and 3 (indices 0 and 2) are sampled.
+        assert [c.kwargs["path"] for c in mock_context.tracing.stop_chunk.await_args_list] == [
+            str(tmp_path / "traces" / "row-1.zip"), str(tmp_path / "traces" / "row-3.zip"),
+        ]
+
+@pytest.mark.asyncio
+async def test_run_form_submission_replays_rows_after_learning_submit(tmp_path):
+    from urllib.parse import urlencode
+
+    csv_path = tmp_path / "users.csv"
+    rows = [
+        ("John", "Doe", "john@example.com", "Engineer"),
+        ("Jane", "Smith", "jane@example.com", "Designer"),
+        ("Jim", "Beam", "jim@example.com", "Tester"),
+        ("Joan", "Arc", "joan@example.com", "Analyst"),
+    ]
+    csv_path.write_text(
+        "First_Name,Last_Name,Email,Desired_Role\n" + "".join(",".join(r) + "\n" for r in rows)
+    )
+
+    with patch("main.FormPage") as MockFormPage, \
+         patch("main.async_playwright") as mock_playwright, \
+         patch("main.setup_logging"), \
+         patch("main._print_summary") as mock_summary:
+
+        p = mock_playwright.return_value.__aenter__.return_value
+        mock_browser = AsyncMock()
+        p.chromium.launch.return_value = mock_browser
+        client = AsyncMock()
+        client.fetch.return_value.ok = True
+        client.fetch.return_value.status = 200
+        p.request.new_context = AsyncMock(return_value=client)
+        handlers = []
+        mock_context = mock_browser.new_context.return_value
+        mock_context.on = MagicMock(side_effect=lambda event, handler: handlers.append(handler))
+
+        submitted = []
+
+        async def submit():
+            first, last, email, role = rows[len(submitted)]
+            submitted.append(first)
+            request = MagicMock(
+                resource_type="fetch", method="POST", url="http://test-url.com/submit",
+                headers={"content-type": "application/x-www-form-urlencoded"},
+                post_data=urlencode({"first": first, "last": last, "email": email, "role": role}),
+            )
+            for handler in handlers:
+                handler(request)
+            return ("Success!", 0.1)
+
+        mock_form_page = AsyncMock()
+        mock_form_page.get_present_fields.return_value = {"First Name", "Last Name", "Email", "Desired Role"}
+        mock_form_page.submit_and_handle_alert.side_effect = submit
+        MockFormPage.return_value = mock_form_page
+
+        snapshot = await run_form_submission(str(csv_path), "http://test-url.com", replay=True)
+
+        # Row 1 learns the template; the rest are replayed over HTTP.
+        assert submitted == ["John"]
+        assert client.fetch.await_count == 3
+        assert client.fetch.await_args.kwargs["data"] == urlencode(
+            {"first": "Joan", "last": "Arc", "email": "joan@example.com", "role": "Analyst"}
+        )
+        assert snapshot["rows_succeeded"] == 4
+        results = mock_summary.call_args.args[0]
+        assert [r["First Name"]["value"] for r in results] == ["John", "Jane", "Jim", "Joan"]
+        assert mock_summary.call_args.kwargs["run_stats"]["HTTP replay"].startswith("3 rows replayed")
+        client.dispose.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_run_form_submission_streams_csv_with_backpressure(tmp_path):
+    from utils.csv_stream import CsvRowReader
+
+    csv_path = tmp_path / "users.csv"
+    csv_path.write_text(
+        "First_Name,Last_Name,Email,Desired_Role\n"
+        + "".join(f"User{i},Doe,user{i}@example.com,Engineer\n" for i in range(6))
+    )
+    readers = []
+
+    class RecordingReader(CsvRowReader):
+        def open(self):
+            readers.append(self)
+            return super().open()
+
+    with patch("main.FormPage") as MockFormPage, \
+         patch("main.CsvRowReader", RecordingReader), \
+         patch("main.VALIDATION_CHUNK_SIZE", 1), \
+         patch("main.async_playwright"), \
+         patch("main.setup_logging"), \
+         patch("main._print_summary") as mock_summary:
+
+        rows_read_at_submit = []
+
+        async def submit():
+            rows_read_at_submit.append(readers[0].rows_read)
+            return ("Success!", 0.1)
+
+        mock_form_page = AsyncMock()
+        mock_form_page.get_present_fields.return_value = {"First Name"}
+        mock_form_page.submit_and_handle_alert.side_effect = submit
+        MockFormPage.return_value = mock_form_page
+
+        await run_form_submission(str(csv_path), "http://test-url.com", max_pending_rows=2)
+
+        # Submitting starts before the file is read; the reader holds at most one
+        # row beyond the two pending ones.
+        assert rows_read_at_submit[0] <= 3
+        assert all(read - done <= 3 for done, read in enumerate(rows_read_at_submit))
+        assert [r["First Name"]["value"] for r in mock_summary.call_args.args[0]] == [
+            f"User{i}" for i in range(6)
+        ]
+
+@pytest.mark.asyncio
+async def test_run_form_submission_streams_results_and_keeps_only_summary_rows(tmp_path):
+    import json
+
+    csv_path = tmp_path / "users.csv"
+    csv_path.write_text(
+        "First_Name,Last_Name,Email,Desired_Role\n"
+        + "".join(f"User{i},Doe,user{i}@example.com,Engineer\n" for i in range(5))
+    )
+    results_path = tmp_path / "results.jsonl"
+
+    with patch("main.FormPage") as MockFormPage, \
+         patch("main.async_playwright"), \
+         patch("main.setup_logging"), \
+         patch("main._print_summary") as mock_summary:
+
+        mock_form_page = AsyncMock()
+        mock_form_page.get_present_fields.return_value = {"First Name", "Email"}
+        mock_form_page.submit_and_handle_alert.return_value = ("Success!", 0.1)
+        MockFormPage.return_value = mock_form_page
+
+        await run_form_submission(
+            str(csv_path), "http://test-url.com", results_path=str(results_path), summary_rows=2
+        )
+
+        written = [json.loads(line) for line in results_path.read_text().splitlines()]
+        assert sorted(int(r["row"]) for r in written) == [1, 2, 3, 4, 5]
+        assert written[0]["Last Name status"] == "not required"
+        assert [r["First Name"]["value"] for r in mock_summary.call_args.args[0]] == ["User0", "User1"]
+        totals = mock_summary.call_args.kwargs["totals"]
+        assert totals.rows == 5
+        assert totals.field_status["Email"] == {"successful": 5}
+
+def test_print_summary_reports_totals_beyond_table_rows():
+    from utils.results import RunSummary
+
+    totals = RunSummary(["First Name"])
+    for _ in range(3):
+        totals.add({"First Name": {"status": "successful", "value": "A"}})
+    with patch("logging.info") as mock_info:
+        _print_summary([{"First Name": {"status": "successful", "value": "A"}}], totals=totals)
+    lines = [c.args[0] for c in mock_info.call_args_list]
+    assert "(table shows the first 1 of 3 rows)" in lines
+    assert "First Name: 3 successful" in lines
+
+@pytest.mark.asyncio
+async def test_run_form_submission_rejects_invalid_rows_before_browser_work(tmp_path):
+    csv_path = tmp_path / "users.csv"
+    csv_path.write_text(
+        "First_Name,Last_Name,Email,Desired_Role\n"
+        "John,Doe,john@example.com,Engineer\n"
+        "Jane,Smith,not-an-email,Designer\n"
+        "Johnny,Doe,John@Example.com,Engineer\n"
+        "Jim,,jim@example.com,Tester\n"
+    )
+    rejects_path = tmp_path / "rejects.csv"
+
+    with patch("main.FormPage") as MockFormPage, \
+         patch("main.async_playwright"), \
+         patch("main.setup_logging"), \
+         patch("main._print_summary") as mock_summary:
+
+        mock_form_page = AsyncMock()
+        mock_form_page.get_present_fields.return_value = {"First Name"}
+        mock_form_page.submit_and_handle_alert.return_value = ("Success!", 0.1)
+        MockFormPage.return_value = mock_form_page
+
+        await run_form_submission(
+            str(csv_path), "http://test-url.com", rejects_path=str(rejects_path),
+            required_fields=["First_Name", "Last_Name", "Email", "Desired_Role"],
+        )
+
+        assert mock_form_page.submit_and_handle_alert.await_count == 1
+        assert [r["First Name"]["value"] for r in mock_summary.call_args.args[0]] == ["John"]
+        assert mock_summary.call_args.kwargs["run_stats"]["Rejected rows"] == {
+            "invalid email": 1, "duplicate Email": 1, "blank Last_Name": 1,
+        }
+        assert [line.split(",")[0] for line in rejects_path.read_text().splitlines()] == ["row", "2", "3", "4"]
+
+@pytest.mark.asyncio
+async def test_run_form_submission_fails_fast_on_missing_columns(tmp_path):
+    csv_path = tmp_path / "users.csv"
+    csv_path.write_text("First_Name,Email\nJohn,john@example.com\n")
+
+    with patch("main.async_playwright") as mock_playwright, \
+         patch("main.setup_logging"), \
+         patch("main._print_summary"):
+        with pytest.raises(ValueError, match="Desired_Role"):
+            await run_form_submission(str(csv_path), "http://test-url.com")
+        mock_playwright.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_run_form_submission_allows_blank_values_by_default(tmp_path):
+    csv_path = tmp_path / "users.csv"
+    csv_path.write_text(
+        "First_Name,Last_Name,Email,Desired_Role\n"
+        "John,Doe,john@example.com,\n"
+        ",Smith,jane@example.com,Designer\n"
+    )
+
+    with patch("main.FormPage") as MockFormPage, \
+         patch("main.async_playwright"), \
+         patch("main.setup_logging"), \
+         patch("main._print_summary") as mock_summary:
+
+        mock_form_page = AsyncMock()
+        mock_form_page.get_present_fields.return_value = {"First Name"}
+        mock_form_page.submit_and_handle_alert.return_value = ("Success!", 0.1)
+        MockFormPage.return_value = mock_form_page
+
+        await run_form_submission(str(csv_path), "http://test-url.com")
+
+        assert mock_form_page.submit_and_handle_alert.await_count == 2
+        assert mock_summary.call_args.kwargs["run_stats"]["Rejected rows"] == "none"
+
+@pytest.mark.asyncio
+async def test_run_form_submission_works_through_shared_queue(tmp_path):
+    from utils.work_queue import WorkQueue
+
+    csv_path = tmp_path / "users.csv"
+    csv_path.write_text(
+        "First_Name,Last_Name,Email,Desired_Role\n"
+        "John,Doe,john@example.com,Engineer\n"
+        "Jane,Smith,not-an-email,Designer\n"
+        "Jim,Beam,jim@example.com,Tester\n"
+    )
+    queue_db = str(tmp_path / "queue.db")
+
+    with patch("main.FormPage") as MockFormPage, \
+         patch("main.async_playwright"), \
+         patch("main.setup_logging"), \
+         patch("main._print_summary") as mock_summary:
+
+        mock_form_page = AsyncMock()
+        mock_form_page.get_present_fields.return_value = {"First Name"}
+        mock_form_page.submit_and_handle_alert.return_value = ("Success!", 0.1)
+        MockFormPage.return_value = mock_form_page
+
+        await run_form_submission(
+            str(csv_path), "http://test-url.com", queue_db=queue_db, queue_load=True, claim_batch=1,
+        )
+        assert mock_form_page.submit_and_handle_alert.await_count == 2
+        assert mock_summary.call_args.kwargs["run_stats"]["Work queue"] == "2 done, 0 failed, 0 leased, 0 pending"
+
+        # A second worker without --queue-load finds nothing left and never reads the CSV.
+        await run_form_submission("missing.csv", "http://test-url.com", queue_db=queue_db)
+        assert mock_form_page.submit_and_handle_alert.await_count == 2
+
+    queue = WorkQueue(queue_db)
+    assert queue.counts() == {"pending": 0, "leased": 0, "done": 2, "failed": 0}
+    queue.close()
+
+    with pytest.raises(ValueError, match="resume"):
+        await run_form_submission(str(csv_path), "http://test-url.com", queue_db=queue_db, resume=True)
+
+@pytest.mark.asyncio
+async def test_run_form_submission_queue_does_not_resubmit_rows_with_field_errors(tmp_path):
+    csv_path = tmp_path / "users.csv"
+    csv_path.write_text("First_Name,Last_Name,Email,Desired_Role\nJohn,Doe,john@example.com,Engineer\n")
+    queue_db = str(tmp_path / "queue.db")
+
+    with patch("main.FormPage") as MockFormPage, \
+         patch("main.async_playwright"), \
+         patch("main.setup_logging"), \
+         patch("main._print_summary") as mock_summary:
+
+        mock_form_page = AsyncMock()
+        mock_form_page.get_present_fields.return_value = {"First Name", "Email"}
+        mock_form_page.fill_email.side_effect = Exception("detached")
+        mock_form_page.submit_and_handle_alert.return_value = ("Success!", 0.1)
+        MockFormPage.return_value = mock_form_page
+
+        await run_form_submission(str(csv_path), "http://test-url.com", queue_db=queue_db, queue_load=True)
+
+        assert mock_form_page.submit_and_handle_alert.await_count == 1
+        assert mock_summary.call_args.kwargs["run_stats"]["Work queue"] == "1 done, 0 failed, 0 leased, 0 pending"
+
+@pytest.mark.asyncio
+async def test_run_form_submission_adapts_concurrency(tmp_path):
+    csv_path = tmp_path / "users.csv"
+    csv_path.write_text("First_Name,Last_Name,Email,Desired_Role\n" + "".join(
+        f"User{i},Doe,user{i}@example.com,Engineer\n" for i in range(40)
+    ))
+    log_path = tmp_path / "concurrency.jsonl"
+    in_flight = peak = 0
+
+    async def submit(*args, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        return ("Success!", 0.1)
+
+    with patch("main.FormPage") as MockFormPage, \
+         patch("main.async_playwright"), \
+         patch("main.setup_logging"), \
+         patch("main._print_summary") as mock_summary:
+
+        mock_form_page = AsyncMock()
+        mock_form_page.get_present_fields.return_value = {"First Name"}
+        mock_form_page.submit_and_handle_alert.side_effect = submit
+        MockFormPage.return_value = mock_form_page
+
+        await run_form_submission(
+            str(csv_path), "http://test-url.com", concurrency=4, min_concurrency=1,
+            concurrency_log=str(log_path),
+        )
+
+    assert mock_form_page.submit_and_handle_alert.await_count == 40
+    assert peak <= 4
+    assert mock_summary.call_args.kwargs["run_stats"]["Adaptive concurrency final/peak"].startswith("4/4")
+    assert [json.loads(line)["limit"] for line in log_path.read_text().splitlines()] == [2, 3, 4]
+
+    with pytest.raises(ValueError, match="min_concurrency"):
+        await run_form_submission(str(csv_path), "http://test-url.com", concurrency=2, min_concurrency=3)
+
+@pytest.mark.asyncio
+async def test_run_jobs_shares_one_browser_and_summarizes_each_job(tmp_path):
+    from benchmarks.simulated_page import SimulatedPlaywright
+    from main import run_jobs
+
+    (tmp_path / "acme.csv").write_text(
+        "given,family,mail,role\n" + "".join(f"A{i},Doe,a{i}@example.com,Engineer\n" for i in range(6))
+    )
+    (tmp_path / "beta.csv").write_text(
+        "First_Name,Last_Name,Email,Desired_Role\n" + "".join(f"B{i},Roe,b{i}@example.com,Tester\n" for i in range(3))
+    )
+    manifest = tmp_path / "jobs.json"
+    manifest.write_text(json.dumps({
+        "pool_size": 3,
+        "host_limits": {"slow.example": 1},
+        "jobs": [
+            {
+                "csv_path": str(tmp_path / "acme.csv"), "url": "http://slow.example/form",
+                "fields": {"First Name": "given", "Last Name": "family", "Email": "mail", "Desired Role": "role"},
+            },
+            {"csv_path": str(tmp_path / "beta.csv"), "url": "http://fast.example/form", "concurrency": 8},
+        ],
+    }))
+    simulated = SimulatedPlaywright()
+
+    with patch("main.async_playwright", simulated), \
+         patch("main.setup_logging"), \
+         patch("main._print_summary") as mock_summary:
+        snapshots = await run_jobs(str(manifest), results_path=str(tmp_path / "results.csv"))
+
+    assert snapshots["acme"]["rows_succeeded"] == 6
+    assert snapshots["beta"]["rows_succeeded"] == 3
+    assert simulated.browser.submissions == 9
+    titles = sorted(call.kwargs["title"] for call in mock_summary.call_args_list)
+    assert titles == ["SUMMARY: acme", "SUMMARY: beta"]
+    assert snapshots["acme"]["run_stats"]["Shared pool"].startswith("6 browser rows")
+    assert (tmp_path / "results.acme.csv").read_text().count("A5") == 1
+    assert (tmp_path / "results.beta.csv").exists()
+
+    manifest.write_text(json.dumps({"jobs": [{"csv_path": "a.csv", "url": "http://x", "shard": [0, 2]}]}))
+    with patch("main.setup_logging"), pytest.raises(ValueError, match="shard"):
+        await run_jobs(str(manifest))
+
+@pytest.mark.asyncio
+async def test_run_jobs_keeps_shared_browser_open_until_every_job_finishes(tmp_path):
+    from benchmarks.simulated_page import SimulatedPlaywright
+    from main import run_jobs
+
+    (tmp_path / "a.csv").write_text("First_Name,Last_Name,Email,Desired_Role\nA,Doe,a@example.com,Engineer\n")
+    (tmp_path / "b.csv").write_text(
+        "First_Name,Last_Name,Email,Desired_Role\n" + "".join(f"B{i},Roe,b{i}@example.com,Tester\n" for i in range(20))
+    )
+    manifest = tmp_path / "jobs.json"
+    manifest.write_text(json.dumps({
+        "pool_size": 1,
+        "jobs": [
+            {"csv_path": str(tmp_path / "a.csv"), "url": "http://a.example/form"},
+            {"csv_path": str(tmp_path / "b.csv"), "url": "http://b.example/form", "recycle_after": 2},
+        ],
+    }))
+    # A small latency makes job b still open new contexts after job a is done.
+    simulated = SimulatedPlaywright(latency=0.001)
+
+    with patch("main.async_playwright", simulated), \
+         patch("main.setup_logging"), \
+         patch("main._print_summary"):
+        snapshots = await run_jobs(str(manifest))
+
+    assert snapshots["a"]["rows_succeeded"] == 1
+    assert snapshots["b"]["rows_succeeded"] == 20
+    assert snapshots["b"]["rows_failed"] == 0
+    assert simulated.browser.closed
+
+def test_shard_of_keeps_duplicate_keys_together():
+    from main import _shard_of
+
+    a = _shard_of(0, {"Email": "John@Example.com "}, ["Email"], 8)
+    b = _shard_of(41, {"Email": "john@example.com"}, ["Email"], 8)
+    assert a == b
+    assert _shard_of(13, {"Email": ""}, ["Email"], 8) == 13 % 8
+    assert _shard_of(13, {"Email": "x@y.z"}, [], 8) == 13 % 8
+
+class InlinePool:
+    """Runs shards in this process, recording the options each shard got."""
+    shards = []
+    def __init__(self, *args, **kwargs):
+        pass
+    def __enter__(self):
+        return self
+    def __exit__(self, *exc_info):
+        pass
+    def submit(self, fn, options):
+        from concurrent.futures import Future
+        self.shards.append(options)
+        future = Future()
+        future.set_result(fn(options))
+        return future
+
+def test_run_sharded_submission_merges_shards_in_row_order(tmp_path):
+    from main import run_sharded_submission
+
+    InlinePool.shards = []
+    csv_path = tmp_path / "users.csv"
+    csv_path.write_text(
+        "First_Name,Last_Name,Email,Desired_Role\n"
+        + "".join(f"User{i},Doe,user{i}@example.com,Engineer\n" for i in range(8))
+        + "Dup,Doe,USER3@example.com,Engineer\n"
+    )
+    results_path = tmp_path / "results.csv"
+    rejects_path = tmp_path / "rejects.csv"
+
+    with patch("main.FormPage") as MockFormPage, \
+         patch("main.ProcessPoolExecutor", InlinePool), \
+         patch("main.async_playwright"), \
+         patch("main.setup_logging"), \
+         patch("main._print_summary") as mock_summary:
+
+        mock_form_page = AsyncMock()
+        mock_form_page.get_present_fields.return_value = {"First Name"}
+        mock_form_page.submit_and_handle_alert.return_value = ("Success!", 0.1)
+        MockFormPage.return_value = mock_form_page
+
+        merged = run_sharded_submission(
+            3, csv_path=str(csv_path), form_url="http://test-url.com", rate=30.0, burst=5,
+            results_path=str(results_path), rejects_path=str(rejects_path),
+        )
+
+    assert merged["rows_succeeded"] == 8
+    assert [s["shard"] for s in InlinePool.shards] == [(0, 3), (1, 3), (2, 3)]
+    assert {s["rate"] for s in InlinePool.shards} == {10.0}
+    assert sum(s["rows_succeeded"] for s in merged["shards"]) == 8
+    assert [s["rows_succeeded"] > 0 for s in merged["shards"]].count(True) >= 2
+    rows = results_path.read_text().splitlines()
+    assert [line.split(",")[0] for line in rows[1:]] == [str(i) for i in range(1, 9)]
+    assert rejects_path.read_text().splitlines()[1].startswith("9,Dup")
+    table = mock_summary.call_args.args[0]
+    assert [r["First Name"]["value"] for r in table] == [f"User{i}" for i in range(8)]
+    run_stats = mock_summary.call_args.kwargs["run_stats"]
+    assert run_stats["Processes"] == 3
+    assert run_stats["Rejected rows"] == {"duplicate Email": 1}
+
+def test_run_sharded_submission_without_validation_writes_empty_rejects(tmp_path):
+    from main import run_sharded_submission
+
+    InlinePool.shards = []
+    csv_path = tmp_path / "users.csv"
+    csv_path.write_text(
+        "First_Name,Last_Name,Email,Desired_Role\n"
+        + "".join(f"User{i},Doe,user{i}@example.com,Engineer\n" for i in range(4))
+    )
+    rejects_path = tmp_path / "rejects.csv"
+
+    with patch("main.FormPage") as MockFormPage, \
+         patch("main.ProcessPoolExecutor", InlinePool), \
+         patch("main.async_playwright"), \
+         patch("main.setup_logging"), \
+         patch("main._print_summary"):
+
+        mock_form_page = AsyncMock()
+        mock_form_page.get_present_fields.return_value = {"First Name"}
+        mock_form_page.submit_and_handle_alert.return_value = ("Success!", 0.1)
+        MockFormPage.return_value = mock_form_page
+
+        merged = run_sharded_submission(
+            2, csv_path=str(csv_path), form_url="http://test-url.com",
+            rejects_path=str(rejects_path), validate=False,
+        )
+
+    assert merged["rows_succeeded"] == 4
+    assert rejects_path.read_text() == ""
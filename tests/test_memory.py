@@ -0,0 +1,45 @@
+import sys
+import os
+import pytest
+from unittest.mock import AsyncMock, patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.memory import RendererMemoryMonitor, _process_rss_bytes
+
+def test_process_rss_bytes_reads_proc_or_returns_none():
+    rss = _process_rss_bytes(os.getpid())
+    if os.path.exists("/proc/self/status"):
+        assert rss > 0
+    else:
+        assert rss is None
+    assert _process_rss_bytes(-1) is None
+
+@pytest.mark.asyncio
+async def test_monitor_sums_renderers_and_tracks_peak_and_mean():
+    browser = AsyncMock()
+    session = browser.new_browser_cdp_session.return_value
+    session.send.return_value = {"processInfo": [
+        {"id": 11, "type": "renderer"}, {"id": 12, "type": "renderer"}, {"id": 1, "type": "browser"},
+    ]}
+    monitor = RendererMemoryMonitor(browser, min_interval=60)
+    sizes = {11: 100 * 1024 * 1024, 12: 50 * 1024 * 1024, 1: 999}
+
+    with patch("utils.memory._process_rss_bytes", side_effect=sizes.get):
+        assert await monitor.sample() == 150 * 1024 * 1024
+        assert await monitor.sample() == 150 * 1024 * 1024  # cached within min_interval
+        sizes[12] = 250 * 1024 * 1024
+        assert await monitor.sample(force=True) == 350 * 1024 * 1024
+
+    assert session.send.await_count == 2
+    assert monitor.stats() == {"samples": 2, "peak_mb": 350.0, "mean_mb": 250.0}
+
+@pytest.mark.asyncio
+async def test_monitor_disables_itself_when_cdp_is_unavailable():
+    browser = AsyncMock()
+    browser.new_browser_cdp_session.side_effect = Exception("not chromium")
+    monitor = RendererMemoryMonitor(browser)
+
+    assert await monitor.sample() is None
+    assert await monitor.sample(force=True) is None
+    assert browser.new_browser_cdp_session.await_count == 1
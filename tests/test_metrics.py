@@ -0,0 +1,44 @@
+import sys
+import os
+import json
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.metrics import LatencyHistogram, RunMetrics
+
+def test_histogram_quantiles_are_close_upper_bounds():
+    histogram = LatencyHistogram()
+    for ms in range(1, 101):
+        histogram.observe(ms / 1000)
+    summary = histogram.summary()
+    assert summary["count"] == 100
+    assert summary["mean"] == pytest.approx(0.0505)
+    assert 0.050 <= summary["p50"] <= 0.050 * 1.2
+    assert 0.095 <= summary["p95"] <= 0.095 * 1.2
+    assert summary["p99"] <= summary["max"] == 0.1
+
+def test_empty_histogram_summary_is_zero():
+    assert LatencyHistogram().summary()["p99"] == 0.0
+
+def test_run_metrics_times_phases_and_exports(tmp_path):
+    metrics = RunMetrics()
+    with metrics.time("open"):
+        pass
+    metrics.observe("submit", 0.25)
+    metrics.record_row(True)
+    metrics.record_row(False)
+
+    json_path = tmp_path / "metrics.json"
+    prom_path = tmp_path / "metrics.prom"
+    metrics.export(str(json_path), str(prom_path))
+
+    report = json.loads(json_path.read_text())
+    assert report["rows_succeeded"] == 1 and report["rows_failed"] == 1
+    assert report["phases"]["open"]["count"] == 1
+    assert report["phases"]["submit"]["p50"] == pytest.approx(0.25, rel=0.2)
+    prom = prom_path.read_text()
+    assert "# TYPE form_bot_phase_seconds summary" in prom
+    assert 'form_bot_phase_seconds_count{phase="submit"} 1' in prom
+    assert 'form_bot_rows_total{outcome="failure"} 1' in prom
+    assert not (tmp_path / "metrics.json.tmp").exists()
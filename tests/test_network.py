@@ -0,0 +1,70 @@
+import sys
+import os
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.network import ResourcePolicy
+
+def make_route(url, resource_type, method="GET"):
+    route = AsyncMock()
+    route.request = MagicMock(url=url, resource_type=resource_type, method=method)
+    return route
+
+@pytest.mark.asyncio
+async def test_policy_blocks_types_and_url_patterns():
+    policy = ResourcePolicy(blocked_types=["image"], blocked_patterns=["*analytics*"])
+    image = make_route("https://site/logo.png", "image")
+    tracker = make_route("https://analytics.example/t.js", "script")
+    document = make_route("https://site/form.html", "document")
+
+    for route in (image, tracker, document):
+        await policy._handle(route)
+
+    image.abort.assert_awaited_once()
+    tracker.abort.assert_awaited_once()
+    document.continue_.assert_awaited_once()
+    assert policy.stats()["blocked_requests"] == 2
+
+@pytest.mark.asyncio
+async def test_policy_serves_static_assets_from_disk_cache(tmp_path):
+    policy = ResourcePolicy(cache_dir=str(tmp_path))
+    response = AsyncMock(status=200, headers={"content-type": "text/css", "content-encoding": "gzip"})
+    response.body.return_value = b"body{}"
+    first = make_route("https://site/app.css", "stylesheet")
+    first.fetch.return_value = response
+    await policy._handle(first)
+    first.fulfill.assert_awaited_once_with(status=200, headers={"content-type": "text/css"}, body=b"body{}")
+
+    second = make_route("https://site/app.css", "stylesheet")
+    await policy._handle(second)
+    second.fetch.assert_not_awaited()
+    second.fulfill.assert_awaited_once_with(status=200, headers={"content-type": "text/css"}, body=b"body{}")
+    assert policy.stats() == {
+        "blocked_requests": 0, "cache_hits": 1, "cache_misses": 1, "bytes_from_cache": 6,
+    }
+
+@pytest.mark.asyncio
+async def test_policy_passes_request_through_when_cache_fetch_fails(tmp_path):
+    policy = ResourcePolicy(cache_dir=str(tmp_path))
+    route = make_route("https://site/app.js", "script")
+    route.fetch.side_effect = Exception("net::ERR_CONNECTION_RESET")
+    await policy._handle(route)
+    route.continue_.assert_awaited_once()
+    route.abort.assert_not_awaited()
+    assert os.listdir(tmp_path) == []
+
+    # If the request cannot be continued either, it is aborted rather than left hanging.
+    stuck = make_route("https://site/app.js", "script")
+    stuck.fetch.side_effect = Exception("net::ERR_CONNECTION_RESET")
+    stuck.continue_.side_effect = Exception("Route is already handled!")
+    await policy._handle(stuck)
+    stuck.abort.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_install_routes_all_requests():
+    policy = ResourcePolicy(blocked_types=["font"])
+    context = AsyncMock()
+    await policy.install(context)
+    context.route.assert_awaited_once_with("**/*", policy._handle)
@@ -0,0 +1,25 @@
+import sys
+import os
+import asyncio
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.rate_limiter import TokenBucket
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_burst_then_paces():
+    bucket = TokenBucket(rate=20, burst=2)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for _ in range(4):
+        await bucket.acquire()
+    elapsed = loop.time() - start
+    # Two tokens are available immediately, the next two refill at 20/sec.
+    assert 0.08 <= elapsed < 0.5
+
+def test_token_bucket_rejects_invalid_settings():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+    with pytest.raises(ValueError):
+        TokenBucket(rate=1, burst=0)
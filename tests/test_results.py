@@ -0,0 +1,80 @@
+import sys
+import os
+import csv
+import json
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.results import MAX_ERROR_KINDS, ResultsWriter, RunSummary, compact_record
+
+FIELDS = ["First Name", "Email"]
+OK = {
+    "First Name": {"status": "successful", "value": "John"},
+    "Email": {"status": "not required", "value": "", "explanation": "Field not present on form at runtime"},
+    "Notes": {"status": "not required", "value": "vip", "explanation": "Extra field in CSV, not required by form"},
+}
+FAILED = {
+    "First Name": {"status": "error: timeout", "value": "Jane", "explanation": "Timeout 15000ms"},
+    "Email": {"status": "error: timeout", "value": "j@x", "explanation": "Timeout 15000ms"},
+}
+
+def test_compact_record_drops_extra_columns():
+    assert compact_record(4, OK, FIELDS) == {
+        "row": "5", "First Name": "John", "First Name status": "successful",
+        "Email": "", "Email status": "not required", "error": "",
+    }
+    assert compact_record(0, FAILED, FIELDS)["error"] == "Timeout 15000ms"
+
+def test_writer_appends_csv_and_jsonl(tmp_path):
+    for name in ("out.csv", "out.jsonl"):
+        path = tmp_path / name
+        writer = ResultsWriter(str(path), FIELDS)
+        writer.write(1, FAILED)
+        writer.write(0, OK)
+        writer.close()
+        assert writer.rows_written == 2
+        if name.endswith(".csv"):
+            with open(path, newline="") as handle:
+                rows = list(csv.DictReader(handle))
+        else:
+            rows = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [row["row"] for row in rows] == ["2", "1"]
+        assert rows[0]["Email status"] == "error: timeout"
+
+def test_writer_rejects_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        ResultsWriter(str(tmp_path / "out.xlsx"), FIELDS)
+
+def test_run_summary_counts_statuses_and_caps_error_kinds():
+    summary = RunSummary(FIELDS)
+    summary.add(OK)
+    summary.add(FAILED)
+    for i in range(MAX_ERROR_KINDS + 5):
+        summary.add({"First Name": {"status": f"error: boom {i}", "value": "x"}})
+    assert summary.rows == MAX_ERROR_KINDS + 7
+    assert summary.field_status["First Name"] == {"successful": 1, "error": MAX_ERROR_KINDS + 6}
+    assert summary.field_status["Email"]["n/a"] == MAX_ERROR_KINDS + 5
+    assert len(summary.errors) == MAX_ERROR_KINDS + 1
+    assert summary.errors["timeout"] == 2
+    assert "First Name: 26 error, 1 successful" in summary.lines()
+
+def test_reorder_buffer_releases_in_expected_order():
+    from utils.results import ReorderBuffer
+
+    buffer = ReorderBuffer()
+    for idx in (0, 2, 5):
+        buffer.expect(idx)
+    assert buffer.add(5, "c") == []
+    assert buffer.add(2, "b") == []
+    assert len(buffer) == 2
+    assert buffer.add(0, "a") == [(0, "a"), (2, "b"), (5, "c")]
+    assert len(buffer) == 0
+
+def test_expand_record_round_trips_compact_record():
+    from utils.results import expand_record
+
+    assert expand_record(compact_record(1, FAILED, FIELDS), FIELDS) == {
+        "First Name": {"status": "error: timeout", "value": "Jane", "explanation": "Timeout 15000ms"},
+        "Email": {"status": "error: timeout", "value": "j@x"},
+    }
@@ -0,0 +1,45 @@
+import sys
+import os
+import asyncio
+import pytest
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.retry import CircuitBreaker, RetryPolicy, RowFailure, classify_failure
+
+def test_classify_failure():
+    assert classify_failure(asyncio.TimeoutError(), "submit") == "dialog"
+    assert classify_failure(PlaywrightTimeoutError("Timeout 15000ms exceeded"), "submit") == "timeout"
+    assert classify_failure(PlaywrightError("net::ERR_CONNECTION_RESET"), "submit") == "navigation"
+    assert classify_failure(Exception("boom"), "open") == "navigation"
+    assert classify_failure(Exception("strict mode violation"), "detect") == "selector"
+    assert classify_failure(PlaywrightError("Execution context was destroyed"), "fill") == "navigation"
+    assert classify_failure(PlaywrightError("Target page, context or browser has been closed"), "fill") == "navigation"
+    assert classify_failure(PlaywrightTimeoutError("Timeout 15000ms exceeded"), "fill") == "timeout"
+    assert classify_failure(ValueError("bad value"), "fill") == "selector"
+    assert RowFailure("submit", asyncio.TimeoutError()).kind == "dialog"
+
+def test_retry_policy_limits_attempts_and_jitters_backoff():
+    policy = RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=3.0)
+    assert policy.should_retry("timeout", 1)
+    assert policy.should_retry("timeout", 2)
+    assert not policy.should_retry("timeout", 3)
+    assert not policy.should_retry("selector", 1)
+    for attempt, ceiling in [(1, 1.0), (2, 2.0), (3, 3.0), (4, 3.0)]:
+        delay = policy.backoff(attempt)
+        assert ceiling / 2 <= delay <= ceiling
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_opens_and_closes_after_cooldown():
+    breaker = CircuitBreaker(threshold=0.5, window=60, min_samples=4, cooldown=0.05)
+    for ok in (True, False, True):
+        breaker.record(ok)
+    assert not breaker.is_open
+    breaker.record(False)
+    assert breaker.is_open and breaker.trips == 1
+
+    await asyncio.wait_for(breaker.wait_closed(), timeout=1)
+    assert not breaker.is_open
+    breaker.record(False)  # fresh window: below min_samples
+    assert not breaker.is_open
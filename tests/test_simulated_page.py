@@ -0,0 +1,63 @@
+import sys
+import os
+import pytest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.bench_overhead import _run_case
+from benchmarks.bench_throughput import generate_csv
+from benchmarks.simulated_page import SimulatedPlaywright
+from main import run_form_submission
+from utils.retry import RetryPolicy
+
+@pytest.mark.asyncio
+async def test_simulated_browser_runs_the_real_pipeline(tmp_path):
+    csv_path = tmp_path / "users.csv"
+    generate_csv(str(csv_path), 30)
+    simulated = SimulatedPlaywright()
+
+    with patch("main.async_playwright", simulated), \
+         patch("main.setup_logging"), \
+         patch("main._print_summary") as mock_summary:
+        snapshot = await run_form_submission(str(csv_path), "http://simulated.invalid", concurrency=3)
+
+    assert snapshot["rows_succeeded"] == 30
+    assert simulated.browser.submissions == 30
+    assert simulated.browser.contexts == []
+    table = mock_summary.call_args.args[0]
+    assert all(record["Email"]["status"] == "successful" for record in table)
+
+@pytest.mark.asyncio
+async def test_simulated_browser_injects_click_timeouts(tmp_path):
+    csv_path = tmp_path / "users.csv"
+    generate_csv(str(csv_path), 20)
+    simulated = SimulatedPlaywright(failure_rate=1.0)
+
+    with patch("main.async_playwright", simulated), \
+         patch("main.setup_logging"), \
+         patch("main._print_summary") as mock_summary:
+        snapshot = await run_form_submission(
+            str(csv_path), "http://simulated.invalid", fast_fill=True,
+            retry_policy=RetryPolicy(max_attempts=2, base_delay=0.0),
+        )
+
+    assert snapshot["rows_failed"] == 20
+    assert mock_summary.call_args.kwargs["run_stats"]["Failed rows by class"] == {"timeout": 20}
+
+@pytest.mark.asyncio
+async def test_overhead_case_reports_cpu_memory_and_loop_lag(tmp_path):
+    csv_path = tmp_path / "users.csv"
+    generate_csv(str(csv_path), 50)
+    options = {"latency": 0.0, "failure_rate": 0.0, "seed": 0, "log_level": "WARNING", "lag_interval": 0.001}
+
+    with patch("main.async_playwright"), \
+         patch("main.setup_logging"), \
+         patch("main._print_summary"):
+        measured = await _run_case(str(csv_path), {"concurrency": 2}, options)
+
+    assert measured["rows_finished"] == 50
+    assert measured["cpu_us_per_row"] > 0
+    assert measured["peak_rss_mb"] >= measured["baseline_rss_mb"] > 0
+    assert set(measured["loop_lag_ms"]) == {"p50", "p99", "max"}
+    assert measured["page_calls"] > 50
@@ -43,3 +43,67 @@ def test_setup_logging_configures_logging(monkeypatch):
         assert "format" in kwargs
         assert kwargs["stream"] == mock_sys.stdout
         assert kwargs["force"] is True
+
+def test_json_formatter_carries_structured_fields():
+    import json
+    import logging
+
+    record = logging.LogRecord("root", logging.INFO, __file__, 1, "Submitted %s", ("John",), None)
+    record.row, record.phase = 3, "submit"
+    payload = json.loads(utils.JsonFormatter().format(record))
+    assert payload["message"] == "Submitted John"
+    assert payload["row"] == 3 and payload["phase"] == "submit"
+    assert "worker" not in payload
+
+def test_sampling_filter_keeps_every_nth_record_of_sampled_levels():
+    import logging
+
+    sampler = utils.SamplingFilter({logging.DEBUG: 0.25, logging.WARNING: 0})
+    make = lambda level: logging.LogRecord("root", level, __file__, 1, "m", None, None)
+    assert [sampler.filter(make(logging.DEBUG)) for _ in range(8)] == [True, False, False, False] * 2
+    assert sampler.filter(make(logging.INFO))
+    assert not sampler.filter(make(logging.WARNING))
+
+def test_setup_logging_writes_through_listener_thread(capsys):
+    import json
+    import logging
+
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    try:
+        utils.setup_logging(level=logging.DEBUG, json_format=True, sample_rates={logging.DEBUG: 0.5})
+        assert [type(h).__name__ for h in root.handlers] == ["_DeferredQueueHandler"]
+        for i in range(4):
+            logging.debug("debug %d", i, extra={"row": i})
+        logging.info("done")
+        utils.stop_logging()
+        lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    finally:
+        root.handlers, root.level = saved_handlers, saved_level
+    assert [line["message"] for line in lines] == ["debug 0", "debug 2", "done"]
+    assert lines[1]["row"] == 2
+
+@pytest.mark.asyncio
+async def test_launch_browser_connects_to_endpoint_and_falls_back_to_launch():
+    from unittest.mock import AsyncMock
+
+    playwright = MagicMock()
+    playwright.chromium.connect_over_cdp = AsyncMock(return_value="warm")
+    playwright.chromium.launch = AsyncMock(return_value="cold")
+
+    assert await utils.launch_browser(playwright, endpoint="http://127.0.0.1:9222") == "warm"
+    playwright.chromium.launch.assert_not_awaited()
+
+    playwright.chromium.connect_over_cdp.side_effect = ConnectionError("refused")
+    assert await utils.launch_browser(
+        playwright, headless=True, args=["--mute-audio"], endpoint="http://127.0.0.1:9222"
+    ) == "cold"
+    playwright.chromium.launch.assert_awaited_once_with(
+        headless=True, args=[*utils.DEFAULT_LAUNCH_ARGS, "--mute-audio"]
+    )
+
+@pytest.mark.asyncio
+async def test_wait_for_endpoint_fails_when_browser_exits():
+    process = MagicMock(returncode=1)
+    with pytest.raises(RuntimeError, match="exited with code 1"):
+        await utils._wait_for_endpoint("http://127.0.0.1:9", process, timeout=1)
@@ -0,0 +1,59 @@
+import sys
+import os
+import csv
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.validation import RejectsWriter, RowValidator
+
+COLUMNS = ["First_Name", "Email"]
+
+def _rows(*pairs, start=0):
+    return [(start + i, {"First_Name": first, "Email": email}) for i, (first, email) in enumerate(pairs)]
+
+def test_validator_requires_columns():
+    with pytest.raises(ValueError, match="Email"):
+        RowValidator(["First_Name"], required=["First_Name", "Email"])
+    with pytest.raises(ValueError, match="Phone"):
+        RowValidator(COLUMNS, required=[], key_columns=["Phone"])
+    with pytest.raises(ValueError, match="Desired_Role"):
+        RowValidator(COLUMNS, required=[], expected=["First_Name", "Desired_Role"])
+
+def test_validator_rejects_blank_invalid_and_duplicate_rows():
+    validator = RowValidator(COLUMNS, required=COLUMNS)
+    reasons = validator.check(_rows(
+        ("John", "john@example.com"),
+        (" ", "x@example.com"),
+        ("Bad", "not-an-email"),
+        ("Johnny", " JOHN@example.com "),
+        ("Jane", ""),
+    ))
+    assert reasons == [None, "blank First_Name", "invalid email", "duplicate Email", "blank Email"]
+    # Keys persist across chunks; rejected rows do not claim theirs.
+    assert validator.check(_rows(("J", "john@example.com"), ("X", "x@example.com"), start=5)) == [
+        "duplicate Email", None,
+    ]
+    assert validator.rejected["duplicate Email"] == 2
+
+def test_validator_without_dedup_or_required_accepts_blanks():
+    validator = RowValidator(COLUMNS, required=[], key_columns=[])
+    assert validator.check(_rows(("", ""), ("", ""))) == [None, None]
+    assert validator.check([]) == []
+
+def test_validator_does_not_deduplicate_blank_keys():
+    validator = RowValidator(COLUMNS, required=[])
+    assert validator.check(_rows(("A", ""), ("B", " "), ("C", "c@example.com"))) == [None, None, None]
+    assert validator.check(_rows(("D", ""), ("E", "C@example.com"), start=3)) == [None, "duplicate Email"]
+    multi = RowValidator(COLUMNS, required=[], key_columns=COLUMNS)
+    assert multi.check(_rows(("", ""), ("", ""), ("A", ""), ("a", ""))) == [None, None, None, "duplicate First_Name/Email"]
+
+def test_rejects_writer_records_row_and_reason(tmp_path):
+    path = tmp_path / "rejects.csv"
+    writer = RejectsWriter(str(path), COLUMNS)
+    writer.write(2, {"First_Name": "Bad", "Email": "nope"}, "invalid email")
+    writer.close()
+    with open(path, newline="") as handle:
+        assert list(csv.DictReader(handle)) == [
+            {"row": "3", "First_Name": "Bad", "Email": "nope", "reason": "invalid email"}
+        ]
@@ -0,0 +1,96 @@
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.work_queue import WorkQueue, default_owner
+
+def _rows(count):
+    return [(i, {"Email": f"user{i}@example.com"}) for i in range(count)]
+
+def test_load_is_idempotent(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.db"))
+    assert queue.load(_rows(5), batch_size=2) == 5
+    assert queue.load(_rows(7), batch_size=2) == 2
+    assert queue.counts() == {"pending": 7, "leased": 0, "done": 0, "failed": 0}
+    queue.close()
+
+def test_claims_do_not_overlap_between_workers(tmp_path):
+    path = str(tmp_path / "queue.db")
+    first, second = WorkQueue(path), WorkQueue(path)
+    first.load(_rows(5))
+    a = first.claim("a", 3)
+    b = second.claim("b", 3)
+    assert [idx for idx, _ in a] == [0, 1, 2]
+    assert [idx for idx, _ in b] == [3, 4]
+    assert a[0][1] == {"Email": "user0@example.com"}
+    assert second.claim("b", 3) == []
+    assert first.counts() == {"pending": 0, "leased": 5, "done": 0, "failed": 0}
+    first.close()
+    second.close()
+
+def test_expired_leases_are_reclaimed(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.db"), lease_seconds=0.05)
+    queue.load(_rows(2))
+    queue.claim("crashed", 2)
+    assert queue.claim("other", 2) == []
+    assert queue.next_expiry() is not None
+    time.sleep(0.1)
+    assert [idx for idx, _ in queue.claim("other", 2)] == [0, 1]
+    attempts = queue._conn.execute("SELECT attempts FROM rows ORDER BY idx").fetchall()
+    assert attempts == [(2,), (2,)]
+    queue.close()
+
+def test_renew_keeps_leases_alive(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.db"), lease_seconds=0.05)
+    queue.load(_rows(1))
+    queue.claim("a", 1)
+    queue.lease_seconds = 60
+    assert queue.renew("a") == 1
+    time.sleep(0.1)
+    assert queue.claim("b", 1) == []
+    queue.close()
+
+def test_complete_and_release(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.db"))
+    queue.load(_rows(3))
+    queue.claim("a", 3)
+    queue.complete([(0, {"Email": {"status": "successful"}}, True), (1, {"Email": {"status": "error: x"}}, False)])
+    assert queue.release("a") == 1
+    assert queue.counts() == {"pending": 2, "leased": 0, "done": 1, "failed": 0}
+    assert queue.next_expiry() is None
+    # A late duplicate completion does not overwrite the first outcome.
+    queue.complete([(0, {"Email": {"status": "late"}}, True)])
+    (record,) = queue._conn.execute("SELECT record FROM rows WHERE idx = 0").fetchone()
+    assert "successful" in record
+    queue.close()
+
+def test_failed_rows_are_retried_until_attempts_run_out(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.db"), max_attempts=2)
+    queue.load(_rows(1))
+    failure = {"Email": {"status": "error: timeout"}}
+    assert [idx for idx, _ in queue.claim("a", 1)] == [0]
+    queue.complete([(0, failure, False)])
+    assert queue.counts() == {"pending": 1, "leased": 0, "done": 0, "failed": 0}
+
+    # Another worker picks the row up; its second failure is final.
+    assert [idx for idx, _ in queue.claim("b", 1)] == [0]
+    queue.complete([(0, failure, False)])
+    assert queue.counts() == {"pending": 0, "leased": 0, "done": 0, "failed": 1}
+    assert queue.claim("a", 1) == []
+    queue.complete([(0, {"Email": {"status": "successful"}}, True)])
+    assert queue.counts()["failed"] == 1
+    queue.close()
+
+def test_submitted_rows_with_field_errors_are_done(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.db"))
+    queue.load(_rows(1))
+    queue.claim("a", 1)
+    queue.complete([(0, {"Email": {"status": "error: detached"}}, True)])
+    assert queue.counts() == {"pending": 0, "leased": 0, "done": 1, "failed": 0}
+    assert queue.claim("b", 1) == []
+    queue.close()
+
+def test_default_owner_is_unique():
+    assert default_owner() != default_owner()
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD limit on the number of rows in flight.
+
+    Workers ``acquire`` a slot before each browser row and ``release`` it with
+    the row's outcome and latency. Every ``window`` outcomes the window is
+    judged: if the failure ratio exceeds ``error_threshold`` or latency
+    spiked, the limit is multiplied by ``decrease``; otherwise it grows by
+    ``increase``. The limit stays within ``min_limit``..``max_limit``. A
+    spike is a p90 above ``latency_target`` seconds or, without a target, a
+    median above ``spike_factor`` times the median of recent healthy windows;
+    medians are compared with medians, so ordinary jitter in the tail does
+    not count as a spike.
+
+    Every change is logged and, with ``log_path``, appended to a JSONL time
+    series.
+    """
+
+    def __init__(
+        self,
+        min_limit: int,
+        max_limit: int,
+        initial: Optional[int] = None,
+        window: int = 10,
+        increase: int = 1,
+        decrease: float = 0.5,
+        error_threshold: float = 0.1,
+        latency_target: Optional[float] = None,
+        spike_factor: float = 2.0,
+        log_path: Optional[str] = None,
+    ) -> None:
+        """Initialize the limit at ``initial`` (default ``min_limit``)."""
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError(f"need 1 <= min_limit <= max_limit, got {min_limit} and {max_limit}")
+        if not 0 < decrease < 1:
+            raise ValueError(f"decrease must be between 0 and 1, got {decrease}")
+        self.min_limit: int = min_limit
+        self.max_limit: int = max_limit
+        self.limit: int = min(max(initial or min_limit, min_limit), max_limit)
+        self.window: int = window
+        self.increase: int = increase
+        self.decrease: float = decrease
+        self.error_threshold: float = error_threshold
+        self.latency_target: Optional[float] = latency_target
+        self.spike_factor: float = spike_factor
+        self.baseline: Optional[float] = None
+        self.in_flight: int = 0
+        self.increases: int = 0
+        self.decreases: int = 0
+        self.peak_limit: int = self.limit
+        self.history: Deque[Dict[str, Any]] = deque(maxlen=1000)
+        self._outcomes: List[Tuple[bool, float]] = []
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._log = open(log_path, "a", encoding="utf-8") if log_path is not None else None
+
+    async def acquire(self) -> None:
+        """Wait until fewer than ``limit`` rows are in flight and take a slot."""
+        while self.in_flight >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.in_flight += 1
+
+    def release(self, success: bool, latency: float) -> None:
+        """Free a slot and record the outcome of the row that held it."""
+        self.in_flight -= 1
+        self._outcomes.append((success, latency))
+        if len(self._outcomes) >= self.window:
+            self._adjust()
+        # Wake as many waiters as there are free slots, oldest first.
+        for _ in range(max(0, self.limit - self.in_flight)):
+            if not self._waiters:
+                break
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _adjust(self) -> None:
+        """Judge the finished window and move the limit."""
+        outcomes, self._outcomes = self._outcomes, []
+        error_rate = sum(1 for success, _ in outcomes if not success) / len(outcomes)
+        latencies = sorted(latency for success, latency in outcomes if success)
+        p50 = latencies[len(latencies) // 2] if latencies else None
+        p90 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.9))] if latencies else None
+        if self.latency_target is not None:
+            spiked = p90 is not None and p90 > self.latency_target
+        else:
+            spiked = p50 is not None and self.baseline is not None and p50 > self.baseline * self.spike_factor
+
+        if error_rate > self.error_threshold:
+            reason = "errors"
+        elif spiked:
+            reason = "latency spike"
+        else:
+            reason = None
+            # Only healthy windows move the baseline, so a slow site cannot raise its own bar.
+            if p50 is not None:
+                self.baseline = p50 if self.baseline is None else 0.8 * self.baseline + 0.2 * p50
+
+        previous = self.limit
+        if reason is None:
+            self.limit = min(self.max_limit, self.limit + self.increase)
+            reason = "healthy"
+        else:
+            self.limit = max(self.min_limit, int(self.limit * self.decrease))
+        if self.limit == previous:
+            return
+        if self.limit > previous:
+            self.increases += 1
+        else:
+            self.decreases += 1
+        self.peak_limit = max(self.peak_limit, self.limit)
+        entry = {
+            "time": time.time(),
+            "limit": self.limit,
+            "previous": previous,
+            "reason": reason,
+            "error_rate": round(error_rate, 4),
+            "latency_p50": p50,
+            "latency_p90": p90,
+            "in_flight": self.in_flight,
+        }
+        self.history.append(entry)
+        logging.info(
+            "Concurrency %d -> %d (%s: p90 %s, %.0f%% errors).",
+            previous, self.limit, reason,
+            f"{p90:.2f}s" if p90 is not None else "n/a", error_rate * 100,
+        )
+        if self._log is not None:
+            self._log.write(json.dumps(entry) + "\n")
+            self._log.flush()
+
+    def stats(self) -> Dict[str, int]:
+        """Return the current and peak limit and how often it moved."""
+        return {
+            "limit": self.limit,
+            "peak": self.peak_limit,
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
+
+    def close(self) -> None:
+        """Close the time series file."""
+        if self._log is not None:
+            self._log.close()
+            self._log = None
@@ -0,0 +1,57 @@
+import csv
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class CsvRowReader:
+    """
+    Streams a CSV file as ``(idx, row)`` pairs without loading it into memory.
+
+    Rows are plain ``{column: value}`` dicts of strings; empty cells are ``""``
+    and short rows are padded with ``""``. Indices count data rows from 0 and
+    blank lines are skipped, matching ``pandas.read_csv``'s default index.
+    Header names found in ``rename`` are replaced by their mapped names.
+    """
+
+    def __init__(
+        self, path: str, encoding: str = "utf-8-sig", rename: Optional[Dict[str, str]] = None
+    ) -> None:
+        """Initialize the reader; the file is opened by ``open`` or ``__enter__``."""
+        self.path: str = path
+        self.encoding: str = encoding
+        self.rename: Dict[str, str] = dict(rename or {})
+        self.rows_read: int = 0
+        self._handle = None
+        self._reader: Optional[csv.DictReader] = None
+
+    def open(self) -> "CsvRowReader":
+        """Open the file for streaming."""
+        self._handle = open(self.path, "r", newline="", encoding=self.encoding)
+        self._reader = csv.DictReader(self._handle, restval="")
+        if self.rename and self._reader.fieldnames:
+            self._reader.fieldnames = [self.rename.get(name, name) for name in self._reader.fieldnames]
+        return self
+
+    def __enter__(self) -> "CsvRowReader":
+        return self.open()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def columns(self) -> List[str]:
+        """Return the header row."""
+        return list(self._reader.fieldnames or [])
+
+    def __iter__(self) -> Iterator[Tuple[int, Dict[str, str]]]:
+        for row in self._reader:
+            # Cells beyond the header end up under the None key; drop them.
+            row.pop(None, None)
+            idx = self.rows_read
+            self.rows_read += 1
+            yield idx, row
+
+    def close(self) -> None:
+        """Close the underlying file."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
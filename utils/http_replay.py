@@ -0,0 +1,228 @@
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Request headers that describe the captured connection rather than the submit.
+_SKIPPED_HEADERS = frozenset({
+    "host", "content-length", "cookie", "connection", "accept-encoding", "transfer-encoding",
+})
+
+
+class ReplayError(Exception):
+    """A replayed submit request was rejected or could not be sent."""
+
+
+class ReplayTemplate:
+    """
+    Submit request learned from the browser: method, endpoint, encoding and
+    which request parameter carries which form field.
+
+    Parameters that did not carry a field value are replayed unchanged.
+    """
+
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        encoding: str,
+        field_params: Dict[str, str],
+        static_params: Dict[str, Any],
+        headers: Dict[str, str],
+    ) -> None:
+        """Initialize the template; ``encoding`` is ``query``, ``form`` or ``json``."""
+        self.method: str = method
+        self.url: str = url
+        self.encoding: str = encoding
+        self.field_params: Dict[str, str] = field_params
+        self.static_params: Dict[str, Any] = static_params
+        self.headers: Dict[str, str] = headers
+
+    @classmethod
+    def from_request(
+        cls,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        post_data: Optional[str],
+        values: Dict[str, str],
+    ) -> Optional["ReplayTemplate"]:
+        """
+        Derive a template from a captured request and the field values submitted with it.
+
+        Returns None if the encoding is unsupported (e.g. multipart) or no
+        parameter carries one of ``values``.
+        """
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        if method == "GET":
+            parts = urlsplit(url)
+            params: List[Tuple[str, Any]] = parse_qsl(parts.query, keep_blank_values=True)
+            url = urlunsplit(parts._replace(query=""))
+            encoding = "query"
+        elif content_type == "application/x-www-form-urlencoded":
+            params = parse_qsl(post_data or "", keep_blank_values=True)
+            encoding = "form"
+        elif content_type == "application/json":
+            try:
+                body = json.loads(post_data or "")
+            except ValueError:
+                return None
+            if not isinstance(body, dict) or any(isinstance(v, (dict, list)) for v in body.values()):
+                return None
+            params = list(body.items())
+            encoding = "json"
+        else:
+            return None
+
+        field_by_value = {value: field for field, value in values.items()}
+        field_params: Dict[str, str] = {}
+        static_params: Dict[str, Any] = {}
+        for name, value in params:
+            field = field_by_value.get(value) if isinstance(value, str) else None
+            if field is not None and field not in field_params:
+                field_params[field] = name
+            else:
+                static_params[name] = value
+        if not field_params:
+            return None
+        kept_headers = {
+            name: value for name, value in headers.items()
+            if name.lower() not in _SKIPPED_HEADERS and not name.startswith(":")
+        }
+        return cls(method, url, encoding, field_params, static_params, kept_headers)
+
+    def build(self, values: Dict[str, str]) -> Tuple[str, Dict[str, str], Optional[str]]:
+        """Return the URL, headers and body that submit ``values``."""
+        params = dict(self.static_params)
+        for field, name in self.field_params.items():
+            params[name] = values.get(field, "")
+        if self.encoding == "query":
+            separator = "&" if "?" in self.url else "?"
+            return self.url + separator + urlencode(params), self.headers, None
+        if self.encoding == "form":
+            return self.url, self.headers, urlencode(params)
+        return self.url, self.headers, json.dumps(params)
+
+
+class ReplaySession:
+    """
+    Learns the form's submit request from browser rows and replays later rows
+    over a pooled HTTP client.
+
+    Every browser context is watched for submit-like requests. After a
+    successful browser row, ``learn`` matches the captured requests against the
+    values that row filled; once a template is found, rows are replayed through
+    a Playwright ``APIRequestContext`` (keep-alive, the learning context's
+    cookies) with at most ``concurrency`` requests in flight. Every
+    ``verify_every``-th row and every row whose replay failed still goes
+    through the browser.
+    """
+
+    def __init__(
+        self,
+        playwright,
+        concurrency: int = 32,
+        verify_every: Optional[int] = 50,
+        learn_rows: int = 3,
+    ) -> None:
+        """Initialize the session; nothing is replayed until a template is learned."""
+        self.playwright = playwright
+        self.verify_every: Optional[int] = verify_every
+        self.learn_rows: int = learn_rows
+        self.slots = asyncio.Semaphore(concurrency)
+        self.template: Optional[ReplayTemplate] = None
+        self.disabled: bool = False
+        self.browser_only: Set[int] = set()
+        self.replayed: int = 0
+        self.fallbacks: int = 0
+        self._attempts: int = 0
+        self._candidates: Deque[Tuple[str, str, Dict[str, str], Optional[str]]] = deque(maxlen=64)
+        self._client = None
+
+    @property
+    def ready(self) -> bool:
+        """Return True once rows can be replayed."""
+        return self.template is not None and self._client is not None
+
+    @property
+    def learning(self) -> bool:
+        """Return True while browser rows should still be used to learn the template."""
+        return not self.ready and not self.disabled
+
+    def watch(self, context) -> None:
+        """Capture submit-like requests made by ``context``."""
+        context.on("request", self._on_request)
+
+    def _on_request(self, request) -> None:
+        """Keep requests that could be the form submit."""
+        if not self.learning:
+            return
+        if request.resource_type not in ("document", "xhr", "fetch"):
+            return
+        if request.method == "GET" and "?" not in request.url:
+            return
+        self._candidates.append((request.method, request.url, dict(request.headers), request.post_data))
+
+    async def learn(self, context, values: Dict[str, str]) -> bool:
+        """
+        Try to learn the template from requests captured while ``values`` were submitted.
+
+        Gives up, disabling replay, after ``learn_rows`` browser rows without a match.
+        """
+        if not self.learning:
+            return self.ready
+        self._attempts += 1
+        # Values shared by several fields cannot tell their parameters apart.
+        if values and len(set(values.values())) == len(values):
+            for method, url, headers, post_data in reversed(self._candidates):
+                template = ReplayTemplate.from_request(method, url, headers, post_data, values)
+                if template is not None and set(template.field_params) == set(values):
+                    self._client = await self.playwright.request.new_context(
+                        storage_state=await context.storage_state()
+                    )
+                    self.template = template
+                    self._candidates.clear()
+                    logging.info(
+                        "HTTP replay enabled: %s %s (%s) with parameters %s",
+                        template.method, template.url, template.encoding, template.field_params,
+                    )
+                    return True
+        if self._attempts >= self.learn_rows:
+            self.disabled = True
+            self._candidates.clear()
+            logging.info(
+                "HTTP replay disabled: no replayable submit request seen in %d browser rows.",
+                self._attempts,
+            )
+        return False
+
+    def use_replay(self, idx: int) -> bool:
+        """Return True if row ``idx`` should be replayed rather than browsed."""
+        if not self.ready or idx in self.browser_only:
+            return False
+        return not (self.verify_every and idx % self.verify_every == 0)
+
+    async def submit(self, values: Dict[str, str]) -> int:
+        """Replay the submit request for ``values``; raises ``ReplayError`` unless 2xx."""
+        url, headers, body = self.template.build(values)
+        try:
+            response = await self._client.fetch(
+                url, method=self.template.method, headers=headers, data=body
+            )
+        except Exception as exc:
+            raise ReplayError(str(exc)) from exc
+        try:
+            if not response.ok:
+                raise ReplayError(f"HTTP {response.status} from {url}")
+            self.replayed += 1
+            return response.status
+        finally:
+            await response.dispose()
+
+    async def close(self) -> None:
+        """Close the pooled HTTP client."""
+        if self._client is not None:
+            await self._client.dispose()
+            self._client = None
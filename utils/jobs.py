@@ -0,0 +1,171 @@
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+def load_manifest(path: str) -> Dict[str, Any]:
+    """
+    Read a jobs manifest from a JSON or YAML file.
+
+    The manifest holds a ``jobs`` list and optionally ``pool_size`` and
+    ``host_limits`` (hostname -> maximum rows in flight). Every job needs
+    ``csv_path`` and ``url``; ``name`` defaults to the CSV file name and
+    ``fields`` maps form fields to the job's CSV columns. Any other keys are
+    passed on as ``run_form_submission`` options. Raises ``ValueError`` for
+    malformed manifests.
+    """
+    with open(path, "r", encoding="utf-8") as handle:
+        if os.path.splitext(path)[1].lower() in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError as exc:
+                raise ImportError("YAML manifests require PyYAML (pip install pyyaml)") from exc
+            manifest = yaml.safe_load(handle)
+        else:
+            manifest = json.load(handle)
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("jobs"), list) or not manifest["jobs"]:
+        raise ValueError(f"Manifest {path} needs a non-empty 'jobs' list")
+
+    jobs: List[Dict[str, Any]] = []
+    for number, entry in enumerate(manifest["jobs"], start=1):
+        if not isinstance(entry, dict) or "csv_path" not in entry or "url" not in entry:
+            raise ValueError(f"Job {number} in {path} needs 'csv_path' and 'url'")
+        options = dict(entry)
+        csv_path, url = options.pop("csv_path"), options.pop("url")
+        name = str(options.pop("name", os.path.splitext(os.path.basename(csv_path))[0]))
+        if any(job["name"] == name for job in jobs):
+            raise ValueError(f"Duplicate job name {name!r} in {path}")
+        jobs.append({
+            "name": name,
+            "csv_path": csv_path,
+            "url": url,
+            "fields": dict(options.pop("fields", None) or {}),
+            "options": options,
+        })
+    return {
+        "pool_size": manifest.get("pool_size"),
+        "host_limits": dict(manifest.get("host_limits") or {}),
+        "jobs": jobs,
+    }
+
+
+class FairScheduler:
+    """
+    Shares ``max_active`` browser slots between jobs.
+
+    A slot is held while one row is worked on in a browser. When slots are
+    contended they are granted round-robin between the jobs waiting for one,
+    so a large job cannot starve small ones, and no host ever has more than
+    its ``host_limits`` entry (default ``default_host_limit``) rows in flight.
+    """
+
+    def __init__(
+        self,
+        max_active: int,
+        host_limits: Optional[Dict[str, int]] = None,
+        default_host_limit: Optional[int] = None,
+    ) -> None:
+        """Initialize the scheduler with every slot free."""
+        if max_active < 1:
+            raise ValueError(f"max_active must be at least 1, got {max_active}")
+        self.max_active: int = max_active
+        self.host_limits: Dict[str, int] = dict(host_limits or {})
+        self.default_host_limit: Optional[int] = default_host_limit
+        self.active: int = 0
+        self.jobs: Dict[str, "JobSlots"] = {}
+        self._host_active: Dict[str, int] = {}
+        # Jobs with waiting rows, in round-robin order; each waiter is (host, future).
+        self._waiting: "OrderedDict[str, Deque[Tuple[str, asyncio.Future]]]" = OrderedDict()
+
+    def host_limit(self, host: str) -> int:
+        """Return the most rows ``host`` may have in flight."""
+        return min(self.max_active, self.host_limits.get(host, self.default_host_limit or self.max_active))
+
+    def slots(self, job: str, host: str) -> "JobSlots":
+        """Register ``job``, whose rows all go to ``host``, and return its handle."""
+        if job in self.jobs:
+            raise ValueError(f"Job {job!r} is already registered")
+        self.jobs[job] = JobSlots(self, job, host)
+        return self.jobs[job]
+
+    def _has_room(self, host: str) -> bool:
+        """Return True if a slot for ``host`` is free."""
+        return self.active < self.max_active and self._host_active.get(host, 0) < self.host_limit(host)
+
+    def _take(self, host: str) -> None:
+        """Mark one slot for ``host`` as held."""
+        self.active += 1
+        self._host_active[host] = self._host_active.get(host, 0) + 1
+
+    async def acquire(self, job: str, host: str) -> None:
+        """Wait for a slot for one of ``job``'s rows."""
+        if not self._waiting and self._has_room(host):
+            self._take(host)
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiting.setdefault(job, deque()).append((host, waiter))
+        self._dispatch()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # Granted just as the row was cancelled: hand the slot on.
+            if waiter.done() and not waiter.cancelled():
+                self.release(host)
+            raise
+
+    def release(self, host: str) -> None:
+        """Free a slot held for ``host`` and grant it to the next job in turn."""
+        self.active -= 1
+        self._host_active[host] -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Grant free slots to waiting jobs in round-robin order."""
+        granted = True
+        while granted and self.active < self.max_active:
+            granted = False
+            for job in list(self._waiting):
+                waiters = self._waiting[job]
+                while waiters and waiters[0][1].cancelled():
+                    waiters.popleft()
+                if not waiters:
+                    del self._waiting[job]
+                    continue
+                host, waiter = waiters[0]
+                if not self._has_room(host):
+                    continue
+                waiters.popleft()
+                # The served job goes to the back of the rotation.
+                self._waiting.move_to_end(job)
+                if not waiters:
+                    del self._waiting[job]
+                self._take(host)
+                waiter.set_result(None)
+                granted = True
+                break
+
+
+class JobSlots:
+    """One job's handle on a ``FairScheduler``, counting its rows and waiting time."""
+
+    def __init__(self, scheduler: FairScheduler, job: str, host: str) -> None:
+        """Initialize the handle; use ``FairScheduler.slots`` instead."""
+        self.scheduler: FairScheduler = scheduler
+        self.job: str = job
+        self.host: str = host
+        self.granted: int = 0
+        self.wait_seconds: float = 0.0
+
+    async def acquire(self) -> None:
+        """Wait for a slot."""
+        started = time.monotonic()
+        await self.scheduler.acquire(self.job, self.host)
+        self.wait_seconds += time.monotonic() - started
+        self.granted += 1
+
+    def release(self) -> None:
+        """Free the slot."""
+        self.scheduler.release(self.host)
@@ -0,0 +1,101 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Mapping, Set, Tuple
+
+
+class SubmissionJournal:
+    """
+    Append-only JSONL journal of finished rows.
+
+    Each line records a row index, a hash of the row's content, the row's
+    submission record and whether the row was submitted. Lines are buffered and written with an fsync at most
+    every ``fsync_interval`` seconds (or every ``batch_size`` rows), so the
+    journal never becomes the bottleneck of the submission loop.
+    """
+
+    def __init__(self, path: str, fsync_interval: float = 1.0, batch_size: int = 100) -> None:
+        """Initialize the journal; the file is opened lazily on first write."""
+        self.path: str = path
+        self.fsync_interval: float = fsync_interval
+        self.batch_size: int = batch_size
+        self._buffer: List[str] = []
+        self._file = None
+        self._last_flush: float = time.monotonic()
+
+    @staticmethod
+    def row_hash(row: Mapping[str, Any]) -> str:
+        """Hash the column names and values of a CSV row."""
+        payload = json.dumps([[str(key), str(value)] for key, value in row.items()])
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def load(self, include_failed: bool = False) -> Dict[int, Tuple[str, Dict[str, Dict[str, str]]]]:
+        """
+        Read committed rows as ``{row index: (content hash, record)}``.
+
+        The last entry for an index wins. Rows whose last entry was never
+        submitted are left out, so they are submitted again, unless
+        ``include_failed``; rows that were submitted are kept even if some
+        field failed to fill. A torn final line from a crash is ignored.
+        """
+        committed: Dict[int, Tuple[str, Dict[str, Dict[str, str]]]] = {}
+        failed: Set[int] = set()
+        if not os.path.exists(self.path):
+            return committed
+        with open(self.path, "r", encoding="utf-8") as handle:
+            for line_no, line in enumerate(handle, start=1):
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logging.warning("Ignoring unreadable journal line %d in %s", line_no, self.path)
+                    continue
+                committed[entry["row"]] = (entry["hash"], entry["record"])
+                # Entries written before the flag existed count as submitted.
+                if entry.get("submitted", True):
+                    failed.discard(entry["row"])
+                else:
+                    failed.add(entry["row"])
+        if include_failed:
+            return committed
+        return {idx: entry for idx, entry in committed.items() if idx not in failed}
+
+    def append(
+        self, idx: int, content_hash: str, record: Dict[str, Dict[str, str]], submitted: bool = True
+    ) -> None:
+        """Buffer one finished row, flushing when the batch or interval is due."""
+        self._buffer.append(json.dumps({
+            "row": int(idx), "hash": content_hash, "record": record, "submitted": bool(submitted),
+        }) + "\n")
+        if (
+            len(self._buffer) >= self.batch_size
+            or time.monotonic() - self._last_flush >= self.fsync_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered lines and fsync them to disk."""
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.writelines(self._buffer)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._buffer.clear()
+
+    async def flush_periodically(self) -> None:
+        """Flush every ``fsync_interval`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(self.fsync_interval)
+            self.flush()
+
+    def close(self) -> None:
+        """Flush remaining lines and close the file."""
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+from typing import Dict, Optional
+
+
+def _process_rss_bytes(pid: int) -> Optional[int]:
+    """Return the resident set size of ``pid`` from /proc, or None if unavailable."""
+    try:
+        with open(f"/proc/{pid}/status", "r", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+class RendererMemoryMonitor:
+    """
+    Samples the total RSS of a Chromium browser's renderer processes.
+
+    Renderer PIDs come from the CDP ``SystemInfo.getProcessInfo`` call and their
+    RSS from /proc, so sampling only works for local Chromium on Linux; elsewhere
+    ``sample`` returns None. Samples are rate-limited to one per
+    ``min_interval`` seconds and shared by every caller.
+    """
+
+    def __init__(self, browser, min_interval: float = 5.0) -> None:
+        """Initialize the monitor for ``browser``."""
+        self.browser = browser
+        self.min_interval: float = min_interval
+        self.peak_bytes: int = 0
+        self.samples: int = 0
+        self._total_bytes: int = 0
+        self._session = None
+        self._last_sample: Optional[int] = None
+        self._last_time: Optional[float] = None
+        self._unsupported: bool = False
+
+    async def _query(self) -> Optional[int]:
+        """Query the renderer processes and sum their RSS."""
+        if self._session is None:
+            self._session = await self.browser.new_browser_cdp_session()
+        info = await self._session.send("SystemInfo.getProcessInfo")
+        rss_values = [
+            _process_rss_bytes(proc["id"])
+            for proc in info.get("processInfo", [])
+            if proc.get("type") == "renderer"
+        ]
+        rss_values = [rss for rss in rss_values if rss is not None]
+        return sum(rss_values) if rss_values else None
+
+    async def sample(self, force: bool = False) -> Optional[int]:
+        """Return the current renderer RSS in bytes, reusing a recent sample unless ``force``."""
+        if self._unsupported:
+            return None
+        now = asyncio.get_running_loop().time()
+        if not force and self._last_time is not None and now - self._last_time < self.min_interval:
+            return self._last_sample
+        self._last_time = now
+        try:
+            rss = await self._query()
+        except Exception as exc:
+            logging.info("Renderer memory sampling unavailable: %s", exc)
+            self._unsupported = True
+            return None
+        self._last_sample = rss
+        if rss is not None:
+            self.samples += 1
+            self._total_bytes += rss
+            self.peak_bytes = max(self.peak_bytes, rss)
+        return rss
+
+    def invalidate(self) -> None:
+        """Force the next ``sample`` to query, e.g. after a context was recycled."""
+        self._last_time = None
+
+    def stats(self) -> Dict[str, float]:
+        """Return peak and mean sampled renderer RSS in MiB."""
+        mean = self._total_bytes / self.samples if self.samples else 0
+        return {
+            "samples": self.samples,
+            "peak_mb": self.peak_bytes / (1024 * 1024),
+            "mean_mb": mean / (1024 * 1024),
+        }
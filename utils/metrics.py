@@ -0,0 +1,166 @@
+import asyncio
+import bisect
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+# Phases of one row, in pipeline order; "row" covers a whole attempt.
+PHASES = ("open", "detect", "fill", "submit", "row")
+
+
+def _bucket_bounds(start: float = 0.001, end: float = 600.0, factor: float = 1.2) -> List[float]:
+    """Geometric bucket upper bounds in seconds, ~10% relative error."""
+    bounds = [start]
+    while bounds[-1] < end:
+        bounds.append(bounds[-1] * factor)
+    return bounds
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram.
+
+    Observing is a bisect and an increment, so it can sit in the hot path;
+    quantiles are estimated from bucket upper bounds.
+    """
+
+    BOUNDS: List[float] = _bucket_bounds()
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.counts: List[int] = [0] * (len(self.BOUNDS) + 1)
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one latency in seconds."""
+        self.counts[bisect.bisect_left(self.BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Return an upper-bound estimate of quantile ``q`` (0..1)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return min(self.BOUNDS[index], self.max) if index < len(self.BOUNDS) else self.max
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Return count, mean and p50/p95/p99 in seconds."""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+        }
+
+
+class RunMetrics:
+    """Per-phase latency histograms and row counters for one run."""
+
+    def __init__(self) -> None:
+        """Initialize empty histograms for every phase."""
+        self.started: float = time.monotonic()
+        self.phases: Dict[str, LatencyHistogram] = {phase: LatencyHistogram() for phase in PHASES}
+        self.rows_succeeded: int = 0
+        self.rows_failed: int = 0
+
+    def observe(self, phase: str, seconds: float) -> None:
+        """Record ``seconds`` spent in ``phase``."""
+        histogram = self.phases.get(phase)
+        if histogram is None:
+            histogram = self.phases[phase] = LatencyHistogram()
+        histogram.observe(seconds)
+
+    @contextmanager
+    def time(self, phase: str) -> Iterator[None]:
+        """Time the enclosed block (awaits included) into ``phase``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(phase, time.perf_counter() - start)
+
+    def record_row(self, success: bool) -> None:
+        """Count one finished row."""
+        if success:
+            self.rows_succeeded += 1
+        else:
+            self.rows_failed += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON-serializable view of all metrics."""
+        elapsed = time.monotonic() - self.started
+        rows = self.rows_succeeded + self.rows_failed
+        return {
+            "elapsed_seconds": elapsed,
+            "rows_succeeded": self.rows_succeeded,
+            "rows_failed": self.rows_failed,
+            "rows_per_second": rows / elapsed if elapsed > 0 else 0.0,
+            "phases": {phase: histogram.summary() for phase, histogram in self.phases.items()},
+        }
+
+    def to_prometheus(self, snapshot: Optional[Dict[str, Any]] = None) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        snapshot = snapshot or self.snapshot()
+        lines = [
+            "# HELP form_bot_phase_seconds Latency of each row phase.",
+            "# TYPE form_bot_phase_seconds summary",
+        ]
+        for phase, summary in snapshot["phases"].items():
+            for quantile in ("p50", "p95", "p99"):
+                lines.append(
+                    f'form_bot_phase_seconds{{phase="{phase}",quantile="0.{quantile[1:]}"}} {summary[quantile]:.6f}'
+                )
+            lines.append(f'form_bot_phase_seconds_sum{{phase="{phase}"}} {self.phases[phase].total:.6f}')
+            lines.append(f'form_bot_phase_seconds_count{{phase="{phase}"}} {summary["count"]}')
+        lines += [
+            "# HELP form_bot_rows_total Rows finished, by outcome.",
+            "# TYPE form_bot_rows_total counter",
+            f'form_bot_rows_total{{outcome="success"}} {snapshot["rows_succeeded"]}',
+            f'form_bot_rows_total{{outcome="failure"}} {snapshot["rows_failed"]}',
+            "# HELP form_bot_rows_per_second Finished rows per second since the run started.",
+            "# TYPE form_bot_rows_per_second gauge",
+            f'form_bot_rows_per_second {snapshot["rows_per_second"]:.6f}',
+        ]
+        return "\n".join(lines) + "\n"
+
+    def export(self, json_path: Optional[str] = None, prometheus_path: Optional[str] = None) -> None:
+        """Atomically write the JSON report and/or Prometheus text file."""
+        snapshot = self.snapshot()
+        if json_path:
+            _write_atomic(json_path, json.dumps(snapshot, indent=2))
+        if prometheus_path:
+            _write_atomic(prometheus_path, self.to_prometheus(snapshot))
+
+    async def export_periodically(
+        self, json_path: Optional[str], prometheus_path: Optional[str], interval: float
+    ) -> None:
+        """Export every ``interval`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.export(json_path, prometheus_path)
+            except OSError as exc:
+                logging.warning("Could not export metrics: %s", exc)
+
+
+def _write_atomic(path: str, content: str) -> None:
+    """Write ``content`` to ``path`` through a temporary file and rename."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        handle.write(content)
+    os.replace(tmp_path, path)
@@ -0,0 +1,120 @@
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Iterable, Optional
+
+# Resource types the form never needs to be filled and submitted.
+DEFAULT_BLOCKED_TYPES = ("image", "media", "font")
+# Static resource types eligible for the on-disk asset cache.
+CACHEABLE_TYPES = ("stylesheet", "script", "font", "image")
+# Headers describing the wire encoding, which no longer applies to a decoded body.
+_ENCODING_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+class ResourcePolicy:
+    """
+    Request routing policy installed on a browser context.
+
+    Requests whose resource type is in ``blocked_types`` or whose URL matches one
+    of the glob ``blocked_patterns`` are aborted. With ``cache_dir``, successful
+    GETs of static assets are stored on disk after the first load and served
+    from there afterwards, across contexts and runs.
+    """
+
+    def __init__(
+        self,
+        blocked_types: Iterable[str] = (),
+        blocked_patterns: Iterable[str] = (),
+        cache_dir: Optional[str] = None,
+    ) -> None:
+        """Initialize the policy and its counters."""
+        self.blocked_types = frozenset(blocked_types)
+        self.blocked_patterns = tuple(blocked_patterns)
+        self.cache_dir: Optional[str] = cache_dir
+        self.blocked_requests: int = 0
+        self.cache_hits: int = 0
+        self.cache_misses: int = 0
+        self.bytes_from_cache: int = 0
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    async def install(self, context) -> None:
+        """Route every request of ``context`` through this policy."""
+        await context.route("**/*", self._handle)
+
+    def _is_blocked(self, resource_type: str, url: str) -> bool:
+        """Return True if the request must not reach the network."""
+        if resource_type in self.blocked_types:
+            return True
+        return any(fnmatch.fnmatch(url, pattern) for pattern in self.blocked_patterns)
+
+    def _cache_paths(self, url: str):
+        """Return the body and metadata paths of ``url`` in the asset cache."""
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key + ".body"), os.path.join(self.cache_dir, key + ".json")
+
+    async def _handle(self, route) -> None:
+        """Abort, serve from cache or pass through a single request."""
+        request = route.request
+        if self._is_blocked(request.resource_type, request.url):
+            self.blocked_requests += 1
+            await route.abort()
+            return
+        if (
+            self.cache_dir is not None
+            and request.method == "GET"
+            and request.resource_type in CACHEABLE_TYPES
+        ):
+            await self._fulfill_cached(route, request.url)
+            return
+        await route.continue_()
+
+    async def _fulfill_cached(self, route, url: str) -> None:
+        """Serve ``url`` from disk, fetching and storing it on a miss."""
+        body_path, meta_path = self._cache_paths(url)
+        if os.path.exists(body_path) and os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as handle:
+                meta = json.load(handle)
+            with open(body_path, "rb") as handle:
+                body = handle.read()
+            self.cache_hits += 1
+            self.bytes_from_cache += len(body)
+            await route.fulfill(status=meta["status"], headers=meta["headers"], body=body)
+            return
+
+        self.cache_misses += 1
+        try:
+            response = await route.fetch()
+            body = await response.body()
+        except Exception as exc:
+            # Let the browser load it itself; a request left unhandled would hang the page.
+            logging.warning("Could not fetch asset %s for the cache: %s", url, exc)
+            try:
+                await route.continue_()
+            except Exception:
+                await route.abort()
+            return
+        headers = {
+            name: value for name, value in response.headers.items()
+            if name.lower() not in _ENCODING_HEADERS
+        }
+        if response.status == 200:
+            try:
+                with open(body_path, "wb") as handle:
+                    handle.write(body)
+                with open(meta_path, "w", encoding="utf-8") as handle:
+                    json.dump({"url": url, "status": response.status, "headers": headers}, handle)
+            except OSError as exc:
+                logging.warning("Could not cache asset %s: %s", url, exc)
+        await route.fulfill(status=response.status, headers=headers, body=body)
+
+    def stats(self) -> Dict[str, int]:
+        """Return the requests and bytes kept off the network."""
+        return {
+            "blocked_requests": self.blocked_requests,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "bytes_from_cache": self.bytes_from_cache,
+        }
@@ -0,0 +1,40 @@
+import asyncio
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Async token-bucket rate limiter.
+
+    Tokens refill continuously at ``rate`` per second up to ``burst``; each
+    ``acquire`` takes one token, waiting until one is available. Waiters are
+    served in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        """Initialize the bucket full, with ``burst`` tokens."""
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        if burst < 1:
+            raise ValueError(f"burst must be at least 1, got {burst}")
+        self.rate: float = rate
+        self.burst: int = burst
+        self._tokens: float = float(burst)
+        self._updated: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens accrued since the last update."""
+        if self._updated is not None:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait for and consume one token."""
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            self._refill(loop.time())
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill(loop.time())
+            self._tokens -= 1
@@ -0,0 +1,193 @@
+import csv
+import json
+import os
+from collections import deque
+from typing import Any, Deque, Dict, List, Sequence, Tuple
+
+# Distinct error messages counted before the rest are folded into "other".
+MAX_ERROR_KINDS = 20
+
+
+def compact_record(idx: int, record: Dict[str, Dict[str, str]], fields: Sequence[str]) -> Dict[str, str]:
+    """
+    Flatten a row's record to one string per column: the 1-based row number,
+    then the value and status of every form field, then the first error
+    explanation. Extra CSV columns are left out; they are in the input file.
+    """
+    compact: Dict[str, str] = {"row": str(idx + 1)}
+    error = ""
+    for field in fields:
+        entry = record.get(field, {})
+        compact[field] = entry.get("value", "")
+        compact[f"{field} status"] = entry.get("status", "")
+        if not error and entry.get("status", "").startswith("error"):
+            error = entry.get("explanation", "")
+    compact["error"] = error
+    return compact
+
+
+def expand_record(compact: Dict[str, str], fields: Sequence[str]) -> Dict[str, Dict[str, str]]:
+    """Rebuild a summary record from a compact one; the error goes to the first failed field."""
+    record: Dict[str, Dict[str, str]] = {}
+    error = compact.get("error", "")
+    for field in fields:
+        record[field] = {"status": compact.get(f"{field} status", ""), "value": compact.get(field, "")}
+        if error and record[field]["status"].startswith("error"):
+            record[field]["explanation"] = error
+            error = ""
+    return record
+
+
+class ReorderBuffer:
+    """
+    Releases items in the order their indices were announced with ``expect``.
+
+    Items that finish early wait until every earlier index has finished, so
+    the buffer only holds rows that overtook a slower one.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty buffer."""
+        self._expected: Deque[int] = deque()
+        self._done: Dict[int, Any] = {}
+
+    def expect(self, idx: int) -> None:
+        """Announce the next index in output order."""
+        self._expected.append(idx)
+
+    def add(self, idx: int, item: Any) -> List[Tuple[int, Any]]:
+        """Store ``item`` and return every ``(idx, item)`` now ready, in order."""
+        self._done[idx] = item
+        ready = []
+        while self._expected and self._expected[0] in self._done:
+            head = self._expected.popleft()
+            ready.append((head, self._done.pop(head)))
+        return ready
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+
+class ResultsWriter:
+    """
+    Appends compact per-row records to a CSV, JSONL or Parquet file as rows finish.
+
+    The format follows the file extension; the ``row`` column gives each
+    record's position in the input CSV. Parquet output needs ``pyarrow`` and
+    is written in row groups of ``batch_size``.
+    """
+
+    FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".parquet": "parquet"}
+
+    def __init__(self, path: str, fields: Sequence[str], batch_size: int = 1000) -> None:
+        """Open ``path`` for writing; raises ``ValueError`` for unknown extensions."""
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in self.FORMATS:
+            raise ValueError(f"Unsupported results format {extension!r}; use .csv, .jsonl or .parquet")
+        self.path: str = path
+        self.format: str = self.FORMATS[extension]
+        self.fields: List[str] = list(fields)
+        self.columns: List[str] = ["row"]
+        for field in self.fields:
+            self.columns += [field, f"{field} status"]
+        self.columns.append("error")
+        self.batch_size: int = batch_size
+        self.rows_written: int = 0
+        self._batch: List[Dict[str, str]] = []
+        self._parquet = None
+        self._handle = None
+        self._csv = None
+        if self.format == "parquet":
+            try:
+                import pyarrow
+                import pyarrow.parquet
+            except ImportError as exc:
+                raise ImportError("Parquet results require pyarrow (pip install pyarrow)") from exc
+            self._pa = pyarrow
+            self._schema = pyarrow.schema([(column, pyarrow.string()) for column in self.columns])
+            self._parquet = pyarrow.parquet.ParquetWriter(path, self._schema)
+        else:
+            self._handle = open(path, "w", newline="", encoding="utf-8")
+            if self.format == "csv":
+                self._csv = csv.DictWriter(self._handle, fieldnames=self.columns)
+                self._csv.writeheader()
+
+    def write(self, idx: int, record: Dict[str, Dict[str, str]]) -> None:
+        """Append the compact form of row ``idx``'s record."""
+        self.write_compact(compact_record(idx, record, self.fields))
+
+    def write_compact(self, compact: Dict[str, str]) -> None:
+        """Append an already compacted record."""
+        if self.format == "csv":
+            self._csv.writerow(compact)
+        elif self.format == "jsonl":
+            self._handle.write(json.dumps(compact) + "\n")
+        else:
+            self._batch.append(compact)
+            if len(self._batch) >= self.batch_size:
+                self._write_batch()
+        self.rows_written += 1
+
+    def _write_batch(self) -> None:
+        """Write the buffered Parquet rows as one row group."""
+        if self._batch:
+            columns = {column: [row[column] for row in self._batch] for column in self.columns}
+            self._parquet.write_table(self._pa.table(columns, schema=self._schema))
+            self._batch = []
+
+    def close(self) -> None:
+        """Flush buffered rows and close the file."""
+        if self._parquet is not None:
+            self._write_batch()
+            self._parquet.close()
+            self._parquet = None
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+class RunSummary:
+    """
+    Running aggregates of finished rows: per-field status counts and error kinds.
+
+    Memory depends on the number of fields and distinct errors, not on rows.
+    """
+
+    def __init__(self, fields: Sequence[str]) -> None:
+        """Initialize empty counts for ``fields``."""
+        self.fields: List[str] = list(fields)
+        self.rows: int = 0
+        self.field_status: Dict[str, Dict[str, int]] = {field: {} for field in self.fields}
+        self.errors: Dict[str, int] = {}
+
+    def add(self, record: Dict[str, Dict[str, str]]) -> None:
+        """Count one finished row."""
+        self.rows += 1
+        for field in self.fields:
+            status = record.get(field, {}).get("status", "n/a")
+            if status.startswith("error"):
+                self._count_error(status[len("error:"):].strip() or "unknown")
+                status = "error"
+            counts = self.field_status[field]
+            counts[status] = counts.get(status, 0) + 1
+
+    def _count_error(self, message: str) -> None:
+        """Count an error message, keeping at most ``MAX_ERROR_KINDS`` distinct ones."""
+        message = message.splitlines()[0][:80] if message else "unknown"
+        if message not in self.errors and len(self.errors) >= MAX_ERROR_KINDS:
+            message = "other"
+        self.errors[message] = self.errors.get(message, 0) + 1
+
+    def lines(self) -> List[str]:
+        """Return the aggregate summary as printable lines."""
+        lines = [f"Rows finished: {self.rows}"]
+        for field in self.fields:
+            counts = ", ".join(
+                f"{count} {status}" for status, count in sorted(self.field_status[field].items())
+            )
+            lines.append(f"{field}: {counts or 'none'}")
+        if self.errors:
+            lines.append("Errors:")
+            for message, count in sorted(self.errors.items(), key=lambda item: -item[1]):
+                lines.append(f"  {count} x {message}")
+        return lines
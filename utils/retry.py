@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import random
+from collections import deque
+from typing import Deque, FrozenSet, Optional, Tuple
+
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+# Failure classes a row can end in.
+TIMEOUT = "timeout"
+NAVIGATION = "navigation"
+SELECTOR = "selector"
+DIALOG = "dialog"
+
+RETRYABLE: FrozenSet[str] = frozenset({TIMEOUT, NAVIGATION, DIALOG})
+
+
+def classify_failure(exc: BaseException, phase: str) -> str:
+    """
+    Classify an exception raised while processing a row.
+
+    ``phase`` is the step that failed: ``open``, ``detect``, ``fill`` (the
+    one-script fast fill) or ``submit``.
+    """
+    if phase == "submit" and isinstance(exc, asyncio.TimeoutError):
+        # FormPage.submit_and_handle_alert gave up waiting for the dialog.
+        return DIALOG
+    if isinstance(exc, PlaywrightTimeoutError):
+        return TIMEOUT
+    message = str(exc).lower()
+    if phase == "open" or "execution context was destroyed" in message:
+        return NAVIGATION
+    if isinstance(exc, PlaywrightError) and ("net::" in message or "navigat" in message):
+        return NAVIGATION
+    if phase == "fill" and isinstance(exc, PlaywrightError):
+        # The fill script only fails when the page changed under it.
+        return NAVIGATION
+    if "dialog" in message:
+        return DIALOG
+    return SELECTOR
+
+
+class RowFailure(Exception):
+    """A row failed during ``phase``; ``kind`` is its failure class."""
+
+    def __init__(self, phase: str, cause: BaseException) -> None:
+        """Wrap ``cause`` and classify it."""
+        super().__init__(f"{phase} failed: {cause}")
+        self.phase: str = phase
+        self.cause: BaseException = cause
+        self.kind: str = classify_failure(cause, phase)
+
+
+class RetryPolicy:
+    """Decides whether a failed row is requeued and how long it waits first."""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        retryable: FrozenSet[str] = RETRYABLE,
+    ) -> None:
+        """Initialize the policy; ``max_attempts`` counts the first try."""
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be at least 1, got {max_attempts}")
+        self.max_attempts: int = max_attempts
+        self.base_delay: float = base_delay
+        self.max_delay: float = max_delay
+        self.retryable: FrozenSet[str] = retryable
+
+    def should_retry(self, kind: str, attempt: int) -> bool:
+        """Return True if a row failing with ``kind`` on ``attempt`` (1-based) is retried."""
+        return kind in self.retryable and attempt < self.max_attempts
+
+    def backoff(self, attempt: int) -> float:
+        """Exponential backoff with equal jitter before retry number ``attempt``."""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+
+class CircuitBreaker:
+    """
+    Pauses row intake when the error rate over a sliding window is too high.
+
+    Outcomes older than ``window`` seconds are forgotten. Once at least
+    ``min_samples`` outcomes are in the window and the failure ratio reaches
+    ``threshold``, the breaker opens for ``cooldown`` seconds, then closes
+    again with a fresh window.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.5,
+        window: float = 60.0,
+        min_samples: int = 10,
+        cooldown: float = 30.0,
+    ) -> None:
+        """Initialize a closed breaker."""
+        self.threshold: float = threshold
+        self.window: float = window
+        self.min_samples: int = min_samples
+        self.cooldown: float = cooldown
+        self.trips: int = 0
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._failures: int = 0
+        self._closed: Optional[asyncio.Event] = None
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while intake is paused."""
+        return self._closed is not None and not self._closed.is_set()
+
+    def _prune(self, now: float) -> None:
+        """Drop outcomes that fell out of the window."""
+        while self._outcomes and now - self._outcomes[0][0] > self.window:
+            _, ok = self._outcomes.popleft()
+            if not ok:
+                self._failures -= 1
+
+    def record(self, success: bool) -> None:
+        """Record one row outcome and trip the breaker if the error rate is too high."""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        self._outcomes.append((now, success))
+        if not success:
+            self._failures += 1
+        self._prune(now)
+        if self.is_open or len(self._outcomes) < self.min_samples:
+            return
+        error_rate = self._failures / len(self._outcomes)
+        if error_rate >= self.threshold:
+            self.trips += 1
+            logging.warning(
+                "Circuit breaker open: error rate %.0f%% over the last %d rows; pausing intake for %.0fs.",
+                error_rate * 100, len(self._outcomes), self.cooldown,
+            )
+            if self._closed is None:
+                self._closed = asyncio.Event()
+            self._closed.clear()
+            loop.call_later(self.cooldown, self._close)
+
+    def _close(self) -> None:
+        """Resume intake with an empty window."""
+        self._outcomes.clear()
+        self._failures = 0
+        if self._closed is not None:
+            self._closed.set()
+        logging.info("Circuit breaker closed: resuming intake.")
+
+    async def wait_closed(self) -> None:
+        """Wait until the breaker is closed."""
+        if self._closed is not None:
+            await self._closed.wait()
@@ -1,17 +1,114 @@
+import asyncio
+import atexit
+import json
 import logging
+import queue
+import shutil
+import subprocess
 import sys
+import tempfile
+import urllib.request
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Optional, Sequence
+
+from playwright.async_api import async_playwright
+
+# Chromium flags used for every launched or served browser.
+DEFAULT_LAUNCH_ARGS: List[str] = ["--disable-notifications", "--disable-infobars"]
+
+# Record attributes passed via ``extra=`` that structured output carries along.
+STRUCTURED_FIELDS = ("row", "phase", "worker")
+
+_listener: Optional[QueueListener] = None
+
+
+async def launch_browser(
+    playwright,
+    headless: bool = False,
+    args: Optional[Sequence[str]] = None,
+    endpoint: Optional[str] = None,
+):
+    """
+    Return a Chromium browser: connected to the warm browser at ``endpoint``
+    (see ``serve_browser``) if given and reachable, launched otherwise.
+
+    ``args`` are added to ``DEFAULT_LAUNCH_ARGS`` on launch.
+    """
+    if endpoint is not None:
+        try:
+            browser = await playwright.chromium.connect_over_cdp(endpoint)
+            logging.info("Connected to warm browser at %s.", endpoint)
+            return browser
+        except Exception as exc:
+            logging.warning("Could not connect to warm browser at %s (%s); launching one.", endpoint, exc)
+    return await playwright.chromium.launch(
+        headless=headless, args=[*DEFAULT_LAUNCH_ARGS, *(args or [])]
+    )
+
+
+async def _wait_for_endpoint(endpoint: str, process, timeout: float) -> None:
+    """Poll the CDP endpoint until it answers; raise if the browser exits or ``timeout`` passes."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        if process.returncode is not None:
+            raise RuntimeError(f"Browser exited with code {process.returncode} before serving {endpoint}")
+        try:
+            await asyncio.to_thread(urllib.request.urlopen, f"{endpoint}/json/version", timeout=1)
+            return
+        except OSError:
+            if asyncio.get_running_loop().time() > deadline:
+                raise TimeoutError(f"Browser did not serve {endpoint} within {timeout:.0f}s")
+            await asyncio.sleep(0.2)
+
+
+async def serve_browser(
+    port: int = 9222,
+    headless: bool = True,
+    args: Optional[Sequence[str]] = None,
+    ready_timeout: float = 15.0,
+) -> None:
+    """
+    Keep a warm Chromium running with a CDP endpoint on localhost until interrupted.
+
+    Runs started with ``--browser-endpoint http://127.0.0.1:<port>`` connect to
+    it instead of launching their own browser.
+    """
+    async with async_playwright() as playwright:
+        executable = playwright.chromium.executable_path
+    user_data_dir = tempfile.mkdtemp(prefix="form-bot-browser-")
+    command = [
+        executable,
+        f"--remote-debugging-port={port}",
+        "--remote-debugging-address=127.0.0.1",
+        f"--user-data-dir={user_data_dir}",
+        "--no-first-run",
+        "--no-default-browser-check",
+        *DEFAULT_LAUNCH_ARGS,
+        *(args or []),
+    ]
+    if headless:
+        command.append("--headless=new")
+    process = await asyncio.create_subprocess_exec(
+        *command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    endpoint = f"http://127.0.0.1:{port}"
+    try:
+        await _wait_for_endpoint(endpoint, process, ready_timeout)
+        logging.info("Warm browser (pid %d) serving %s; stop it with Ctrl+C.", process.pid, endpoint)
+        await process.wait()
+    finally:
+        if process.returncode is None:
+            process.terminate()
+            await process.wait()
+        shutil.rmtree(user_data_dir, ignore_errors=True)
+
+
 async def get_page():
     """
     Initialize and configure a Playwright browser and return a new page.
     """
-    from playwright.async_api import async_playwright
-
     playwright = await async_playwright().start()
-    browser = await playwright.chromium.launch(headless=False, args=[
-        "--start-maximized",
-        "--disable-notifications",
-        "--disable-infobars"
-    ])
+    browser = await launch_browser(playwright, headless=False, args=["--start-maximized"])
     context = await browser.new_context(
         viewport={"width": 1920, "height": 1080},
         ignore_https_errors=True
@@ -19,14 +116,99 @@ async def get_page():
     page = await context.new_page()
     return page
 
-def setup_logging():
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line, with row, phase and worker when given."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            if hasattr(record, field):
+                payload[field] = getattr(record, field)
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a fraction of the records of each level, e.g. ``{logging.DEBUG: 0.01}``.
+
+    Sampling is deterministic: with rate 0.01 every 100th record is kept.
+    Levels without a rate are always kept.
+    """
+
+    def __init__(self, rates: Dict[int, float]) -> None:
+        super().__init__()
+        self.every: Dict[int, int] = {
+            level: max(1, round(1 / rate)) if rate > 0 else 0 for level, rate in rates.items()
+        }
+        self._seen: Dict[int, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        every = self.every.get(record.levelno)
+        if every is None:
+            return True
+        if every == 0:
+            return False
+        seen = self._seen.get(record.levelno, 0)
+        self._seen[record.levelno] = seen + 1
+        return seen % every == 0
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Enqueues records as they are, leaving message formatting to the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def setup_logging(
+    level: Optional[int] = None,
+    json_format: bool = False,
+    sample_rates: Optional[Dict[int, float]] = None,
+):
     """
     Centralized logging configuration for the project.
     Ensures consistent logging format and output.
+
+    Records are handed to a queue and written to stdout by a listener thread,
+    so logging never blocks the event loop. ``json_format`` writes one JSON
+    object per record; ``sample_rates`` keeps only a fraction of each level.
+    ``level`` defaults to INFO.
     """
+    global _listener
+    stop_logging()
     logging.basicConfig(
-        level=logging.INFO,
+        level=logging.INFO if level is None else level,
         format="%(asctime)s [%(levelname)s] %(message)s",
         stream=sys.stdout,
         force=True
     )
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    if json_format:
+        for handler in handlers:
+            handler.setFormatter(JsonFormatter())
+    queue_handler = _DeferredQueueHandler(queue.SimpleQueue())
+    if sample_rates:
+        queue_handler.addFilter(SamplingFilter(sample_rates))
+    root.handlers = [queue_handler]
+    _listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread started by ``setup_logging``."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,191 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rows (
+    idx INTEGER PRIMARY KEY,
+    data TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    record TEXT,
+    updated REAL
+);
+CREATE INDEX IF NOT EXISTS rows_claimable ON rows (state, lease_expires, idx);
+"""
+
+
+def default_owner() -> str:
+    """Return a worker name unique across hosts and processes."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class WorkQueue:
+    """
+    Row queue in a SQLite file shared by any number of worker processes.
+
+    Rows are ``pending`` until a worker claims a batch, which leases them for
+    ``lease_seconds``; claimed rows are ``leased`` until their outcome is
+    written back as ``done``. A row whose submit failed goes back to
+    ``pending`` for any worker to retry, until it has been claimed
+    ``max_attempts`` times; then it stays ``failed``. A lease that expires
+    (the worker crashed or hung) makes its rows claimable again. Claims run in ``BEGIN IMMEDIATE``
+    transactions, so two workers never lease the same row at once.
+
+    The default rollback journal works on shared filesystems with working
+    POSIX locks; ``wal=True`` is faster but only safe on a single host.
+    Methods block; call them through ``asyncio.to_thread`` from async code.
+    """
+
+    def __init__(
+        self, path: str, lease_seconds: float = 300.0, wal: bool = False, max_attempts: int = 3
+    ) -> None:
+        """Open (creating if needed) the queue database at ``path``."""
+        self.path: str = path
+        self.lease_seconds: float = lease_seconds
+        self.max_attempts: int = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        if wal:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def load(self, rows: Iterable[Tuple[int, Dict[str, str]]], batch_size: int = 1000) -> int:
+        """
+        Insert ``(idx, row)`` pairs as pending rows and return how many were new.
+
+        Rows already in the queue are left alone, so loading the same CSV
+        again (e.g. from every host) is harmless.
+        """
+        inserted = 0
+        batch: List[Tuple[int, str]] = []
+        for idx, row in rows:
+            batch.append((idx, json.dumps(row)))
+            if len(batch) >= batch_size:
+                inserted += self._insert(batch)
+                batch = []
+        return inserted + self._insert(batch)
+
+    def _insert(self, batch: List[Tuple[int, str]]) -> int:
+        """Insert one batch in a single transaction."""
+        if not batch:
+            return 0
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO rows (idx, data, updated) VALUES (?, ?, ?)",
+                    [(idx, data, time.time()) for idx, data in batch],
+                )
+                inserted = self._conn.total_changes - before
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return inserted
+
+    def claim(self, owner: str, limit: int) -> List[Tuple[int, Dict[str, str]]]:
+        """Lease up to ``limit`` pending or expired rows to ``owner``, lowest index first."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                claimed = self._conn.execute(
+                    "SELECT idx, data FROM rows"
+                    " WHERE state = 'pending' OR (state = 'leased' AND lease_expires < ?)"
+                    " ORDER BY idx LIMIT ?",
+                    (now, limit),
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE rows SET state = 'leased', owner = ?, lease_expires = ?,"
+                    " attempts = attempts + 1, updated = ? WHERE idx = ?",
+                    [(owner, now + self.lease_seconds, now, idx) for idx, _ in claimed],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [(idx, json.loads(data)) for idx, data in claimed]
+
+    def renew(self, owner: str) -> int:
+        """Extend the leases of every row ``owner`` still holds; returns how many."""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE rows SET lease_expires = ? WHERE owner = ? AND state = 'leased'",
+                (now + self.lease_seconds, owner),
+            )
+        return cursor.rowcount
+
+    def complete(self, outcomes: List[Tuple[int, Dict[str, Any], bool]]) -> None:
+        """
+        Write back ``(idx, record, submitted)`` outcomes in one transaction.
+
+        Submitted rows are ``done``, even with field errors in their record.
+        Rows that were never submitted go back to ``pending`` while they have
+        attempts left and become ``failed`` after that. Finished rows are
+        never overwritten.
+        """
+        if not outcomes:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "UPDATE rows SET record = :record, lease_expires = NULL, updated = :now,"
+                    " owner = CASE WHEN :failed AND attempts < :max_attempts THEN NULL ELSE owner END,"
+                    " state = CASE WHEN NOT :failed THEN 'done'"
+                    " WHEN attempts < :max_attempts THEN 'pending' ELSE 'failed' END"
+                    " WHERE idx = :idx AND state NOT IN ('done', 'failed')",
+                    [
+                        {
+                            "record": json.dumps(record), "now": now, "idx": idx,
+                            "failed": not submitted, "max_attempts": self.max_attempts,
+                        }
+                        for idx, record, submitted in outcomes
+                    ],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def release(self, owner: str) -> int:
+        """Hand rows ``owner`` leased but did not finish back to the queue."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE rows SET state = 'pending', owner = NULL, lease_expires = NULL"
+                " WHERE owner = ? AND state = 'leased'",
+                (owner,),
+            )
+        return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of rows in each state."""
+        with self._lock:
+            rows = self._conn.execute("SELECT state, COUNT(*) FROM rows GROUP BY state").fetchall()
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        counts.update(dict(rows))
+        return counts
+
+    def next_expiry(self) -> Optional[float]:
+        """Return when the earliest active lease expires, or None if nothing is leased."""
+        with self._lock:
+            (expiry,) = self._conn.execute(
+                "SELECT MIN(lease_expires) FROM rows WHERE state = 'leased'"
+            ).fetchone()
+        return expiry
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()